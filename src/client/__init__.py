@@ -1,24 +1,52 @@
 import sys
-from multiprocessing.queues import Queue
 
 from PyQt5.QtWidgets import QApplication
 
+from src.client.broker import TServerBroker
+from src.client.srv_color.service.style_sheet import TStyleSheetService
+from src.client.srv_font.service.font import TFontService
 from src.client.wgt_main import TMainWindow
+from src.common.channel import TChannel
 
 
 class Client:
-    def __init__(self, incoming_messages: Queue, outgoing_messages: Queue):
+    def __init__(self, incoming_messages: TChannel, outgoing_messages: TChannel):
         self.incoming_messages = incoming_messages
         self.outgoing_messages = outgoing_messages
 
     def start(self):
         app = QApplication(sys.argv)
 
+        # Only the fonts that the window uses right away, in the background
+        TFontService().load_more_fonts()
+
+        self.broker = TServerBroker(self.incoming_messages, self.outgoing_messages)
+        self.broker.kickstart()
+
         main_window = TMainWindow()
+        main_window.connect_broker(self.broker)
+
+        # Staged startup: the window first paints what it showed last time,
+        # while the server already works on the first requests. The first
+        # requests of all widgets go to the server together
+        main_window.restore()
+
+        with self.broker.batch():
+            main_window.kickstart()
+
+        # The widgets have registered for styling, style them before they paint
+        TStyleSheetService().apply()
+
         main_window.show()
 
-        return app.exec()
+        result = app.exec()
+
+        main_window.snapshot.save()
+
+        self.broker.stop()
+
+        return result
 
 
-def client(incoming_messages: Queue, outgoing_messages: Queue):
+def client(incoming_messages: TChannel, outgoing_messages: TChannel):
     return Client(incoming_messages, outgoing_messages).start()
@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from queue import Empty
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QThread
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSlot
+
+from src.client.common import TObject
+from src.common.channel import TChannel
+from src.common.failure import TFailure
+from src.common.logger import logmain
+from src.common.metrics import metrics
+from src.common.request import TRequest
+from src.common.request.batch import TBatchRequest
+from src.common.request.fetch import TFetchRequest
+from src.common.response.batch import TBatchResponse
+from src.common.response.fetch.metrics_fetch_response import TMetricsFetchResponse
+
+
+class TChannelReader(QThread):
+    """
+    Wait for messages from a channel and hand them over to the GUI thread
+
+    The channel could also be a TConnection to a socket server. Once the
+    server goes away, a TFailure is handed over and the reader stops.
+    """
+
+    received = pyqtSignal(object)
+
+    def __init__(self, channel: TChannel, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        self.channel = channel
+
+    def run(self) -> None:
+        while not self.isInterruptionRequested():
+            try:
+                message = self.channel.get(timeout=0.1)
+            except Empty:
+                continue
+            except EOFError as exception:
+                logmain.warning(f"Server is gone: {exception}")
+
+                self.received.emit(TFailure("Lost the connection to the server"))
+
+                break
+
+            self.received.emit(message)
+
+
+class TServerBroker(TObject):
+    """
+    Pass requests to the server process and its responses back to the GUI
+
+    Sending a request never blocks the GUI thread: if the request channel is
+    full, the request is rejected and a TFailure is triggered instead.
+
+    Requests made within `batch()` are sent together as one TBatchRequest. The
+    responses of a batch are handed over one by one, so the widgets never see
+    batches at all.
+
+    Args:
+        incoming_messages: the channel that carries responses from the server
+        outgoing_messages: the channel that carries requests to the server
+        parent           : if Qt ownership is required, provides parent object
+    """
+
+    def __init__(
+        self,
+        incoming_messages: TChannel,
+        outgoing_messages: TChannel,
+        parent: QObject = None,
+    ) -> None:
+        super().__init__(parent)
+
+        self.incoming_messages = incoming_messages
+        self.outgoing_messages = outgoing_messages
+
+        self.reader = TChannelReader(self.incoming_messages, parent=self)
+        self.reader.received.connect(self.handle_received)
+
+        self.batched = None
+
+    def kickstart(self) -> None:
+        self.reader.start()
+
+    def stop(self) -> None:
+        self.reader.requestInterruption()
+        self.reader.wait()
+
+    @contextmanager
+    def batch(self):
+        """Collect the fetch requests made meanwhile and send them at once"""
+
+        self.batched = []
+
+        try:
+            yield
+        finally:
+            requests, self.batched = self.batched, None
+
+            if len(requests) == 1:
+                self.send(requests[0])
+            elif requests:
+                self.send(TBatchRequest(requests))
+
+    def send(self, request: TRequest) -> None:
+        try:
+            self.outgoing_messages.put(request)
+        except TFailure as failure:
+            logmain.warning(failure.message)
+
+            for item in getattr(request, "requests", [request]):
+                rejected = TFailure(failure.message)
+                rejected.request_id = item.id
+
+                self.triggered.emit(rejected)
+
+    @pyqtSlot(TRequest)
+    def handle_requested(self, request: TRequest) -> None:
+        if self.batched is not None and isinstance(request, TFetchRequest):
+            self.batched.append(request)
+        else:
+            self.send(request)
+
+    @pyqtSlot(object)
+    def handle_received(self, message) -> None:
+        if isinstance(message, TBatchResponse):
+            for response in message.responses:
+                self.handle_received(response)
+
+            return
+
+        if isinstance(message, TMetricsFetchResponse):
+            # Channel metrics of this side are only known to this process
+            message.client_metrics = metrics.snapshot()
+
+        if isinstance(message, TFailure):
+            logmain.warning(f"Request {message.request_id} failed: {message.message}")
+
+            self.triggered.emit(message)
+        else:
+            self.responded.emit(message)
@@ -0,0 +1,217 @@
+import copy
+from collections import OrderedDict
+from uuid import uuid4
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import pyqtSlot
+
+from src.client.common import TObject
+from src.common.failure import TFailure
+from src.common.logger import logmain
+from src.common.metrics import metrics
+from src.common.request import TRequest
+from src.common.request.cancel import TCancelRequest
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.common.request.fetch.slot_fetch_request import TRaySlotWithTagFetchRequest
+from src.common.request.stash import TStashRequest
+from src.common.response import TResponse
+from src.common.response.fetch.slot_fetch_response import TRaySlotFetchResponse
+from src.common.response.fetch.slot_fetch_response import TRaySlotWithTagFetchResponse
+from src.common.response.fetch.slot_fetch_response import TSlotFetchResponse
+
+
+class TCacheBroker(TObject):
+    """
+    Keep recently seen days of history in memory, between widgets and server
+
+    Ray requests ask for a slice of days: [slice_fst, slice_lst). Every day of
+    a response is kept separately, so a request is answered from memory when
+    all its days are known. Otherwise, only the missing days are requested
+    from the server and the response is merged with the known days.
+
+    The least recently used days are evicted once the days hold more than
+    `capacity` entries in total. Any stash request passing through clears the
+    cache, since the history could change.
+
+    Hits and misses are published to `src.common.metrics.metrics` under the
+    "client_cache." prefix.
+
+    Args:
+        capacity: the maximum number of entries to keep in memory
+        parent  : if Qt ownership is required, provides parent object
+    """
+
+    RAY_REQUESTS = (TRaySlotFetchRequest, TRaySlotWithTagFetchRequest)
+
+    def __init__(self, capacity: int = 4096, parent: QObject = None) -> None:
+        super().__init__(parent)
+
+        self.capacity = capacity
+
+        # (ray, index of the day) -> the entries of the day
+        self.days = OrderedDict()
+        self.size = 0
+
+        # id of the request sent to the server -> what to merge its response
+        # with: (the original request, entries before, entries after)
+        self.forwarded = {}
+
+    def ray(self, request: TRequest) -> tuple:
+        """Return what identifies the ray of days that the request slices"""
+
+        return (
+            request.__class__.__name__,
+            request.dt_offset,
+            request.direction,
+            request.dates_dir,
+            request.times_dir,
+            getattr(request, "flat_tags", None),
+        )
+
+    @pyqtSlot(TRequest)
+    def handle_requested(self, request: TRequest) -> None:
+        if isinstance(request, TStashRequest):
+            self.invalidate()
+
+        if isinstance(request, TCancelRequest):
+            request.ids = [self.forwarded_id(id) for id in request.ids]
+
+            for id in request.ids:
+                self.forwarded.pop(id, None)
+
+            if request.group is not None:
+                self.forget_group(request.group)
+
+        if isinstance(request, self.RAY_REQUESTS) and not request.prefetch:
+            return self.handle_ray_request(request)
+
+        self.requested.emit(request)
+
+    def handle_ray_request(self, request: TRequest) -> None:
+        if request.supersede and request.group is not None:
+            self.forget_group(request.group)
+
+        ray = self.ray(request)
+
+        indices = range(request.slice_fst, request.slice_lst)
+        missing = [index for index in indices if (ray, index) not in self.days]
+
+        if not missing:
+            metrics.increment("client_cache.hit")
+
+            response = self.assemble(request, self.collect(ray, indices))
+
+            if request.supersede and request.group is not None:
+                # Nothing goes to the server, but the older requests are stale
+                self.requested.emit(TCancelRequest(group=request.group))
+
+            return self.responded.emit(response)
+
+        metrics.increment("client_cache.miss")
+
+        fst, lst = min(missing), max(missing) + 1
+
+        forward = copy.copy(request)
+        forward.id = uuid4().hex
+        forward.slice_fst = fst
+        forward.slice_lst = lst
+
+        self.forwarded[forward.id] = (
+            request,
+            self.collect(ray, range(request.slice_fst, fst)),
+            self.collect(ray, range(lst, request.slice_lst)),
+        )
+
+        self.requested.emit(forward)
+
+    def forwarded_id(self, id: str) -> str:
+        """Find the id of the request that was sent instead of the given one"""
+
+        for forwarded_id, (request, _, _) in self.forwarded.items():
+            if request.id == id:
+                return forwarded_id
+
+        return id
+
+    def forget_group(self, group: str) -> None:
+        """Forget the requests of the group, nobody waits for them anymore"""
+
+        for forwarded_id, (request, _, _) in list(self.forwarded.items()):
+            if request.group == group:
+                del self.forwarded[forwarded_id]
+
+    def collect(self, ray: tuple, indices: range) -> list:
+        items = []
+
+        for index in indices:
+            self.days.move_to_end((ray, index))
+
+            items.extend(self.days[(ray, index)])
+
+        return items
+
+    def assemble(self, request: TRequest, items: list) -> TSlotFetchResponse:
+        """Create the response to the original request out of the entries"""
+
+        if isinstance(request, TRaySlotWithTagFetchRequest):
+            response = TRaySlotWithTagFetchResponse.from_request(items, request)
+        else:
+            response = TRaySlotFetchResponse.from_request(items, request)
+
+        response.request_id = request.id
+
+        return response
+
+    @pyqtSlot(TResponse)
+    def handle_responded(self, response: TResponse) -> None:
+        if response.request_id not in self.forwarded:
+            return self.responded.emit(response)
+
+        request, before, after = self.forwarded.pop(response.request_id)
+
+        self.store(self.ray(request), response)
+
+        self.responded.emit(
+            self.assemble(request, before + list(response.items) + after)
+        )
+
+    @pyqtSlot(TFailure)
+    def handle_triggered(self, failure: TFailure) -> None:
+        if failure.request_id in self.forwarded:
+            request, _, _ = self.forwarded.pop(failure.request_id)
+
+            failure.request_id = request.id
+
+        self.triggered.emit(failure)
+
+    def store(self, ray: tuple, response: TSlotFetchResponse) -> None:
+        """Keep the days of the response, if each could be told apart"""
+
+        days = response.break_by_date()
+
+        if len(days) != response.slice_lst - response.slice_fst:
+            # Some days of the slice have no entries (or the history is over),
+            # so it is unclear which day is which; do not cache any of them
+            return
+
+        for index, (fst, lst) in enumerate(days, start=response.slice_fst):
+            key = (ray, index)
+
+            if key in self.days:
+                self.size -= len(self.days.pop(key))
+
+            self.days[key] = response.items[fst:lst]
+            self.size += lst - fst
+
+        while self.size > self.capacity and self.days:
+            _, items = self.days.popitem(last=False)
+
+            self.size -= len(items)
+
+        metrics.gauge("client_cache.size", self.size)
+
+    def invalidate(self) -> None:
+        logmain.debug("Clear the cache of days")
+
+        self.days.clear()
+        self.size = 0
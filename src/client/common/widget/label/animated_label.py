@@ -1,11 +1,117 @@
+import time
+from typing import Callable
+
+import sip
 from PyQt5.QtCore import *
 from PyQt5.QtGui import QHideEvent, QShowEvent
 from PyQt5.QtWidgets import *
 
 from src.common.logger import logged, logmain
+from src.common.sip_singleton import SipSingleton
+
+
+class TFade:
+    """
+    Fade the opacity of a label from one value to another
+
+    Fades are built once per label and played any number of times by the
+    TAnimationDriver, see TAnimatedLabel.
+
+    Args:
+        label   : the label to fade, it holds the opacity effect
+        fst     : the opacity to start from
+        lst     : the opacity to end with
+        finished: called once the fade reaches the end
+    """
+
+    def __init__(
+        self, label: 'TAnimatedLabel', fst: float, lst: float, finished: Callable
+    ):
+        self.label = label
+        self.fst = fst
+        self.lst = lst
+        self.finished = finished
+
+        self.started_at = None
+        self.duration = 0
+
+    def step(self, now: float) -> bool:
+        """Set the opacity for the moment, return True once at the end"""
+
+        if self.duration > 0:
+            progress = min((now - self.started_at) * 1000 / self.duration, 1.0)
+        else:
+            progress = 1.0
+
+        self.label.opacity_effect.setOpacity(
+            self.fst + (self.lst - self.fst) * progress
+        )
+
+        return progress >= 1.0
+
+
+class TAnimationDriver(QObject, metaclass=SipSingleton):
+    """
+    Step all the running fades on one timer
+
+    The timer runs only while there are fades to step, every fade is stepped
+    by the same tick, however many labels are animated.
+
+    Args:
+        interval: milliseconds between the steps
+    """
+
+    def __init__(self, interval: int = 16, parent: QObject = None):
+        super().__init__(parent)
+
+        self.fades = []
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.step)
+
+    def start(self, fade: TFade, duration: int) -> None:
+        """Play the fade from its start, it takes `duration` milliseconds"""
+
+        fade.started_at = time.monotonic()
+        fade.duration = duration
+
+        if fade not in self.fades:
+            self.fades.append(fade)
+
+        fade.step(fade.started_at)
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def stop(self, fade: TFade) -> None:
+        if fade in self.fades:
+            self.fades.remove(fade)
+
+    @pyqtSlot()
+    def step(self) -> None:
+        now = time.monotonic()
+
+        for fade in list(self.fades):
+            if sip.isdeleted(fade.label):
+                self.fades.remove(fade)  # the label is gone, nothing to show
+            elif fade.step(now):
+                self.fades.remove(fade)
+
+                fade.finished()
+
+        if not self.fades:
+            self.timer.stop()
 
 
 class TAnimatedLabel(QLabel):
+    """
+    Fade in once shown and fade out once hidden
+
+    The enter and leave fades and the opacity effect are built once per label.
+    The effect is disabled between the fades: a label at full opacity paints
+    directly, not through an offscreen buffer.
+    """
 
     enter_animation_played = pyqtSignal()
     leave_animation_played = pyqtSignal()
@@ -16,73 +122,48 @@ class TAnimatedLabel(QLabel):
         self.animate = animate
         self.base_animation_duration = 700
 
-        self.enter_animation_group = QParallelAnimationGroup()
-        self.leave_animation_group = QParallelAnimationGroup()
+        self.animation_driver = TAnimationDriver()
+
+        self.opacity_effect = QGraphicsOpacityEffect(self)
+        self.opacity_effect.setEnabled(False)
+        self.setGraphicsEffect(self.opacity_effect)
+
+        self.enter_animation = TFade(
+            self, 0.0, 1.0, self._handle_enter_animation_finished
+        )
+        self.leave_animation = TFade(
+            self, 1.0, 0.0, self._handle_leave_animation_finished
+        )
 
     @logged(disabled=True)
     def showEvent(self, event: QShowEvent) -> None:
         super().showEvent(event)
 
         if self.animate:
-            self._play_enter_animation()
+            self._play(self.enter_animation, self.leave_animation)
 
     @logged(disabled=True)
     def hideEvent(self, event: QHideEvent) -> None:
         super().hideEvent(event)
 
         if self.animate:
-            self._play_leave_animation()
+            self._play(self.leave_animation, self.enter_animation)
 
-    @logged(disabled=True)
-    def _play_enter_animation(self):
-        self.leave_animation_group.stop()
-        self.enter_animation_group.clear()
+    def _play(self, fade: TFade, other: TFade) -> None:
+        self.animation_driver.stop(other)
 
-        self.enter_opacity_effect = QGraphicsOpacityEffect()
-        self.setGraphicsEffect(self.enter_opacity_effect)
+        self.opacity_effect.setEnabled(True)
 
-        self.enter_opacity_animation = QPropertyAnimation(
-            self.enter_opacity_effect, b"opacity"
-        )
-        self.enter_opacity_animation.setStartValue(0.0)
-        self.enter_opacity_animation.setEndValue(1.0)
-        self.enter_opacity_animation.setDuration(self.base_animation_duration)
-
-        self.enter_animation_group.addAnimation(self.enter_opacity_animation)
-        self.enter_animation_group.finished.connect(
-            self._handle_enter_animation_group_finished
-        )
-
-        self.enter_animation_group.start()
+        self.animation_driver.start(fade, self.base_animation_duration)
 
     @logged(disabled=True)
-    def _play_leave_animation(self):
-        self.enter_animation_group.stop()
-        self.leave_animation_group.clear()
-
-        self.leave_opacity_effect = QGraphicsOpacityEffect()
-        self.setGraphicsEffect(self.leave_opacity_effect)
-
-        self.leave_opacity_animation = QPropertyAnimation(
-            self.leave_opacity_effect, b"opacity"
-        )
-        self.leave_opacity_animation.setStartValue(1.0)
-        self.leave_opacity_animation.setEndValue(0.0)
-        self.leave_opacity_animation.setDuration(self.base_animation_duration)
+    def _handle_enter_animation_finished(self):
+        self.opacity_effect.setEnabled(False)
 
-        # self.leave_animation_group.addAnimation(self.leave_animation_group)
-        self.leave_animation_group.finished.connect(
-            self._handle_leave_animation_group_finished
-        )
-
-        self.leave_animation_group.start()
-
-    @logged(disabled=True)
-    def _handle_enter_animation_group_finished(self):
         self.enter_animation_played.emit()
-        super().show()
 
     @logged(disabled=True)
-    def _handle_leave_animation_group_finished(self):
+    def _handle_leave_animation_finished(self):
+        self.opacity_effect.setEnabled(False)
+
         self.leave_animation_played.emit()
-        super().hide()
@@ -1,18 +1,28 @@
 from PyQt5.QtCore import QSize
 from PyQt5.QtWidgets import QLabel, QSizePolicy
 
-from logger import logged, logger
-from srv_color.service.color import MyColorService
-from srv_font.service.font import MyFontService
+from src.client.srv_color.service.style_sheet import TStyleSheetService
+from src.client.srv_font.service.font import TFontService
+from src.common.logger import logged
 
 
 class StyledLabel(QLabel):
+    """
+    Label in the sans serif font, colored by the application stylesheet
+
+    Like TColorAwareWidget, subclasses set `role` and never style themselves,
+    see TStyleSheetService.
+    """
+
+    role = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.font_service = MyFontService()
-        self.color_service = MyColorService()
+        self.font_service = TFontService()
+
+        if self.role is not None:
+            TStyleSheetService().register(self.__class__, self.role)
 
         self.font_service.base_height_changed.connect(
             self.handle_base_height_changed
@@ -31,14 +41,6 @@ class StyledLabel(QLabel):
         self.setFont(self.font_service.font_sans_serif)
         self.updateGeometry()
 
-    def set_style_sheet(self, class_name: str, fg_color: str, bg_color: str) -> None:
-        self.setStyleSheet(f"""
-            {class_name} {{
-                color: {fg_color};
-                background-color: {bg_color};
-            }}"""
-        )
-
     @logged(disabled=True)
     def sizeHint(self) -> QSize:
         size_hint = super().sizeHint()
@@ -57,38 +59,12 @@ class StyledLabel(QLabel):
 
 class PrimaryLabel(StyledLabel):
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        self.handle_style_sheet_changed()
-
-        self.color_service.fg_color_fst_lgt_changed.connect(self.handle_style_sheet_changed)
-        self.color_service.bg_color_fst_lgt_changed.connect(self.handle_style_sheet_changed)
-
-    def handle_style_sheet_changed(self):
-        self.set_style_sheet(
-            self.__class__.__name__
-            , self.color_service.fg_color_fst_lgt
-            , self.color_service.bg_color_fst_lgt
-        )
+    role = "main"
 
 
 class AlternateLabel(StyledLabel):
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        self.handle_style_sheet_changed()
-
-        self.color_service.fg_color_snd_lgt_changed.connect(self.handle_style_sheet_changed)
-        self.color_service.bg_color_snd_lgt_changed.connect(self.handle_style_sheet_changed)
-
-    def handle_style_sheet_changed(self):
-        self.set_style_sheet(
-            self.__class__.__name__
-            , self.color_service.fg_color_snd_lgt
-            , self.color_service.bg_color_snd_lgt
-        )
+    role = "next"
 
 
 class SuccessLabel(AlternateLabel):
@@ -98,17 +74,4 @@ class SuccessLabel(AlternateLabel):
 
 class FailureLabel(StyledLabel):
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        self.handle_style_sheet_changed()
-
-        self.color_service.fg_color_err_changed.connect(self.handle_style_sheet_changed)
-        self.color_service.bg_color_err_changed.connect(self.handle_style_sheet_changed)
-
-    def handle_style_sheet_changed(self):
-        self.set_style_sheet(
-            self.__class__.__name__
-            , self.color_service.fg_color_err
-            , self.color_service.bg_color_err
-        )
+    role = "failure"
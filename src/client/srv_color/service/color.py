@@ -1,4 +1,5 @@
 import re
+from contextlib import contextmanager
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtGui import QColor
@@ -8,6 +9,16 @@ from src.client.srv_color.model.color import TColorModel
 
 
 class TColorService(QObject, metaclass=SipSingleton):
+    """
+    Hold the colors of the application
+
+    Assigning a color emits its `*_changed` signal and then `colors_changed`.
+    Within `batch`, the signals wait until the batch ends and each fires only
+    once, so a new theme costs one restyle.
+    """
+
+    # Any color has changed, once per assignment or per batch
+    colors_changed = pyqtSignal()
 
     bg_color_fst_changed = pyqtSignal()
     bg_color_fst_lgt_changed = pyqtSignal()
@@ -39,6 +50,9 @@ class TColorService(QObject, metaclass=SipSingleton):
 
         self.kickstarted = False
 
+        # Names of the colors assigned within a batch, None outside of batches
+        self.batched = None
+
         self.colors = TColorModel()
 
         # aka primary color
@@ -83,8 +97,35 @@ class TColorService(QObject, metaclass=SipSingleton):
             # triggering the signals for now.
             return
 
-        if self.is_color_attr(key):
+        if not self.is_color_attr(key):
+            return
+
+        if self.batched is not None:
+            self.batched.append(key)
+        else:
             self.__getattribute__(key + "_changed").emit()
+            self.colors_changed.emit()
+
+    @contextmanager
+    def batch(self):
+        """Assign many colors, notify once the batch ends"""
+
+        if self.batched is not None:
+            yield  # within another batch, which notifies once it ends
+            return
+
+        self.batched = []
+
+        try:
+            yield
+        finally:
+            changed, self.batched = self.batched, None
+
+            for key in dict.fromkeys(changed):
+                self.__getattribute__(key + "_changed").emit()
+
+            if changed:
+                self.colors_changed.emit()
 
     def to_qt(self, hex_color: str, alpha: int = 255) -> QColor:
         if hex_color.startswith("#"):
@@ -0,0 +1,108 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+from PyQt5.QtWidgets import QApplication
+
+from src.common.logger import logmain
+from src.common.sip_singleton import SipSingleton
+from src.client.srv_color.service.color import TColorService
+
+
+class TStyleSheetService(QObject, metaclass=SipSingleton):
+    """
+    Compile one application stylesheet for all the color aware widgets
+
+    Widget classes register once with their role, e.g. "main" for primary
+    colors. The stylesheet has one rule per class, with the colors of its
+    role. Qt parses it once and widgets do not carry stylesheets of their
+    own. A change of colors costs one `QApplication.setStyleSheet`, not one
+    per widget.
+
+    Applying waits for the event loop, so several changes of colors (without
+    `TColorService.batch`) or many new classes still apply only once. Call
+    `apply` to apply the pending changes right away, e.g. before the first
+    paint of the window.
+    """
+
+    # role -> (color attribute of TColorService for fg, the same for bg)
+    ROLES = {
+        "main": ("fg_color_fst_lgt", "bg_color_fst_lgt"),
+        "next": ("fg_color_snd_lgt", "bg_color_snd_lgt"),
+        "failure": ("fg_color_err", "bg_color_err"),
+    }
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+
+        self.color_service = TColorService()
+
+        # widget class -> role
+        self.classes = {}
+
+        self.style_sheet = None
+        self.scheduled = False
+
+        self.color_service.colors_changed.connect(self.invalidate)
+
+    def register(self, cls: type, role: str) -> None:
+        """Style the instances of the class (and its subclasses) by role"""
+
+        if role not in self.ROLES:
+            raise RuntimeError(f"Expected role from {list(self.ROLES)}, was {role}")
+
+        if self.classes.get(cls) == role:
+            return
+
+        self.classes[cls] = role
+
+        self.invalidate()
+
+    def compile(self) -> str:
+        """Return the stylesheet of all the registered classes"""
+
+        rules = []
+
+        # A type selector matches subclasses too: put subclasses after their
+        # bases, so that a subclass with a role of its own wins
+        for cls in sorted(self.classes, key=lambda cls: len(cls.__mro__)):
+            fg_color, bg_color = self.ROLES[self.classes[cls]]
+
+            rules.append(
+                f"{cls.__name__} {{"
+                f" color: {getattr(self.color_service, fg_color)};"
+                f" background-color: {getattr(self.color_service, bg_color)};"
+                f" }}"
+            )
+
+        return "\n".join(rules)
+
+    @pyqtSlot()
+    def invalidate(self) -> None:
+        """Apply the stylesheet once the event loop runs"""
+
+        if self.scheduled:
+            return
+
+        self.scheduled = True
+
+        QTimer.singleShot(0, self.apply)
+
+    @pyqtSlot()
+    def apply(self) -> None:
+        """Set the stylesheet on the application, if it has changed"""
+
+        self.scheduled = False
+
+        style_sheet = self.compile()
+
+        if style_sheet == self.style_sheet:
+            return
+
+        app = QApplication.instance()
+
+        if app is None:
+            return  # nothing to style yet, try again with the next change
+
+        logmain.debug(f"Apply the stylesheet of {len(self.classes)} classes")
+
+        app.setStyleSheet(style_sheet)
+
+        self.style_sheet = style_sheet
@@ -72,15 +72,17 @@ class MyFontSettings(QWidget):
 
         styles = [style for style in QFontDatabase().styles(txt)]
 
-        self.wgt_font_style_combo_box.setItems(styles)
+        # Name, style and size change together: build the font only once
+        with self.service.batch():
+            self.wgt_font_style_combo_box.setItems(styles)
 
-        for style in styles:
-            if style.capitalize() in ["Normal", "Regular", "Roman"]:
-                self.wgt_font_style_combo_box.setCurrentText(style)
+            for style in styles:
+                if style.capitalize() in ["Normal", "Regular", "Roman"]:
+                    self.wgt_font_style_combo_box.setCurrentText(style)
 
-        setattr(self.service, font_attr + "_name", txt)
-        setattr(self.service, font_attr + "_style_name", self.wgt_font_style_combo_box.currentText())
-        setattr(self.service, font_attr + "_size", self.service.font_size)
+            setattr(self.service, font_attr + "_name", txt)
+            setattr(self.service, font_attr + "_style_name", self.wgt_font_style_combo_box.currentText())
+            setattr(self.service, font_attr + "_size", self.service.font_size)
 
     def handle_font_style_combo_box_current_text_changed(self, txt: str):
         font_attr = self.wgt_font_combo_box.currentData()
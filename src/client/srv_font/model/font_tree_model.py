@@ -0,0 +1,177 @@
+from typing import List
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, QObject, QRunnable
+from PyQt5.QtCore import QThreadPool, QVariant, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QFontDatabase
+
+
+class TFontFamilyStatus(QObject):
+    """Provides signal(s) for the font family (enumeration) task."""
+
+    found = pyqtSignal(list)
+
+
+class TFontFamilyTask(QRunnable):
+    """Enumerates font families asynchronously, a chunk at a time."""
+
+    def __init__(self, chunk: int, **kwargs):
+        super().__init__(**kwargs)
+
+        self.status = TFontFamilyStatus()
+
+        self.chunk = chunk
+
+    def run(self):
+        families = QFontDatabase().families()
+
+        for fst in range(0, len(families), self.chunk):
+            self.status.found.emit(families[fst:fst + self.chunk])
+
+
+class TFontTreeModel(QAbstractItemModel):
+    """
+    Expose font families with their styles and smooth sizes, lazily
+
+    Top-level rows are families: they are enumerated off the GUI thread and
+    arrive in chunks, so the view shows the first families right away. The
+    styles of a family (and their smooth sizes) are only looked up once the
+    view expands the family, see `canFetchMore` and `fetchMore`.
+
+    The internal id of an index is zero for a family and one more than the
+    row of its family for a style.
+
+    Args:
+        chunk: the number of families to add at once
+    """
+
+    def __init__(self, chunk: int = 256, **kwargs):
+        super().__init__(**kwargs)
+
+        self.chunk = chunk
+
+        self.families: List[str] = []
+
+        # row of a family -> [(style, smooth sizes), ...], once fetched
+        self.styles = {}
+
+        self.task = None
+
+    def load(self, threadpool: QThreadPool = None) -> None:
+        """Start enumerating the families in the background"""
+
+        if threadpool is None:
+            threadpool = QThreadPool.globalInstance()
+
+        # Keep the task, its status must outlive the queued signals
+        self.task = TFontFamilyTask(self.chunk)
+        self.task.status.found.connect(self.add_families)
+
+        threadpool.start(self.task)
+
+    @pyqtSlot(list)
+    def add_families(self, families: List[str]) -> None:
+        if not families:
+            return
+
+        fst = len(self.families)
+
+        self.beginInsertRows(QModelIndex(), fst, fst + len(families) - 1)
+        self.families.extend(families)
+        self.endInsertRows()
+
+    def is_family(self, index: QModelIndex) -> bool:
+        return index.isValid() and index.internalId() == 0
+
+    def index(
+            self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()):
+
+        if not parent.isValid():
+            return len(self.families)
+
+        if self.is_family(parent) and parent.column() == 0:
+            return len(self.styles.get(parent.row(), []))
+
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()):
+        return 2
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+
+        if not parent.isValid():
+            return bool(self.families)
+
+        if self.is_family(parent) and parent.column() == 0:
+            # Until fetched, assume there are styles, so it could be expanded
+            return self.styles.get(parent.row()) != []
+
+        return False
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return (
+            self.is_family(parent)
+            and parent.column() == 0
+            and parent.row() not in self.styles
+        )
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if not self.canFetchMore(parent):
+            return
+
+        font_database = QFontDatabase()
+        family = self.families[parent.row()]
+
+        styles = [
+            (style, " ".join(str(size) for size in font_database.smoothSizes(family, style)))
+            for style in font_database.styles(family)
+        ]
+
+        if not styles:
+            self.styles[parent.row()] = styles
+
+            return
+
+        self.beginInsertRows(parent, 0, len(styles) - 1)
+        self.styles[parent.row()] = styles
+        self.endInsertRows()
+
+    def headerData(
+            self
+            , section: int
+            , orientation: Qt.Orientation
+            , role: Qt.ItemDataRole = Qt.DisplayRole
+    ) -> QVariant:
+
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ["Font", "Smooth Sizes"][section]
+
+        return super().headerData(section, orientation, role)
+
+    def data(
+            self, index: QModelIndex = QModelIndex(), role: Qt.ItemDataRole = Qt.DisplayRole
+    ):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+
+        if self.is_family(index):
+            return self.families[index.row()] if index.column() == 0 else QVariant()
+
+        return self.styles[index.internalId() - 1][index.row()][index.column()]
@@ -1,7 +1,11 @@
+import json
 import re
 import time
+from contextlib import contextmanager
 from pathlib import Path
+from threading import Lock
 from threading import Thread
+from typing import List
 
 from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QFont, QFontDatabase
@@ -16,51 +20,219 @@ class TFontStatus(QObject):
     loaded = pyqtSignal()
 
 
-class TFontTask(QRunnable):
-    """Loads additional fonts asynchronously."""
+class TFontManifest:
+    """
+    Remember the font files of the asset folder and the families they hold
 
-    def __init__(self, path, **kwargs):
-        super().__init__(**kwargs)
+    The manifest is saved as JSON and lists every font file with its mtime and
+    families, and every folder with its mtime. It is up to date as long as no
+    file and no folder has changed (a new file changes its folder), which
+    takes a few stats instead of a walk through the whole asset folder.
 
-        self.status = TFontStatus()
+    Knowing the families of files, only the files of the families in use are
+    added to the application font database, the other ones once needed.
 
-        self.path = path
+    Args:
+        root: the asset folder
+        path: where to save the manifest, the working directory by default
+    """
 
-    @logged(logger=logdata, disabled=True)
-    def run(self):
-        font_database = QFontDatabase()
+    VERSION = 1
 
-        if self.path is None:
-            self.path = Path(Path(__file__).parent.parent, 'asset')
+    SUFFIXES = ('.ttf', '.otf')
 
-        if not self.path.exists():
-            logdata.warning(f'{self.__class__.__name__} cannot find asset folder')
+    def __init__(self, root: Path, path: Path = None):
+        self.root = root
+        self.path = Path(Path.cwd(), 'tslot.fonts.json') if path is None else path
 
-            return
+        # relative path of a folder -> mtime
+        self.dirs = {}
+
+        # relative path of a font file -> {"mtime": ..., "families": [...]}
+        self.fonts = {}
+
+        # relative paths of the font files added to the font database
+        self.added = set()
+
+        # The font task and the GUI thread might add fonts at the same time
+        self.lock = Lock()
+
+    def load(self) -> bool:
+        """Read the manifest, return if it is there and up to date"""
+
+        try:
+            with open(self.path) as file:
+                manifest = json.load(file)
+
+            if manifest['version'] != self.VERSION:
+                return False
+            if manifest['root'] != str(self.root):
+                return False
+
+            dirs, fonts = manifest['dirs'], manifest['fonts']
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as exception:
+            logdata.warning(f'Ignore the font manifest {self.path}: {exception}')
+
+            return False
+
+        try:
+            for name, mtime in dirs.items():
+                if Path(self.root, name).stat().st_mtime != mtime:
+                    return False
+
+            for name, font in fonts.items():
+                if Path(self.root, name).stat().st_mtime != font['mtime']:
+                    return False
+        except OSError:
+            return False  # something was removed
+
+        self.dirs, self.fonts = dirs, fonts
+
+        return True
+
+    def scan(self, font_database: QFontDatabase) -> None:
+        """Walk the asset folder, add every font to find out its families"""
 
-        msg = 'Font {} is in application font db with id {}'
+        dirs, fonts = {}, {}
 
-        must_visit = [self.path]
+        must_visit = [self.root]
 
         while must_visit:
             path = must_visit.pop()
 
+            dirs[str(path.relative_to(self.root))] = path.stat().st_mtime
+
             for entry in path.iterdir():
-                name = str(entry)
-
-                if entry.name.endswith('.ttf'):
-                    font_id = font_database.addApplicationFont(name)
-                    logdata.debug(msg.format(name, font_id))
-                elif entry.name.endswith('.otf'):
-                    font_id = font_database.addApplicationFont(name)
-                    logdata.debug(msg.format(name, font_id))
+                if entry.name.endswith(self.SUFFIXES):
+                    name = str(entry.relative_to(self.root))
+
+                    fonts[name] = {
+                        'mtime': entry.stat().st_mtime,
+                        'families': self.add(font_database, name),
+                    }
                 elif entry.is_dir():
                     must_visit.append(entry)
 
+        # Only now, the GUI thread might look up families meanwhile
+        self.dirs, self.fonts = dirs, fonts
+
+    def save(self) -> None:
+        manifest = {
+            'version': self.VERSION,
+            'root': str(self.root),
+            'dirs': self.dirs,
+            'fonts': self.fonts,
+        }
+
+        try:
+            with open(self.path, 'w') as file:
+                json.dump(manifest, file, indent=2)
+        except OSError as exception:
+            logdata.warning(f'Failed to save the font manifest: {exception}')
+
+    def holds(self, name: str, families: List[str]) -> bool:
+        """Check if the font file holds one of the families (or their prefix)"""
+
+        return any(
+            held.startswith(family)
+            for held in self.fonts[name]['families']
+            for family in families
+        )
+
+    def add_families(self, font_database: QFontDatabase, families: List[str]) -> int:
+        """Add the files of the families that are not added yet, count them"""
+
+        # Claim the files under the lock, so no other thread adds them too
+        with self.lock:
+            names = [
+                name
+                for name in self.fonts
+                if name not in self.added and self.holds(name, families)
+            ]
+
+            self.added.update(names)
+
+        for name in names:
+            self.add(font_database, name)
+
+        return len(names)
+
+    def add(self, font_database: QFontDatabase, name: str) -> List[str]:
+        """Add the font file to the font database, return its families"""
+
+        with self.lock:
+            font_id = font_database.addApplicationFont(str(Path(self.root, name)))
+
+            self.added.add(name)
+
+        logdata.debug(f'Font {name} is in application font db with id {font_id}')
+
+        if font_id == -1:
+            return []
+
+        return font_database.applicationFontFamilies(font_id)
+
+
+class TFontTask(QRunnable):
+    """
+    Loads additional fonts asynchronously.
+
+    Only the fonts of the given families are loaded, unless the manifest is
+    outdated: then every font is loaded to find out the families again.
+    """
+
+    def __init__(self, manifest: TFontManifest, families: List[str], **kwargs):
+        super().__init__(**kwargs)
+
+        self.status = TFontStatus()
+
+        self.manifest = manifest
+        self.families = families
+
+    @logged(logger=logdata, disabled=True)
+    def run(self):
+        font_database = QFontDatabase()
+
+        if not self.manifest.root.exists():
+            logdata.warning(f'{self.__class__.__name__} cannot find asset folder')
+
+            return
+
+        if self.manifest.load():
+            self.manifest.add_families(font_database, self.families)
+        else:
+            logdata.info('Font manifest is outdated, scan the asset folder')
+
+            self.manifest.scan(font_database)
+            self.manifest.save()
+
         self.status.loaded.emit()
 
 
 class TFontService(QObject, metaclass=SipSingleton):
+    """
+    Hold the fonts of the application
+
+    The fonts of the asset folder are loaded in the background, but only the
+    families used at startup, see STARTUP_FAMILIES. Fonts of other families
+    are loaded once `font` asks for them. Widgets resolve fonts with `font`,
+    which keeps the fonts it resolved until more fonts are loaded.
+
+    Changing the name, size or style of a font builds the font again and
+    emits its `font_*_changed` signal. Within `batch`, the fonts are built
+    once the batch ends, once each, and each signal fires only once: widgets
+    relayout once however many settings have changed.
+    """
+
+    # The name, size and style of a font: group 1 is the font
+    FONT_PATTERN = re.compile(
+        "^(font_serif|font_sans_serif|font_monospace)_(name|size|style_name)$"
+    )
+
+    # The families that the widgets use right away, their fonts load eagerly
+    STARTUP_FAMILIES = ['Quicksand', 'Inconsolata']
 
     base_height_changed = pyqtSignal()
 
@@ -76,6 +248,9 @@ class TFontService(QObject, metaclass=SipSingleton):
 
         self.kickstarted = False
 
+        # Names of the attributes assigned within a batch, None outside of it
+        self.batched = None
+
         self.font_size = 12
         self.base_height = 32
 
@@ -106,10 +281,19 @@ class TFontService(QObject, metaclass=SipSingleton):
 
         self.threadpool = QThreadPool.globalInstance()
 
+        self.manifest = TFontManifest(self.default_font_path())
+
+        # (family, style, size) -> font, see `font`
+        self.resolved = {}
+        self.font_database = None
+
         self.kickstarted = True
 
-    def load_more_fonts(self):
-        task = TFontTask(path=self.default_font_path())
+    def load_more_fonts(self, families: List[str] = None):
+        if families is None:
+            families = self.STARTUP_FAMILIES
+
+        task = TFontTask(self.manifest, families)
         task.status.loaded.connect(self._handle_font_task_loaded)
         self.threadpool.start(task)
 
@@ -118,12 +302,43 @@ class TFontService(QObject, metaclass=SipSingleton):
 
     @logged(logger=logmain, disabled=True)
     def _handle_font_task_loaded(self):
+        self.resolved.clear()
         self.font_loaded.emit()
 
+    def font(self, family: str, style: str, size: int) -> QFont:
+        """Resolve the font, load the fonts of the family first if needed"""
+
+        key = (family, style, size)
+
+        if key not in self.resolved:
+            if self.font_database is None:
+                self.font_database = QFontDatabase()
+
+            if self.manifest.add_families(self.font_database, [family]):
+                self.resolved.clear()  # other fonts might resolve differently
+
+            self.resolved[key] = self.font_database.font(family, style, size)
+
+        return self.resolved[key]
+
     def __setattr__(self, key, val):
         super().__setattr__(key, val)
 
-        if key == "base_height":
+        if key == "batched":
+            return
+
+        # NOTE: __init__ assigns a few attributes before `batched` itself
+        if getattr(self, "batched", None) is not None:
+            self.batched.append(key)
+        else:
+            self._notify(key)
+
+    def _notify(self, key: str) -> None:
+        match = self.FONT_PATTERN.match(key)
+
+        if match is not None:
+            self._change_font(match.group(1))
+        elif key == "base_height":
             self.base_height_changed.emit()
         elif key == "font_serif":
             self.font_serif_changed.emit()
@@ -131,18 +346,34 @@ class TFontService(QObject, metaclass=SipSingleton):
             self.font_sans_serif_changed.emit()
         elif key == "font_monospace":
             self.font_monospace_changed.emit()
-        elif key == "font_serif_name" \
-            or key == "font_serif_size" \
-            or key == "font_serif_style_name":
-            self._change_font("font_serif")
-        elif key == "font_sans_serif_name" \
-            or key == "font_sans_serif_size" \
-            or key == "font_sans_serif_style_name":
-            self._change_font("font_sans_serif")
-        elif key == "font_monospace_name" \
-            or key == "font_monospace_size" \
-            or key == "font_monospace_style_name":
-            self._change_font("font_monospace")
+
+    @contextmanager
+    def batch(self):
+        """Change many settings, build the fonts and notify once it ends"""
+
+        if self.batched is not None:
+            yield  # within another batch, which notifies once it ends
+            return
+
+        self.batched = []
+
+        try:
+            yield
+        finally:
+            changed, self.batched = self.batched, None
+
+            matches = [self.FONT_PATTERN.match(key) for key in changed]
+
+            # Build each font once, however many of its settings changed
+            fonts = dict.fromkeys(match.group(1) for match in matches if match)
+
+            for font_prefix in fonts:
+                self._change_font(font_prefix)
+
+            # The fonts that were built again have notified already
+            for key in dict.fromkeys(changed):
+                if key not in fonts and self.FONT_PATTERN.match(key) is None:
+                    self._notify(key)
 
     def _change_font(self, font_prefix: str):
         try:
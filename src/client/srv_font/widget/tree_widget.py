@@ -1,28 +1,22 @@
-from PyQt5.QtGui import QFontDatabase
-from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QWidget
+from PyQt5.QtWidgets import QTreeView, QWidget
 
+from src.client.srv_font.model.font_tree_model import TFontTreeModel
 
-class TFontTreeWidget(QTreeWidget):
 
-    def __init__(self, parent: QWidget = None):
-
-        super().__init__(parent)
+class TFontTreeWidget(QTreeView):
+    """
+    Show the font families with their styles and smooth sizes
 
-        self.font_database = QFontDatabase()
+    Families show up in chunks as they are enumerated in the background, the
+    styles of a family are looked up once it is expanded, see TFontTreeModel.
+    """
 
-        self.setColumnCount(2)
-        self.setHeaderLabels(["Font", "Smooth Sizes"])
+    def __init__(self, parent: QWidget = None):
 
-        for family in self.font_database.families():
-            font_family_item = QTreeWidgetItem(self)
-            font_family_item.setText(0, family)
+        super().__init__(parent)
 
-            for style in self.font_database.styles(family):
-                font_style_item = QTreeWidgetItem(font_family_item)
-                font_style_item.setText(0, style)
+        self.setUniformRowHeights(True)
 
-                sizes = ''
-                for size in self.font_database.smoothSizes(family, style):
-                    sizes += str(size) + ' '
+        self.setModel(TFontTreeModel(parent=self))
 
-                font_style_item.setText(1, sizes)
+        self.model().load()
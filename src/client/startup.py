@@ -0,0 +1,227 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+import pendulum
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import pyqtSlot
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.logger import logmain
+from src.common.metrics import STARTED_AT
+from src.common.metrics import metrics
+from src.common.response import TResponse
+from src.common.response.fetch.slot_fetch_response import TRaySlotFetchResponse
+from src.common.response.fetch.slot_fetch_response import TRaySlotWithTagFetchResponse
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+
+
+def dump_entry(item: TEntryModel) -> dict:
+    slot = item.slot
+    lst = None if slot.lst is None else str(slot.lst)
+
+    return {
+        "slot": [str(slot.fst), lst, slot.id],
+        "task": [item.task.name, item.task.id],
+        "tags": [[tag.name, tag.id] for tag in item.tags],
+    }
+
+
+def load_entry(data: dict) -> TEntryModel:
+    fst, lst, id = data["slot"]
+
+    lst = None if lst is None else pendulum.parse(lst)
+
+    return TEntryModel(
+        TSlotModel(pendulum.parse(fst), lst, id),
+        TTaskModel(*data["task"]),
+        [TTagModel(*tag) for tag in data["tags"]],
+    )
+
+
+def dump_days(response: TResponse) -> dict:
+    data = {
+        "items": [dump_entry(item) for item in response.items],
+        "dt_offset": str(response.dt_offset),
+        "direction": response.direction,
+        "dates_dir": response.dates_dir,
+        "times_dir": response.times_dir,
+        "slice_fst": response.slice_fst,
+        "slice_lst": response.slice_lst,
+    }
+
+    if isinstance(response, TRaySlotWithTagFetchResponse):
+        data["flat_tags"] = response.flat_tags
+
+    return data
+
+
+def load_days(data: dict) -> TResponse:
+    items = [load_entry(item) for item in data["items"]]
+
+    # Either a date or a moment, whichever the request had
+    dt_offset = pendulum.parse(data["dt_offset"], exact=True)
+
+    if "flat_tags" not in data:
+        return TRaySlotFetchResponse(
+            items,
+            dt_offset,
+            data["direction"],
+            data["dates_dir"],
+            data["times_dir"],
+            data["slice_fst"],
+            data["slice_lst"],
+        )
+
+    # The tags of the items are condensed already, do not condense them again
+    response = TRaySlotWithTagFetchResponse(
+        items,
+        dt_offset,
+        data["direction"],
+        data["dates_dir"],
+        data["times_dir"],
+        True,
+        data["slice_fst"],
+        data["slice_lst"],
+    )
+    response.flat_tags = data["flat_tags"]
+
+    return response
+
+
+class TStartupSnapshot(QObject):
+    """
+    Remember what the window showed last time, to show it again on launch
+
+    The snapshot holds the first pages of history (the days the user saw on
+    launch) and the active timer, as the responses that carried them. It is
+    saved once the client exits and loaded before the window is shown, so the
+    first paint has data without waiting for the server. Widgets treat the
+    snapshot as provisional and replace it with the first real response.
+
+    The snapshot is plain JSON, so reading it never runs any code. Any
+    snapshot that cannot be read is ignored, it is only a cache.
+
+    Args:
+        path  : where to keep the snapshot, next to the database by default
+        pages : how many pages of history to keep
+        parent: if Qt ownership is required, provides parent object
+    """
+
+    VERSION = 2
+
+    RAY_RESPONSES = (TRaySlotFetchResponse, TRaySlotWithTagFetchResponse)
+
+    def __init__(self, path: Path = None, pages: int = 2, parent: QObject = None):
+        super().__init__(parent)
+
+        self.path = Path(Path.cwd(), "tslot.snapshot") if path is None else path
+        self.pages = pages
+
+        self.days = []
+        self.timer = None
+
+    @pyqtSlot(TResponse)
+    def record(self, response: TResponse) -> None:
+        """Keep the response, if it holds what the next launch should show"""
+
+        if isinstance(response, self.RAY_RESPONSES):
+            if response.slice_fst == 0:
+                self.days = [response]
+            elif (
+                self.days
+                and len(self.days) < self.pages
+                and response.slice_fst == self.days[-1].slice_lst
+            ):
+                self.days.append(response)
+
+        if isinstance(response, TTimerFetchResponse):
+            self.timer = response.timer
+
+        if isinstance(response, TTimerStashResponse):
+            running = response.timer is not None and response.timer.slot.lst is None
+
+            self.timer = response.timer if running else None
+
+    def load(self) -> bool:
+        """Read the snapshot of the last launch, return if there was one"""
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+
+            if snapshot["version"] != self.VERSION:
+                raise ValueError(f"unknown version {snapshot['version']}")
+
+            days = [load_days(response) for response in snapshot["days"]]
+            timer = snapshot["timer"] and load_entry(snapshot["timer"])
+
+            self.days, self.timer = days, timer
+        except FileNotFoundError:
+            return False
+        except Exception as exception:
+            logmain.warning(f"Ignore the snapshot {self.path}: {exception}")
+
+            return False
+
+        return True
+
+    def save(self) -> None:
+        """Write the snapshot, readable only by the user (it names tasks)"""
+
+        snapshot = {
+            "version": self.VERSION,
+            "days": [dump_days(response) for response in self.days],
+            "timer": self.timer and dump_entry(self.timer),
+        }
+
+        temporary = self.path.with_name(self.path.name + ".tmp")
+
+        try:
+            fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+
+            # Never leave a half written snapshot behind
+            os.replace(temporary, self.path)
+        except OSError as exception:
+            logmain.warning(f"Failed to save the snapshot {self.path}: {exception}")
+
+
+class TFirstPaintFilter(QObject):
+    """
+    Measure the time from process start to the first paint of the history
+
+    Paints of an empty history do not count. The time is logged and published
+    to `src.common.metrics.metrics` as the "startup.first_paint" timing. The
+    filter removes itself after that.
+
+    Args:
+        widget: the widget to watch (e.g. the viewport of the history)
+        ready : returns True once the history has something to show
+    """
+
+    def __init__(self, widget: QObject, ready: Callable[[], bool]):
+        super().__init__(widget)
+
+        self.widget = widget
+        self.ready = ready
+
+        self.widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Paint and self.ready():
+            seconds = time.monotonic() - STARTED_AT
+
+            metrics.timing("startup.first_paint", seconds)
+            logmain.info(f"First paint of the history after {seconds:.3f}s")
+
+            self.widget.removeEventFilter(self)
+
+        return False
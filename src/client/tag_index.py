@@ -0,0 +1,133 @@
+import bisect
+from typing import Dict, Iterable, List, Set
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import pyqtSlot
+
+from src.client.common import TObject
+from src.common.dto.model import TTagModel
+from src.common.logger import logmain
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.common.response import TResponse
+from src.common.response.fetch.slot_fetch_response import TSlotFetchResponse
+from src.common.response.fetch.tag_fetch_response import TTagFetchResponse
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from src.common.sip_singleton import SipSingleton
+
+
+def trigrams(key: str) -> Set[str]:
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+class TTagIndex(TObject, metaclass=SipSingleton):
+    """
+    Look up tags by name in memory, e.g. to complete them in the tag editor
+
+    All the tags are fetched once on kickstart. Tags that arrive later with
+    entries (stashed timers, fetched slots) are added as they come, so the
+    index stays fresh without asking the server again.
+
+    Names are matched case-insensitively: first the names that start with the
+    text (binary search in the sorted names), then the names that contain it
+    (intersection of the names with each trigram of the text).
+    """
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+
+        self.clear()
+
+    def clear(self) -> None:
+        # casefolded name -> tag, the sorted casefolded names, and
+        # trigram -> casefolded names that contain it
+        self.tags: Dict[str, TTagModel] = {}
+        self.names: List[str] = []
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    def kickstart(self) -> None:
+        self.requested.emit(TTagFetchRequest())
+
+    def add(self, tags: Iterable[TTagModel]) -> None:
+        for tag in tags:
+            key = tag.name.casefold()
+
+            if key in self.tags:
+                # A tag that was created meanwhile gets its id from the server
+                if self.tags[key].id is None:
+                    self.tags[key] = tag
+
+                continue
+
+            self.tags[key] = tag
+
+            bisect.insort(self.names, key)
+
+            for trigram in trigrams(key):
+                self.trigrams.setdefault(trigram, set()).add(key)
+
+    def find(self, name: str) -> TTagModel:
+        """Return the tag with exactly the name (in any case), None if unknown"""
+
+        return self.tags.get(name.casefold())
+
+    def search(self, text: str, limit: int = 10) -> List[str]:
+        """Return the names of at most `limit` tags that contain the text"""
+
+        key = text.casefold()
+
+        if not key:
+            return []
+
+        found = []
+
+        row = bisect.bisect_left(self.names, key)
+
+        while (
+            row < len(self.names)
+            and len(found) < limit
+            and self.names[row].startswith(key)
+        ):
+            found.append(self.names[row])
+            row += 1
+
+        if len(found) < limit:
+            if len(key) < 3:
+                candidates = self.names  # too short for trigrams, few anyway
+            else:
+                postings = sorted(
+                    (self.trigrams.get(trigram, set()) for trigram in trigrams(key)),
+                    key=len,
+                )
+
+                candidates = sorted(set.intersection(*postings))
+
+            # Trigrams could match in another order, check the whole text
+            others = (
+                name for name in candidates
+                if key in name and not name.startswith(key)
+            )
+
+            for name in others:
+                if len(found) == limit:
+                    break
+
+                found.append(name)
+
+        return [self.tags[name].name for name in found]
+
+    @pyqtSlot(TResponse)
+    def handle_responded(self, response: TResponse) -> None:
+
+        if isinstance(response, TTagFetchResponse):
+            self.add(response.tags)
+
+            logmain.debug(f"Indexed {len(self.tags)} tags")
+
+        if isinstance(response, (TTimerFetchResponse, TTimerStashResponse)):
+            if response.timer is not None:
+                self.add(response.timer.tags)
+
+        if isinstance(response, TSlotFetchResponse):
+            for item in response.items:
+                self.add(item.tags)
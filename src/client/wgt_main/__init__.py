@@ -2,19 +2,40 @@ from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import QMainWindow, QShortcut, QVBoxLayout, QWidget
 
+from src.client.cache import TCacheBroker
+from src.client.common import TObject
 from src.client.common.widget import TWidget
+from src.client.startup import TFirstPaintFilter
+from src.client.startup import TStartupSnapshot
+from src.client.tag_index import TTagIndex
 from src.client.wgt_demo_label import TLabelDemo
 from src.client.wgt_timer import TTimerControlsDockWidget
 from src.client.wgt_timer_table import THomeScrollArea
+from src.client.wgt_timer_table.widget.timeline_view import TTimelineView
 from src.common.logger import logmain
 
 
 class TCentralWidget(TWidget):
-    def __init__(self, **kwargs):
+    """
+    Show the history of time slots and the demo label
+
+    Args:
+        virtual: show the history in a single virtualized TTimelineView, or
+                 else with one table view per day in a THomeScrollArea
+    """
+
+    def __init__(self, virtual: bool = True, **kwargs):
         super().__init__(**kwargs)
 
         self.wgt_label_demo = TLabelDemo()
-        self.scroll = THomeScrollArea(parent=self)
+
+        if virtual:
+            self.scroll = TTimelineView(parent=self)
+            # The widget that requests the days and handles the responses
+            self.history = self.scroll
+        else:
+            self.scroll = THomeScrollArea(parent=self)
+            self.history = self.scroll.widget()
 
         self.layout = QVBoxLayout()
 
@@ -30,6 +51,12 @@ class TCentralWidget(TWidget):
 
         self.show_next_shortcut.activated.connect(self.scroll.handle_show_next_shortcut)
 
+        self.reverse_shortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_R), self)
+        self.reverse_shortcut.activated.connect(self.scroll.handle_reverse_shortcut)
+
+        self.today_shortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_T), self)
+        self.today_shortcut.activated.connect(self.scroll.handle_today_shortcut)
+
     @pyqtSlot()
     def handle_show_next_shortcut(self):
         logmain.info("enter handle_show_next_shortcut")
@@ -39,34 +66,57 @@ class TMainWindow(QMainWindow):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # self.vault = TVaultBroker(parent=self)
-        # self.cache = TCacheBroker(parent=self)
+        self.cache = TCacheBroker(parent=self)
 
         self.timer = TTimerControlsDockWidget(parent=self)
+        self.tags = TTagIndex()
         self.widget = TCentralWidget(parent=self)
 
         self.setCentralWidget(self.widget)
 
         self.addDockWidget(Qt.TopDockWidgetArea, self.timer)
 
-        # # Connect database vault broker and memory cache broker:
-        # self.vault.responded.connect(self.cache.handle_responded)
-        # self.vault.triggered.connect(self.cache.handle_triggered)
-        # self.cache.requested.connect(self.vault.handle_requested)
+        # Connect memory cache broker with UI widgets
+        self.cache.responded.connect(self.widget.history.handle_responded)
+        self.cache.responded.connect(self.timer.handle_responded)
+        self.cache.responded.connect(self.tags.handle_responded)
+
+        self.cache.triggered.connect(self.widget.history.handle_triggered)
+        self.cache.triggered.connect(self.timer.handle_triggered)
+
+        self.widget.history.requested.connect(self.cache.handle_requested)
+        self.timer.requested.connect(self.cache.handle_requested)
+        self.tags.requested.connect(self.cache.handle_requested)
+
+        # Remember what was shown for the next launch, see restore
+        self.snapshot = TStartupSnapshot(parent=self)
+        self.cache.responded.connect(self.snapshot.record)
+
+        self.first_paint = TFirstPaintFilter(
+            self.widget.scroll.viewport(),
+            ready=lambda: not self.widget.history.is_empty(),
+        )
+
+    def connect_broker(self, broker: TObject) -> None:
+        """Connect the memory cache to the broker that talks to the server"""
+
+        broker.responded.connect(self.cache.handle_responded)
+        broker.triggered.connect(self.cache.handle_triggered)
+
+        self.cache.requested.connect(broker.handle_requested)
 
-        # # Connect memory cache broker with UI widgets
-        # self.cache.responded.connect(self.widget.scroll.widget().handle_responded)
-        # self.cache.responded.connect(self.timer.handle_responded)
+    def restore(self) -> None:
+        """Show the snapshot of the last launch, if any, until kickstart ends"""
 
-        # self.cache.triggered.connect(self.widget.scroll.widget().handle_triggered)
-        # self.cache.triggered.connect(self.timer.handle_triggered)
+        if not self.snapshot.load():
+            return
 
-        # self.widget.scroll.widget().requested.connect(self.cache.handle_requested)
-        # self.timer.requested.connect(self.cache.handle_requested)
+        for response in self.snapshot.days:
+            self.widget.history.show_snapshot(response)
 
-        # Kickstart all widgets (signals/slots are connected now)
-        # self.kickstart()
+        self.timer.show_snapshot(self.snapshot.timer)
 
     def kickstart(self):
-        self.widget.scroll.widget().kickstart()
+        self.widget.history.kickstart()
         self.timer.kickstart()
+        self.tags.kickstart()
@@ -24,3 +24,6 @@ class TTimerControlsDockWidget(TDockWidget):
 
     def kickstart(self):
         self.timer_controls_wgt.kickstart()
+
+    def show_snapshot(self, timer):
+        self.timer_controls_wgt.show_snapshot(timer)
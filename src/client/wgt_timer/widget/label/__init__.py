@@ -1,5 +1,5 @@
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QFontDatabase
+from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QLabel
 
 from src.client.common.widget.label.animated_label import *
@@ -23,7 +23,7 @@ class TTimerLabel(TFontAwareLabel, TPrimaryColorAwareLabel):
 
     def setup_font(self):
         self.setFont(
-            QFontDatabase().font(
-                'Inconsolata', 'Bold', 4 * self._font_service.font_monospace_size / 3
+            self._font_service.font(
+                'Inconsolata', 'Bold', 4 * self._font_service.font_monospace_size // 3
             )
         )
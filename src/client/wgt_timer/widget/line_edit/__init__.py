@@ -1,7 +1,7 @@
 import time
 
 from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QFont, QFontDatabase
+from PyQt5.QtGui import QFont
 
 from src.client.common.widget.common.font_aware_widget import TFontAwareWidget
 from src.client.common.widget.line_edit.color_aware_line_edit import \
@@ -32,7 +32,7 @@ class TTimerLineEdit(TAlternateColorAwareLineEdit, TFontAwareWidget):
     @logged(logger=logmain, disabled=True)
     def setup_font(self):
         self.setFont(
-            QFontDatabase().font('Quicksand', 'Bold', self._font_service.font_serif_size)
+            self._font_service.font('Quicksand', 'Bold', self._font_service.font_serif_size)
         )
 
     @logged(disabled=True)
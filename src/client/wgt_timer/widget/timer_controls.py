@@ -15,6 +15,7 @@ from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
 from src.common.request.stash.timer_stash_request import TTimerStashRequest
 from src.common.response import TResponse
 from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
 
 
 class TTimerControlsWidget(TWidget):
@@ -25,6 +26,9 @@ class TTimerControlsWidget(TWidget):
 
         self.item = None
 
+        # Set while the timer comes from the snapshot of the last launch
+        self.provisional = False
+
         self.task_ldt = TTimerLineEdit()
         self.timer_wgt = TTimerWidget()
         self.push_btn = TTimerPushButton()
@@ -49,6 +53,47 @@ class TTimerControlsWidget(TWidget):
     def kickstart(self):
         self.requested.emit(TTimerFetchRequest())
 
+    def show_snapshot(self, timer: TEntryModel) -> None:
+        """
+        Run the timer of the last launch until the server sends the real one
+
+        The buttons stay disabled meanwhile: the server answers the fetch
+        with what it had before any change the user might make.
+        """
+
+        if timer is None or self.timer_wgt.isActive():
+            return
+
+        self.start_timer(timer)
+
+        self.provisional = True
+
+        self.push_btn.setDisabled(True)
+        self.nuke_btn.setDisabled(True)
+
+    def reconcile(self, timer: TEntryModel) -> bool:
+        """Replace the timer of the snapshot, return if it was the same one"""
+
+        self.provisional = False
+
+        self.push_btn.setDisabled(False)
+        self.nuke_btn.setDisabled(False)
+
+        if timer is not None and timer.slot.fst == self.item.slot.fst:
+            self.item = timer
+            self.task_ldt.setText(timer.task.name)
+
+            return True
+
+        # NOTE: the server knows nothing about the timer, only hide it
+        self.timer_wgt.stop_timer()
+        self.item = None
+
+        self.task_ldt.clear()
+        self.nuke_btn.hide()
+
+        return False
+
     @pyqtSlot()
     def toggle_timer(self):
         self.push_btn.setDisabled(True)
@@ -127,8 +172,28 @@ class TTimerControlsWidget(TWidget):
         if isinstance(response, TTimerFetchResponse):
             self.handle_timer_fetch_response(response)
 
+        if isinstance(response, TTimerStashResponse):
+            self.handle_timer_stash_response(response)
+
+    def handle_timer_stash_response(self, response: TTimerStashResponse):
+        """Take the ids of a new timer, so that stopping it updates its slot"""
+
+        timer = response.timer
+
+        if timer is None or self.item is None or self.item.slot.id is not None:
+            return
+
+        if timer.slot.fst != self.item.slot.fst:
+            return  # the response is about some other timer
+
+        self.item.slot.id = timer.slot.id
+        self.item.task.id = timer.task.id
+
     def handle_timer_fetch_response(self, response: TTimerFetchResponse):
 
+        if self.provisional and self.reconcile(response.timer):
+            return  # the snapshot was right, the timer keeps running
+
         if response.timer is None:
             return  # database stores no active timer, nothing to do
 
@@ -1,4 +1,6 @@
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, QTimer, pyqtSlot
+
+import pendulum
 
 from src.client.common.widget.scroll_area import TScrollArea
 from src.client.wgt_timer_table.widget.scroll_widget import TScrollWidget
@@ -15,6 +17,31 @@ class THomeScrollArea(TScrollArea):
         self.setWidget(TScrollWidget())
         self.setWidgetResizable(True)
 
+        self.verticalScrollBar().valueChanged.connect(self.handle_scrolled)
+        self.widget().shifted.connect(self.handle_shifted)
+
+    @pyqtSlot()
+    def handle_scrolled(self):
+        top = self.verticalScrollBar().value()
+
+        self.widget().handle_scrolled(top, top + self.viewport().height())
+
+    @pyqtSlot(int)
+    def handle_shifted(self, shift: int):
+        # The layout settles on the next pass of the event loop, only then
+        # the scroll bar has the range to move within
+        bar = self.verticalScrollBar()
+
+        QTimer.singleShot(0, lambda: bar.setValue(bar.value() + shift))
+
     @pyqtSlot()
     def handle_show_next_shortcut(self):
         self.widget().request_next()
+
+    @pyqtSlot()
+    def handle_reverse_shortcut(self):
+        self.widget().reverse()
+
+    @pyqtSlot()
+    def handle_today_shortcut(self):
+        self.widget().reset(pendulum.today(), self.widget().direction)
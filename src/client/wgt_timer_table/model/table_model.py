@@ -1,18 +1,198 @@
 import logging
-from typing import List
+from typing import Dict, List, Tuple
 
 from PyQt5.QtCore import *
 
-from src.common.dto.model import TEntryModel
+from src.client.tag_index import TTagIndex
+from src.common.dto.model import TEntryModel, TTagModel
 from src.common.logger import logged
 from src.utils import pendulum2str, timedelta2str
 
 
+def find_position(
+    items: List[TEntryModel], item: TEntryModel, times_dir: str
+) -> int:
+    """Find where the entry goes, so that the entries stay in times_dir"""
+
+    for row, other in enumerate(items):
+        if times_dir == "past_to_future" and item.slot.fst < other.slot.fst:
+            return row
+        if times_dir == "future_to_past" and item.slot.fst > other.slot.fst:
+            return row
+
+    return len(items)
+
+
+def render_entry(entry: TEntryModel) -> Tuple:
+    """Return the display strings of all the columns of the entry"""
+
+    slot, task, tags = entry.slot, entry.task, entry.tags
+
+    return (
+        task.name,
+        ' '.join(tag.name for tag in tags),
+        pendulum2str(slot.fst),
+        pendulum2str(slot.lst),
+        timedelta2str(slot.lst - slot.fst),
+        QVariant(),
+    )
+
+
+class TRenderTask(QRunnable):
+    """Render the display strings of many entries off the GUI thread."""
+
+    def __init__(self, items: List[TEntryModel], rendered: Dict, **kwargs):
+        super().__init__(**kwargs)
+
+        # A copy: the model could insert or remove entries meanwhile
+        self.items = list(items)
+        self.rendered = rendered
+
+    def run(self):
+        for item in self.items:
+            # Assigning to a dict is atomic, the GUI thread sees either
+            # nothing (and renders the entry itself) or the finished strings
+            self.rendered.setdefault(id(item), (item, render_entry(item)))
+
+
+def resolve_tags(value: str, old_tags: List[TTagModel]) -> List[TTagModel]:
+    """
+    Return the tags for the space separated names
+
+    A name could be a tag of the entry already, an existing tag that the
+    entry did not use before (see TTagIndex) or a brand new tag (no id).
+    """
+
+    tags, tag_index = [], TTagIndex()
+
+    for name in value.split():
+        for tag in old_tags:
+            if tag.name == name:
+                break
+        else:
+            tag = tag_index.find(name) or TTagModel(name)
+
+        if tag not in tags:
+            tags.append(tag)
+
+    return tags
+
+
+def lookup(rendered: Dict, entry: TEntryModel) -> Tuple:
+    """Return the display strings of the entry, render them if there are none"""
+
+    cached, strings = rendered.get(id(entry), (None, None))
+
+    if cached is not entry:
+        strings = render_entry(entry)
+
+        rendered[id(entry)] = (entry, strings)
+
+    return strings
+
+
+def precompute(
+    items: List[TEntryModel], rendered: Dict, threshold: int
+) -> None:
+    """
+    Render the entries ahead of the first paint
+
+    Up to `threshold` entries are rendered right away, larger pages are
+    rendered on the global thread pool. Either way, `data` renders whatever
+    is not there yet by itself, so it never waits for the thread.
+    """
+
+    if len(items) < threshold:
+        for item in items:
+            rendered[id(item)] = (item, render_entry(item))
+    else:
+        QThreadPool.globalInstance().start(TRenderTask(items, rendered))
+
+
 class TTableModel(QAbstractTableModel):
+    """
+    Show the entries of one day, one row per entry
 
-    def __init__(self, items: List[TEntryModel], **kwargs):
+    Once loaded, the entries change in place: `apply` inserts a new entry or
+    updates a known one (e.g. a stashed timer) through the Qt model signals,
+    so the views update the affected row instead of laying out the day.
+
+    The display strings of an entry are rendered once, when it is loaded,
+    and kept until the entry changes. Paints and size hints only look them up.
+
+    Args:
+        items    : the entries of the day
+        times_dir: the direction of time the entries are in
+    """
+
+    # Pages with at least this many entries are rendered on a worker thread
+    PRECOMPUTE_THRESHOLD = 512
+
+    def __init__(
+        self, items: List[TEntryModel], times_dir: str = "future_to_past", **kwargs
+    ):
         super().__init__(**kwargs)
         self.items = items
+        self.times_dir = times_dir
+
+        # id of an entry -> the entry and the display strings of its columns.
+        # The entry is kept to tell it from a later entry with the same id
+        self.rendered = {}
+
+        precompute(self.items, self.rendered, self.PRECOMPUTE_THRESHOLD)
+
+    def find_row(self, slot_id: int) -> int:
+        """Return the row of the entry with the slot id, None if there is none"""
+
+        if slot_id is None:
+            return None
+
+        for row, item in enumerate(self.items):
+            if item.slot.id == slot_id:
+                return row
+
+        return None
+
+    def apply(self, item: TEntryModel) -> None:
+        """Insert the entry or update it in place if it is already here"""
+
+        row = self.find_row(item.slot.id)
+
+        if row is not None:
+            others = self.items[:row] + self.items[row + 1:]
+
+            if find_position(others, item, self.times_dir) == row:
+                return self.update_entry(row, item)
+
+            # The entry has moved in time, so it goes to another row
+            self.remove_entries(row)
+
+        self.insert_entries(find_position(self.items, item, self.times_dir), [item])
+
+    def insert_entries(self, row: int, items: List[TEntryModel]) -> None:
+        precompute(items, self.rendered, self.PRECOMPUTE_THRESHOLD)
+
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self.items[row:row] = items
+        self.endInsertRows()
+
+    def update_entry(self, row: int, item: TEntryModel) -> None:
+        self.rendered.pop(id(self.items[row]), None)
+
+        self.items[row] = item
+
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, self.columnCount() - 1)
+        )
+
+    def remove_entries(self, row: int, count: int = 1) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+
+        for item in self.items[row:row + count]:
+            self.rendered.pop(id(item), None)
+
+        del self.items[row:row + count]
+        self.endRemoveRows()
 
     def rowCount(self, parent: QModelIndex = QModelIndex()):
         return len(self.items)
@@ -76,24 +256,7 @@ class TTableModel(QAbstractTableModel):
 
     def dataDisplayRole(self, index: QModelIndex=QModelIndex()):
 
-        row, column = index.row(), index.column()
-
-        entry = self.items[row]
-
-        slot, task, tags = entry.slot, entry.task, entry.tags
-
-        if column == 0:
-            return task.name
-        elif column == 1:
-            return ' '.join(tag.name for tag in tags)
-        elif column == 2:
-            return pendulum2str(slot.fst)
-        elif column == 3:
-            return pendulum2str(slot.lst)
-        elif column == 4:
-            return timedelta2str(slot.lst - slot.fst)
-
-        return QVariant()
+        return lookup(self.rendered, self.items[index.row()])[index.column()]
 
     def dataTextAlignmentRole(self, index: QModelIndex=QModelIndex()):
 
@@ -123,6 +286,9 @@ class TTableModel(QAbstractTableModel):
         else:
             raise RuntimeError(f'setData not implemented for {index.column()}')
 
+        # The entry has changed, render it again once it is painted
+        self.rendered.pop(id(self.items[index.row()]), None)
+
         self.dataChanged.emit(index, index, [role])
 
         return True
@@ -135,18 +301,9 @@ class TTableModel(QAbstractTableModel):
     @logged(logger=logging.getLogger('tslot-main'), disabled=False)
     def setDataForTag(self, index: QModelIndex, value: QVariant) -> None:
 
-        new_tags, old_tags = [], self.items[index.row()].tags
-
-        for name in value.split(' '):
-            for tag in old_tags:
-                if tag.name == name:
-                    new_tags.append(tag)
+        item = self.items[index.row()]
 
-                    break
-            else:
-                # It could be a *completely* new tag or an existing tag that was
-                # not used for this task before. Which is it?
-                raise RuntimeError('Need a working tag by name search!')
+        item.tags = resolve_tags(value, item.tags)
 
     def check_index(self, index: QModelIndex) -> bool:
         """Check if the supplied index makes sense"""
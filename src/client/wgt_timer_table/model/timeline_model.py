@@ -0,0 +1,321 @@
+import datetime
+import logging
+from typing import List, Tuple
+
+import pendulum
+from PyQt5.QtCore import *
+
+from src.client.wgt_timer_table.model.table_model import TTableModel
+from src.client.wgt_timer_table.model.table_model import find_position
+from src.client.wgt_timer_table.model.table_model import lookup
+from src.client.wgt_timer_table.model.table_model import precompute
+from src.client.wgt_timer_table.model.table_model import resolve_tags
+from src.common.dto.model import TEntryModel
+from src.common.logger import logged
+from src.utils import timedelta2str
+
+
+class TTimelineModel(QAbstractItemModel):
+    """
+    Expose the whole history as one model: a group row per day, entries below
+
+    Top-level rows are days, the rows below a day are its entries. Unlike a
+    TTableModel per day, there is one model for any number of days, so a
+    single view shows them all and only ever touches the rows on screen.
+
+    The internal id of an index tells the rows apart: zero for a day, the
+    key of the day for an entry of that day. Days get keys once and keep
+    them, so the indexes of entries stay valid while days come and go.
+
+    Display strings are rendered once per entry and per day, just like in
+    TTableModel, and rendered again only after the entry or the day changes.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.days: List[List[TEntryModel]] = []
+
+        # The key of each day, in the order of days, and the row of each key
+        self.keys: List[int] = []
+        self.rows = {}
+        self.next_key = 1
+
+        # See TTableModel.rendered; the strings of days are keyed by day key
+        self.rendered = {}
+        self.rendered_days = {}
+
+    def append_day(self, items: List[TEntryModel]) -> None:
+        """Add the entries of one day after all the other days"""
+
+        self.insert_day(len(self.days), items)
+
+    def insert_day(self, row: int, items: List[TEntryModel]) -> None:
+        precompute(items, self.rendered, TTableModel.PRECOMPUTE_THRESHOLD)
+
+        self.beginInsertRows(QModelIndex(), row, row)
+
+        self.days.insert(row, items)
+        self.keys.insert(row, self.next_key)
+        self.next_key += 1
+
+        self.reindex(row)
+
+        self.endInsertRows()
+
+    def remove_day(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+
+        for item in self.days[row]:
+            self.rendered.pop(id(item), None)
+
+        del self.days[row]
+        del self.rows[self.keys[row]]
+
+        self.rendered_days.pop(self.keys.pop(row), None)
+
+        self.reindex(row)
+
+        self.endRemoveRows()
+
+    def reindex(self, row: int) -> None:
+        """Update the rows of the days from the given row on"""
+
+        for i in range(row, len(self.keys)):
+            self.rows[self.keys[i]] = i
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.days, self.keys, self.rows = [], [], {}
+        self.rendered, self.rendered_days = {}, {}
+        self.endResetModel()
+
+    def find_day(self, date: pendulum.Date) -> int:
+        """Return the row of the day with the date, None if there is none"""
+
+        for row, items in enumerate(self.days):
+            if items[0].slot.fst.date() == date:
+                return row
+
+        return None
+
+    def find_entry(self, slot_id: int) -> Tuple[int, int]:
+        """Return the rows of the day and of the entry with the slot id"""
+
+        if slot_id is None:
+            return None
+
+        for day, items in enumerate(self.days):
+            for row, item in enumerate(items):
+                if item.slot.id == slot_id:
+                    return day, row
+
+        return None
+
+    def apply(self, item: TEntryModel, day: int, times_dir: str) -> None:
+        """
+        Insert the entry into the day, or update it in place if it is there
+
+        Args:
+            item     : the entry to insert or update
+            day      : the row of the day the entry belongs to
+            times_dir: the direction of time the entries of a day are in
+        """
+
+        found = self.find_entry(item.slot.id)
+
+        if found is not None:
+            old_day, row = found
+
+            items = self.days[old_day]
+            others = items[:row] + items[row + 1:]
+
+            if old_day == day and find_position(others, item, times_dir) == row:
+                self.forget(day, items[row])
+
+                items[row] = item
+
+                return self.dataChanged.emit(
+                    self.index(row, 0, self.index(day, 0)),
+                    self.index(row, self.columnCount() - 1, self.index(day, 0)),
+                )
+
+            self.remove_entry(old_day, row)
+
+            if day > old_day and not self.days[old_day]:
+                day -= 1  # the old day is gone, so the rows moved up
+
+            if not self.days[old_day]:
+                self.remove_day(old_day)
+
+        items = self.days[day]
+        row = find_position(items, item, times_dir)
+
+        self.forget(day, item)
+
+        self.beginInsertRows(self.index(day, 0), row, row)
+        items.insert(row, item)
+        self.endInsertRows()
+
+    def discard(self, slot_id: int) -> None:
+        """Remove the entry with the slot id (and its day, if it is empty)"""
+
+        found = self.find_entry(slot_id)
+
+        if found is None:
+            return
+
+        day, row = found
+
+        self.remove_entry(day, row)
+
+        if not self.days[day]:
+            self.remove_day(day)
+
+    def forget(self, day: int, item: TEntryModel) -> None:
+        """Drop the strings of the entry and of its day, they are outdated"""
+
+        self.rendered.pop(id(item), None)
+        self.rendered_days.pop(self.keys[day], None)
+
+    def remove_entry(self, day: int, row: int) -> None:
+        self.forget(day, self.days[day][row])
+
+        self.beginRemoveRows(self.index(day, 0), row, row)
+        del self.days[day][row]
+        self.endRemoveRows()
+
+    def is_day(self, index: QModelIndex) -> bool:
+        return index.isValid() and index.internalId() == 0
+
+    def entry(self, index: QModelIndex) -> TEntryModel:
+        return self.days[self.rows[index.internalId()]][index.row()]
+
+    def index(
+            self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+
+        return self.createIndex(row, column, self.keys[parent.row()])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+
+        return self.createIndex(self.rows[index.internalId()], 0, 0)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()):
+
+        if not parent.isValid():
+            return len(self.days)
+
+        if self.is_day(parent) and parent.column() == 0:
+            return len(self.days[parent.row()])
+
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()):
+        return 6
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        if self.is_day(index):
+            return Qt.ItemIsEnabled
+
+        if index.column() in [0, 1]:
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemNeverHasChildren
+
+        return Qt.ItemIsEnabled | Qt.ItemNeverHasChildren
+
+    def headerData(
+            self
+            , section: int
+            , orientation: Qt.Orientation
+            , role: Qt.ItemDataRole = Qt.DisplayRole
+    ) -> QVariant:
+
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ['Task', 'Tag', 'Started', 'Stopped', 'Elapsed', ''][section]
+
+        return super().headerData(section, orientation, role)
+
+    @logged(logger=logging.getLogger('tslot-main'), disabled=True)
+    def data(
+            self, index: QModelIndex = QModelIndex(), role: Qt.ItemDataRole = Qt.DisplayRole
+    ):
+        if not index.isValid():
+            raise RuntimeError('data expects an index that makes sense')
+
+        if role in [Qt.DisplayRole, Qt.EditRole]:
+            if self.is_day(index):
+                return self.dataDisplayRoleForDay(index)
+
+            return self.dataDisplayRoleForEntry(index)
+
+        if role == Qt.TextAlignmentRole and index.column() in [2, 3, 4]:
+            return Qt.AlignCenter
+
+        return QVariant()
+
+    def dataDisplayRoleForDay(self, index: QModelIndex):
+
+        key = self.keys[index.row()]
+
+        strings = self.rendered_days.get(key)
+
+        if strings is None:
+            items = self.days[index.row()]
+
+            elapsed = (item.slot.lst - item.slot.fst for item in items)
+
+            strings = self.rendered_days[key] = (
+                items[0].slot.fst.format('dddd, D MMMM YYYY'),
+                QVariant(),
+                QVariant(),
+                QVariant(),
+                timedelta2str(sum(elapsed, datetime.timedelta())),
+                QVariant(),
+            )
+
+        return strings[index.column()]
+
+    def dataDisplayRoleForEntry(self, index: QModelIndex):
+        return lookup(self.rendered, self.entry(index))[index.column()]
+
+    @logged(logger=logging.getLogger('tslot-main'), disabled=False)
+    def setData(
+        self
+        , index: QModelIndex
+        , value: QVariant
+        , role: int=Qt.EditRole
+    ) -> bool:
+
+        if role != Qt.EditRole:
+            return super().setData(index, value, role)
+
+        if not index.isValid() or self.is_day(index):
+            raise RuntimeError('setData expects an index of an entry')
+
+        item = self.entry(index)
+
+        if index.column() == 0:
+            item.task.name = value
+        elif index.column() == 1:
+            item.tags = resolve_tags(value, item.tags)
+        else:
+            raise RuntimeError(f'setData not implemented for {index.column()}')
+
+        self.forget(self.rows[index.internalId()], item)
+
+        self.dataChanged.emit(index, index, [role])
+
+        return True
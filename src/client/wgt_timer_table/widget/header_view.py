@@ -1,9 +1,62 @@
-from PyQt5.QtCore import QAbstractItemModel, Qt
-from PyQt5.QtWidgets import QHeaderView, QWidget
+from typing import List
+
+from PyQt5.QtCore import QAbstractItemModel, QEvent, QSize, Qt
+from PyQt5.QtGui import QFont, QFontMetrics
+from PyQt5.QtWidgets import QApplication, QHeaderView, QStyle
+from PyQt5.QtWidgets import QStyleOptionButton, QWidget
 
 from src.common.logger import logged, logmain
 
 
+# Start time, finish time and elapsed time ("HH:MM:SS"), then the nuke button
+FIXED_COLUMNS = [2, 3, 4, 5]
+
+# The key of a font -> the widths of FIXED_COLUMNS, shared by all headers
+FIXED_WIDTHS = {}
+
+
+def fixed_widths(font: QFont) -> List[int]:
+    """
+    Return the widths of the fixed columns for the font
+
+    The text of these columns always has the same format, so the widths do
+    not depend on the rows: they are measured once per font, not per cell.
+    """
+
+    key = font.key()
+
+    if key not in FIXED_WIDTHS:
+        metrics = QFontMetrics(font)
+        style = QApplication.style()
+
+        # See QStyledItemDelegate.sizeHint, +20 is the spacing between columns
+        margin = 2 * (style.pixelMetric(QStyle.PM_FocusFrameHMargin) + 1) + 20
+
+        digit = max(metrics.horizontalAdvance(digit) for digit in "0123456789")
+        time = 6 * digit + 2 * metrics.horizontalAdvance(":") + margin
+
+        button = style.sizeFromContents(
+            QStyle.CT_PushButton,
+            QStyleOptionButton(),
+            QSize(metrics.horizontalAdvance("trash"), metrics.height()),
+        ).width()
+
+        FIXED_WIDTHS[key] = [time, time, time, button]
+
+    return FIXED_WIDTHS[key]
+
+
+def fix_widths(header: QHeaderView) -> None:
+    """Make the fixed columns of the header as wide as its font needs"""
+
+    if header.count() <= max(FIXED_COLUMNS):
+        return  # no model yet
+
+    for column, width in zip(FIXED_COLUMNS, fixed_widths(header.font())):
+        header.setSectionResizeMode(column, QHeaderView.Fixed)
+        header.resizeSection(column, width)
+
+
 class THeaderView(QHeaderView):
     """
     Control size/resize of headers for the SlotTableView
@@ -19,10 +72,10 @@ class THeaderView(QHeaderView):
         self.section_resize_modes = [
             QHeaderView.Stretch # name of task
             , QHeaderView.Stretch # list of tags
-            , QHeaderView.ResizeToContents # start time
-            , QHeaderView.ResizeToContents # finish time
-            , QHeaderView.ResizeToContents # elapsed time
-            , QHeaderView.ResizeToContents # nuke button
+            , QHeaderView.Fixed # start time, see fixed_widths
+            , QHeaderView.Fixed # finish time
+            , QHeaderView.Fixed # elapsed time
+            , QHeaderView.Fixed # nuke button
         ]
 
         self.hide()
@@ -53,6 +106,14 @@ class THeaderView(QHeaderView):
         for i, mode in enumerate(self.section_resize_modes):
             self.setSectionResizeMode(i, mode)
 
+        fix_widths(self)
+
+    def changeEvent(self, event: QEvent) -> None:
+        super().changeEvent(event)
+
+        if event.type() == QEvent.FontChange:
+            fix_widths(self)
+
     @logged(logger=logmain, disabled=True)
     def sectionSizeHint(self, logical_index: int) -> int:
         return super().sectionSizeHint(logical_index)
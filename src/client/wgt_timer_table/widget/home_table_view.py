@@ -1,6 +1,6 @@
 import logging
 
-from PyQt5.QtCore import QAbstractItemModel, Qt
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QSizePolicy
 
 from src.client.common.widget.table_view import TTableView
@@ -19,6 +19,12 @@ class THomeTableView(TTableView, TFontAwareTableView):
         self.delegate = THomeTableStyleDelegate()
         self.setItemDelegate(self.delegate)
 
+        # The header lives as long as the view. Views are pooled and get a new
+        # model on every reuse: setModel passes it on to THeaderView.setModel,
+        # which applies the section resize modes again.
+        self.header_view = THeaderView(orientation=Qt.Horizontal, parent=self)
+        self.setHorizontalHeader(self.header_view)
+
         self.verticalHeader().hide()
         self.horizontalHeader().hide()
 
@@ -34,7 +40,7 @@ class THomeTableView(TTableView, TFontAwareTableView):
 
     def _handle_font_loaded(self):
         self.setFont(
-            QFontDatabase().font(
+            self._font_service.font(
                 'Quicksand', 'Regular', self._font_service.font_serif_size
             )
         )
@@ -55,23 +61,11 @@ class THomeTableView(TTableView, TFontAwareTableView):
         if not hheader.isHidden():
             h += hheader.height()
 
-        for i in range(vheader.count()):
-            if not vheader.isSectionHidden(i):
-                h += vheader.sectionSize(i)
+        # The total size of the visible sections, without a loop over rows
+        h += vheader.length()
 
         return QSize(w, h)
 
     @logged(logger=logging.getLogger('tslot-main'), disabled=True)
     def minimumSizeHint(self):
         return self.sizeHint()
-
-    @logged(logger=logging.getLogger('tslot-main'), disabled=True)
-    def setModel(self, model: QAbstractItemModel):
-
-        super().setModel(model)
-
-        # The code below is the reason why this method is overwritten
-        # It creates a brand new header view, installs and triggers it
-        self.header_view = THeaderView(orientation=Qt.Horizontal, parent=self)
-
-        self.setHorizontalHeader(self.header_view)
@@ -1,17 +1,19 @@
 import logging
 
-from PyQt5.QtCore import pyqtSlot
+from PyQt5.QtCore import pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QVBoxLayout
 
 import pendulum
 from src.client.common.widget import TWidget
 from src.client.wgt_timer_table.model.table_model import TTableModel
 from src.client.wgt_timer_table.widget.home_table_view import THomeTableView
+from src.common.dto.model import TEntryModel
 from src.common.request import TRequest
 from src.common.response import TResponse
 from src.common.failure import TFailure
 from src.common.response.fetch.slot_fetch_response import *
-from src.common.logger import logged
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from src.common.logger import logged, logmain
 
 
 class TScrollWidget(TWidget):
@@ -20,11 +22,33 @@ class TScrollWidget(TWidget):
 
     This widget should add/remove incoming THomeTableView's, effectively
     implementing infinite scroll for a series of tables of slots.
+
+    All the requests of this widget belong to the same group. Once the date
+    offset or the direction changes, the requests that are still in flight
+    become useless, so the first request after the change supersedes them.
+
+    Only the days around the viewport have views: the views that are further
+    than `window` viewport heights away are detached, their models dropped
+    (the client cache still keeps the days) and the views are put into a
+    pool to show other days later. Scrolling back re-requests such days.
+
+    Args:
+        window   : keep the views within this many viewport heights
+        pool_size: the maximum number of detached views kept for reuse
     """
 
-    def __init__(self, **kwargs):
+    GROUP = "scroll"
+
+    # The height of the content above the viewport has changed by this much,
+    # so the scroll area should move by it to keep the same days in view
+    shifted = pyqtSignal(int)
+
+    def __init__(self, window: int = 2, pool_size: int = 8, **kwargs):
         super().__init__(**kwargs)
 
+        self.window = window
+        self.pool_size = pool_size
+
         self.dt_offset = pendulum.today()
         self.direction = "future_to_past"
         self.dates_dir = "future_to_past"
@@ -33,8 +57,24 @@ class TScrollWidget(TWidget):
         self.slice_fst = 0
         self.slice_lst = 0
 
+        # ids of the requests that were sent but not yet responded to
+        self.pending = set()
+
+        # Set while the days come from the snapshot of the last launch
+        self.provisional = False
+
+        # views[i] shows the day slice_fst + i, known_lst is one past the last
+        # day that was ever shown (the days after slice_lst were evicted)
+        self.views = []
+        self.pool = []
+        self.known_lst = 0
+
+        # Shared by the detached views, so that they hold no days
+        self.empty_model = TTableModel([], parent=self)
+
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.addStretch(1)
 
         self.setLayout(self.layout)
 
@@ -45,7 +85,10 @@ class TScrollWidget(TWidget):
     def request_next(self):
         self.request(self.slice_lst, self.slice_lst + 1)
 
-    def request(self, slice_fst: int, slice_lst: int):
+    def request_prev(self):
+        self.request(self.slice_fst - 1, self.slice_fst)
+
+    def request(self, slice_fst: int, slice_lst: int, supersede: bool = False):
         request = TRaySlotWithTagFetchRequest(
               dt_offset = self.dt_offset
             , direction = self.direction
@@ -55,11 +98,63 @@ class TScrollWidget(TWidget):
             , slice_lst = slice_lst
         )
 
+        request.group = self.GROUP
+        request.supersede = supersede
+
+        self.pending.add(request.id)
+
         self.requested.emit(request)
 
+    def reset(self, dt_offset: pendulum.DateTime, direction: str) -> None:
+        """Start over from a different date offset or in another direction"""
+
+        # Responses to the old requests are stale now, the server drops the
+        # requests themselves once it sees the superseding one below
+        self.pending.clear()
+        self.provisional = False
+
+        while self.views:
+            self.release(self.views.pop())
+
+        self.dt_offset = dt_offset
+        self.direction = direction
+
+        self.slice_fst = 0
+        self.slice_lst = 0
+        self.known_lst = 0
+
+        self.request(0, 1, supersede=True)
+
+    def reverse(self) -> None:
+        """Show the same days, but in the other direction"""
+
+        if self.direction == "future_to_past":
+            self.reset(self.dt_offset, "past_to_future")
+        else:
+            self.reset(self.dt_offset, "future_to_past")
+
+    def is_stale(self, response: TResponse) -> bool:
+        """Check if the response answers a request that is no longer wanted"""
+
+        if response.request_id is None:
+            return False  # cannot tell, let the other checks decide
+
+        if response.request_id not in self.pending:
+            return True
+
+        self.pending.discard(response.request_id)
+
+        return False
+
     @pyqtSlot(TResponse)
     def handle_responded(self, response: TResponse):
 
+        if isinstance(response, TSlotFetchResponse) and self.is_stale(response):
+            return
+
+        if isinstance(response, TTimerStashResponse):
+            return self.apply(response.timer)
+
         if isinstance(response, TRaySlotFetchResponse):
             return self.handle_ray_slot_fetch(response)
 
@@ -67,13 +162,25 @@ class TScrollWidget(TWidget):
             return self.handle_ray_slot_with_tag_fetch(response)
 
     def handle_ray_slot_fetch(self, response: TRaySlotFetchResponse) -> None:
+        self.show_days(response)
 
-        if response.is_empty():
-            return
+    def handle_ray_slot_with_tag_fetch(
+            self, response: TRaySlotWithTagFetchResponse
+    ) -> None:
+        self.show_days(response)
 
-        if self.direction != response.direction:
-            # widget's data direction and response's data direction are
-            # not the same; Cannot use response data, so discard it
+    def is_empty(self) -> bool:
+        return not self.views
+
+    def show_snapshot(self, response: TSlotFetchResponse) -> None:
+        """
+        Show the days of the last launch until the server sends the real ones
+
+        The days do not count as loaded: no slices move, and the first
+        response replaces them all.
+        """
+
+        if self.direction != response.direction or response.is_empty():
             return
 
         if self.times_dir != response.times_dir:
@@ -82,67 +189,158 @@ class TScrollWidget(TWidget):
         if self.dates_dir != response.dates_dir:
             response.in_dates_dir(self.dates_dir)
 
-        for day in response.break_by_date():
-            fst_slot, lst_slot = day
+        for fst_slot, lst_slot in response.break_by_date():
+            self.show_next(self.acquire(response.items[fst_slot:lst_slot]))
 
-            view = THomeTableView(self)
-            model = TTableModel(response.items[fst_slot:lst_slot])
+        self.provisional = True
 
-            view.setModel(model)
+    def show_days(self, response: TSlotFetchResponse) -> None:
 
-            self.show_next(view)
+        if self.direction != response.direction:
+            # widget's data direction and response's data direction are not the
+            # same. Cannot use response data, so discard it.
+            return
 
-        if response.slice_fst < self.slice_fst:
-            self.slice_fst = response.slice_fst
-        if response.slice_lst > self.slice_lst:
-            self.slice_lst = response.slice_lst
+        if self.provisional:
+            # The days of the snapshot could be outdated, start from scratch
+            self.provisional = False
 
-    def handle_ray_slot_with_tag_fetch(
-            self, response: TRaySlotWithTagFetchResponse
-    ) -> None:
+            while self.views:
+                self.release(self.views.pop())
 
         if response.is_empty():
             return
 
-        if self.direction != response.direction:
-            # widget's data direction and response's data direction are not the
-            # same. Cannot use response data, so discard it.
-            return
-
         if self.times_dir != response.times_dir:
             response.in_times_dir(self.times_dir)
 
         if self.dates_dir != response.dates_dir:
             response.in_dates_dir(self.dates_dir)
 
-        for day in response.break_by_date():
-            fst_slot, lst_slot = day
+        days = response.break_by_date()
+
+        if response.slice_fst >= self.slice_lst:
+            for fst_slot, lst_slot in days:
+                self.show_next(self.acquire(response.items[fst_slot:lst_slot]))
+
+            self.slice_lst = response.slice_fst + len(days)
+        elif response.slice_lst <= self.slice_fst:
+            for fst_slot, lst_slot in reversed(days):
+                self.show_prev(self.acquire(response.items[fst_slot:lst_slot]))
+
+            self.slice_fst = response.slice_lst - len(days)
+        else:
+            return  # these days are already shown
+
+        self.known_lst = max(self.known_lst, self.slice_lst)
+
+    def apply(self, item: TEntryModel) -> None:
+        """Show a new or changed entry in the view of its day, if there is one"""
+
+        if item is None or item.slot.lst is None:
+            return  # the history shows only finished slots
+
+        date = item.slot.fst.date()
+
+        for view in self.views:
+            model = view.model()
+            row = model.find_row(item.slot.id)
+
+            if row is not None and model.items[row].slot.fst.date() != date:
+                model.remove_entries(row)  # the entry moved to another day
+
+            if model.items and model.items[0].slot.fst.date() == date:
+                model.apply(item)
+
+            # The size hint of the view follows the number of its rows
+            view.updateGeometry()
+
+    def acquire(self, items: list) -> THomeTableView:
+        """Take a view from the pool (or create one) to show the entries"""
+
+        view = self.pool.pop() if self.pool else THomeTableView(parent=self)
 
-            view = THomeTableView(parent=self)
-            model = TTableModel(response.items[fst_slot:lst_slot])
+        view.setModel(TTableModel(items, times_dir=self.times_dir))
+        view.show()
 
-            view.setModel(model)
+        return view
 
-            self.show_next(view)
+    def release(self, view: THomeTableView) -> None:
+        """Detach the view and put it into the pool, if there is room"""
 
-        if response.slice_fst < self.slice_fst:
-            self.slice_fst = response.slice_fst
-        if response.slice_lst > self.slice_lst:
-            self.slice_lst = response.slice_lst
+        self.layout.removeWidget(view)
+
+        view.hide()
+
+        if len(self.pool) < self.pool_size:
+            view.setModel(self.empty_model)
+
+            self.pool.append(view)
+        else:
+            view.deleteLater()
 
     def show_next(self, view: THomeTableView):
+        # Keep the stretch last, it props the views up
+        self.layout.insertWidget(self.layout.count() - 1, view)
 
-        # TODO: why does inserting not work?
-        # Remove the spacer that props widgets up
-        self.layout.takeAt(self.layout.count() - 1)
-        # Add the next widget
-        self.layout.addWidget(view)
-        # Add the spacer back to prop widgets up
-        self.layout.addStretch(1)
+        self.views.append(view)
 
     def show_prev(self, view: THomeTableView):
-        raise NotImplementedError()
+        self.layout.insertWidget(0, view)
+
+        self.views.insert(0, view)
+
+        self.shifted.emit(self.extent(view))
+
+    def extent(self, view: THomeTableView) -> int:
+        """Return how much vertical space the view takes in the layout"""
+
+        return view.sizeHint().height() + self.layout.spacing()
+
+    def handle_scrolled(self, top: int, bottom: int) -> None:
+        """
+        Keep the views around the visible area [top, bottom) of this widget
+
+        Detach the views that are too far from the visible area and request
+        the evicted days back once the visible area comes close to them.
+        Positions of the views are added up from their size hints: their
+        geometry lags behind until the layout settles.
+        """
+
+        margin = self.window * max(bottom - top, 1)
+
+        shift = 0
+
+        while len(self.views) > 1 and self.extent(self.views[0]) < top - margin:
+            extent = self.extent(self.views[0])
+
+            self.release(self.views.pop(0))
+            self.slice_fst += 1
+
+            top, bottom, shift = top - extent, bottom - extent, shift - extent
+
+        while len(self.views) > 1 and self.height_of(self.views[:-1]) > bottom + margin:
+            self.release(self.views.pop())
+            self.slice_lst -= 1
+
+        if shift:
+            self.shifted.emit(shift)
+
+        if self.pending or not self.views:
+            return
+
+        if self.slice_fst > 0 and top < margin:
+            self.request_prev()
+        elif self.slice_lst < self.known_lst and self.height_of(self.views) < bottom + margin:
+            self.request_next()
+
+    def height_of(self, views: list) -> int:
+        return sum(self.extent(view) for view in views)
 
     @pyqtSlot(TFailure)
     def handle_triggered(self, failure: TFailure):
-        raise NotImplementedError()
+        # The request failed (e.g. rejected because the server is busy), so
+        # it is no longer in flight; the user could ask for the slice again
+        self.pending.discard(failure.request_id)
+
+        logmain.warning(f"Failed to fetch slots: {failure.message}")
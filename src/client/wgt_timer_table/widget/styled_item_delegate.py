@@ -4,8 +4,8 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 
+from src.client.wgt_timer_table.widget.tag_completer import TTagCompleter
 from src.common.logger import logged, logmain
-from src.utils import style_option_as_str
 
 
 class THomeTableStyleDelegate(QStyledItemDelegate):
@@ -22,6 +22,15 @@ class THomeTableStyleDelegate(QStyledItemDelegate):
         if index.column() not in [0, 1, 2, 3]:
             raise RuntimeError(f'Editor for column {index.column()}')
 
+        if index.column() == 1:
+            editor = QLineEdit(parent)
+            editor.setFrame(False)
+
+            # The editor owns the completer, both go once editing ends
+            TTagCompleter(editor)
+
+            return editor
+
         # alternative: return QLineEdit(parent)
         return super().createEditor(parent, option, index)
 
@@ -43,33 +52,87 @@ class THomeTableStyleDelegate(QStyledItemDelegate):
     @logged(disabled=True)
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
 
-        logmain.debug(f'paint: {index}')
-
         if index.column() != 5:
             return super().paint(painter, option, index)
 
-        painter.save()
+        painter.drawPixmap(option.rect.topLeft(), self.render_button(option))
+
+    def render_button(self, option: QStyleOptionViewItem) -> QPixmap:
+        """
+        Return the pixmap of the button for the cell, draw it only once
+
+        Buttons of all rows look the same, so the style draws a button once
+        per size, state and theme (style, palette, font) into QPixmapCache.
+        Painting a row only blits the pixmap then.
+        """
+
+        state = QStyle.State_Enabled
+        ratio = option.widget.devicePixelRatioF() if option.widget else 1.0
+
+        key = "tslot-button-{}x{}-{}-{}-{}-{}-{}".format(
+            option.rect.width(),
+            option.rect.height(),
+            int(state),
+            QApplication.style().objectName(),
+            option.palette.cacheKey(),
+            option.font.key(),
+            ratio,
+        )
+
+        pixmap = QPixmapCache.find(key)
+
+        if pixmap is not None:
+            return pixmap
+
+        pixmap = QPixmap(option.rect.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setFont(option.font)
+
+        self.draw_button(painter, option, QRect(QPoint(0, 0), option.rect.size()), state)
+
+        painter.end()
+
+        QPixmapCache.insert(key, pixmap)
+
+        return pixmap
+
+    def draw_button(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        rect: QRect,
+        state: QStyle.State,
+    ) -> None:
 
         so_button = QStyleOptionButton()
-        so_button.rect = QRect(option.rect)
+        so_button.rect = rect
         so_button.text = 'trash'
-        so_button.state = QStyle.State_Enabled
+        so_button.state = state
+        so_button.palette = option.palette
+        so_button.fontMetrics = option.fontMetrics
 
         QApplication.style().drawControl(QStyle.CE_PushButton, so_button, painter)
 
-        painter.restore()
-
     @logged(logger=logging.getLogger('tslot-main'), disabled=True)
     def sizeHint(self, item: QStyleOptionViewItem, index: QModelIndex) -> QSize:
         size = super().sizeHint(item, index)
 
-        logmain.debug(style_option_as_str(item.type))
-        logmain.debug(f'row: {item.index.row()}, col: {item.index.column()}')
-        logmain.debug(f'{index.data()}')
-        logmain.debug(item.text)
-
         if index in [2, 3, 4]:
             return size
 
         # TODO: +20 is the spacing between columns 2, 3 and 4
         return QSize(size.width() + 20, size.height())
+
+
+class TTimelineStyleDelegate(THomeTableStyleDelegate):
+    """Draw the rows of days plainly and the rows of entries as in tables."""
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+
+        if not index.parent().isValid():
+            return QStyledItemDelegate.paint(self, painter, option, index)
+
+        return super().paint(painter, option, index)
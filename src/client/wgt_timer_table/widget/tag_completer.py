@@ -0,0 +1,75 @@
+from PyQt5.QtCore import QStringListModel, QTimer, Qt, pyqtSlot
+from PyQt5.QtWidgets import QCompleter, QLineEdit
+
+from src.client.tag_index import TTagIndex
+
+
+class TTagCompleter(QCompleter):
+    """
+    Complete the tag under the cursor of a line edit with space separated tags
+
+    Lookups wait until the user stops typing for `delay` milliseconds and are
+    served by the TTagIndex, in memory. The popup shows the tags as found by
+    the index (prefix matches first), the completer does not filter them.
+
+    Args:
+        line_edit: the editor of the tags, it also owns the completer
+        delay    : milliseconds to wait after the last keystroke
+        limit    : the maximum number of tags to offer
+    """
+
+    def __init__(self, line_edit: QLineEdit, delay: int = 150, limit: int = 10):
+        super().__init__(line_edit)
+
+        self.line_edit = line_edit
+        self.limit = limit
+
+        self.tag_index = TTagIndex()
+
+        self.setModel(QStringListModel(self))
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+
+        # Not QLineEdit.setCompleter: that would complete the whole text
+        self.setWidget(line_edit)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.lookup)
+
+        self.line_edit.textEdited.connect(self.timer.start)
+        self.activated[str].connect(self.insert)
+
+    def word(self) -> tuple:
+        """Return where the tag under the cursor starts and ends"""
+
+        text, cursor = self.line_edit.text(), self.line_edit.cursorPosition()
+
+        fst = text.rfind(" ", 0, cursor) + 1
+        lst = text.find(" ", cursor)
+
+        return fst, len(text) if lst == -1 else lst
+
+    @pyqtSlot()
+    def lookup(self) -> None:
+        fst, lst = self.word()
+
+        names = self.tag_index.search(self.line_edit.text()[fst:lst], self.limit)
+
+        self.model().setStringList(names)
+
+        if names:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    @pyqtSlot(str)
+    def insert(self, name: str) -> None:
+        """Replace the tag under the cursor with the chosen one"""
+
+        fst, lst = self.word()
+        text = self.line_edit.text()
+
+        self.line_edit.setText(text[:fst] + name + text[lst:])
+        self.line_edit.setCursorPosition(fst + len(name))
@@ -0,0 +1,340 @@
+from PyQt5.QtCore import QEvent, QModelIndex, Qt, pyqtSlot
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView
+
+import pendulum
+from src.client.common.widget.tree_view import TTreeView
+from src.client.common.widget.tree_view.font_aware_tree_view import TFontAwareTreeView
+from src.client.wgt_timer_table.model.timeline_model import TTimelineModel
+from src.client.wgt_timer_table.widget.header_view import fix_widths
+from src.client.wgt_timer_table.widget.styled_item_delegate import TTimelineStyleDelegate
+from src.common.dto.model import TEntryModel
+from src.common.failure import TFailure
+from src.common.logger import logmain
+from src.common.response import TResponse
+from src.common.response.fetch.slot_fetch_response import *
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+
+
+class TTimelineView(TTreeView, TFontAwareTreeView):
+    """
+    Show the history of time slots as a single, virtualized view
+
+    There is one model with a row per day and the entries of a day below it,
+    so the number of widgets does not depend on how many days are shown: the
+    view only lays out and paints the rows that are in the viewport. Rows
+    have the same height, so the view never measures the rows off screen.
+
+    Once the user scrolls close to the end (or the days do not fill the view
+    yet), the next day is requested. Just like with TScrollWidget, all the
+    requests belong to the same group and the first request after the date
+    offset or the direction changes supersedes the ones in flight.
+
+    Args:
+        margin: request the next day when fewer rows than this are left below
+                the viewport
+    """
+
+    GROUP = "timeline"
+
+    def __init__(self, margin: int = 16, **kwargs):
+        super().__init__(**kwargs)
+
+        self.margin = margin
+
+        self.dt_offset = pendulum.today()
+        self.direction = "future_to_past"
+        self.dates_dir = "future_to_past"
+        self.times_dir = "future_to_past"
+
+        self.slice_fst = 0
+        self.slice_lst = 0
+
+        # ids of the requests that were sent but not yet responded to
+        self.pending = set()
+
+        # Set once the server has no more days in this direction
+        self.exhausted = False
+
+        # Set while the days come from the snapshot of the last launch
+        self.provisional = False
+
+        self.timeline = TTimelineModel(parent=self)
+        self.timeline.rowsInserted.connect(self.handle_rows_inserted)
+
+        self.setModel(self.timeline)
+
+        self.delegate = TTimelineStyleDelegate()
+        self.setItemDelegate(self.delegate)
+
+        self.setUniformRowHeights(True)
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(False)
+        self.setItemsExpandable(False)
+        self.setAlternatingRowColors(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+        header = self.header()
+        header.setStretchLastSection(False)
+
+        for i, mode in enumerate([
+            QHeaderView.Stretch # name of task
+            , QHeaderView.Stretch # list of tags
+            , QHeaderView.Fixed # start time, see fixed_widths
+            , QHeaderView.Fixed # finish time
+            , QHeaderView.Fixed # elapsed time
+            , QHeaderView.Fixed # nuke button
+        ]):
+            header.setSectionResizeMode(i, mode)
+
+        fix_widths(header)
+
+        self.verticalScrollBar().valueChanged.connect(self.handle_scrolled)
+        self.verticalScrollBar().rangeChanged.connect(self.handle_scrolled)
+
+    def changeEvent(self, event: QEvent) -> None:
+        super().changeEvent(event)
+
+        if event.type() == QEvent.FontChange:
+            fix_widths(self.header())
+
+    def _handle_font_loaded(self):
+        self.setFont(
+            self._font_service.font(
+                'Quicksand', 'Regular', self._font_service.font_serif_size
+            )
+        )
+
+    def kickstart(self):
+        self.request(0, 1)
+
+    def request_next(self):
+        self.request(self.slice_lst, self.slice_lst + 1)
+
+    def request(self, slice_fst: int, slice_lst: int, supersede: bool = False):
+        request = TRaySlotWithTagFetchRequest(
+              dt_offset = self.dt_offset
+            , direction = self.direction
+            , dates_dir = self.dates_dir
+            , times_dir = self.times_dir
+            , slice_fst = slice_fst
+            , slice_lst = slice_lst
+        )
+
+        request.group = self.GROUP
+        request.supersede = supersede
+
+        self.pending.add(request.id)
+
+        self.requested.emit(request)
+
+    def restart(self, dt_offset: pendulum.DateTime, direction: str) -> None:
+        """
+        Start over from a different date offset or in another direction
+
+        Unlike TScrollWidget, this is not `reset`: the view already has a
+        `reset` slot that Qt calls once the model is reset.
+        """
+
+        self.pending.clear()
+        self.exhausted = False
+        self.provisional = False
+
+        self.timeline.clear()
+
+        self.dt_offset = dt_offset
+        self.direction = direction
+
+        self.slice_fst = 0
+        self.slice_lst = 0
+
+        self.request(0, 1, supersede=True)
+
+    def reverse(self) -> None:
+        """Show the same days, but in the other direction"""
+
+        if self.direction == "future_to_past":
+            self.restart(self.dt_offset, "past_to_future")
+        else:
+            self.restart(self.dt_offset, "future_to_past")
+
+    def is_empty(self) -> bool:
+        return not self.timeline.days
+
+    def show_snapshot(self, response: TSlotFetchResponse) -> None:
+        """
+        Show the days of the last launch until the server sends the real ones
+
+        The days do not count as loaded: no slices move and no more days are
+        requested for them. The first response replaces them all.
+        """
+
+        if self.direction != response.direction or response.is_empty():
+            return
+
+        self.in_own_dirs(response)
+
+        for fst_slot, lst_slot in response.break_by_date():
+            self.timeline.append_day(response.items[fst_slot:lst_slot])
+
+        self.provisional = True
+
+    def in_own_dirs(self, response: TSlotFetchResponse) -> None:
+        """Put the dates and the times of the response in this view's order"""
+
+        if self.times_dir != response.times_dir:
+            response.in_times_dir(self.times_dir)
+
+        if self.dates_dir != response.dates_dir:
+            response.in_dates_dir(self.dates_dir)
+
+    def is_near_end(self) -> bool:
+        """Check if only a few rows are left below the viewport"""
+
+        scroll_bar = self.verticalScrollBar()
+
+        if scroll_bar.maximum() == 0:
+            return True  # the days do not even fill the viewport
+
+        row_height = max(self.sizeHintForRow(0), 1)
+
+        return scroll_bar.maximum() - scroll_bar.value() < self.margin * row_height
+
+    @pyqtSlot()
+    def handle_scrolled(self) -> None:
+        if self.pending or self.exhausted or not self.timeline.days:
+            return
+
+        if self.is_near_end():
+            self.request_next()
+
+    @pyqtSlot(QModelIndex, int, int)
+    def handle_rows_inserted(self, parent: QModelIndex, fst: int, lst: int):
+        if parent.isValid():
+            return
+
+        for row in range(fst, lst + 1):
+            self.setExpanded(self.timeline.index(row, 0), True)
+
+    def is_stale(self, response: TResponse) -> bool:
+        """Check if the response answers a request that is no longer wanted"""
+
+        if response.request_id is None:
+            return False
+
+        if response.request_id not in self.pending:
+            return True
+
+        self.pending.discard(response.request_id)
+
+        return False
+
+    @pyqtSlot(TResponse)
+    def handle_responded(self, response: TResponse):
+
+        if isinstance(response, TTimerStashResponse):
+            return self.apply(response.timer)
+
+        if not isinstance(response, TRaySlotFetchResponse) and not isinstance(
+            response, TRaySlotWithTagFetchResponse
+        ):
+            return
+
+        if self.is_stale(response):
+            return
+
+        if self.direction != response.direction:
+            return  # cannot use data in the other direction, discard it
+
+        if response.slice_fst < self.slice_lst:
+            return  # the days of the slice are loaded already
+
+        if self.provisional:
+            # The days of the snapshot could be outdated, start from scratch
+            self.provisional = False
+            self.timeline.clear()
+
+        if response.is_empty():
+            self.exhausted = True
+
+            return
+
+        self.in_own_dirs(response)
+
+        for fst_slot, lst_slot in response.break_by_date():
+            self.timeline.append_day(response.items[fst_slot:lst_slot])
+
+        if response.slice_fst < self.slice_fst:
+            self.slice_fst = response.slice_fst
+        if response.slice_lst > self.slice_lst:
+            self.slice_lst = response.slice_lst
+
+        # The new day might still leave the viewport unfilled
+        self.handle_scrolled()
+
+    def in_ray(self, item: TEntryModel) -> bool:
+        """Check if the entry belongs to the days this view could show"""
+
+        if self.direction == "future_to_past":
+            return item.slot.fst <= self.dt_offset
+
+        return item.slot.fst >= self.dt_offset
+
+    def find_new_day(self, date: pendulum.Date) -> int:
+        """Return the row for a new day, None if the day is not loaded yet"""
+
+        for row, items in enumerate(self.timeline.days):
+            other = items[0].slot.fst.date()
+
+            if self.dates_dir == "future_to_past" and date > other:
+                return row
+            if self.dates_dir == "past_to_future" and date < other:
+                return row
+
+        # After all the loaded days: the day comes with one of the next pages
+        return len(self.timeline.days) if self.exhausted else None
+
+    def apply(self, item: TEntryModel) -> None:
+        """Show a new or changed entry in place, without refetching the day"""
+
+        if item is None or item.slot.lst is None or not self.in_ray(item):
+            return  # the history shows only finished slots within the ray
+
+        date = item.slot.fst.date()
+
+        if self.timeline.find_day(date) is None:
+            self.timeline.discard(item.slot.id)
+
+            row = self.find_new_day(date)
+
+            if row is None:
+                return
+
+            self.timeline.insert_day(row, [item])
+
+            # The server counts the new day too, the next pages move by one
+            self.slice_lst += 1
+
+            return
+
+        self.timeline.apply(item, self.timeline.find_day(date), self.times_dir)
+
+    @pyqtSlot(TFailure)
+    def handle_triggered(self, failure: TFailure):
+        self.pending.discard(failure.request_id)
+
+        logmain.warning(f"Failed to fetch slots: {failure.message}")
+
+    @pyqtSlot()
+    def handle_show_next_shortcut(self):
+        if self.pending or self.exhausted:
+            return  # the next day is on its way or there is none
+
+        self.request_next()
+
+    @pyqtSlot()
+    def handle_reverse_shortcut(self):
+        self.reverse()
+
+    @pyqtSlot()
+    def handle_today_shortcut(self):
+        self.restart(pendulum.today(), self.direction)
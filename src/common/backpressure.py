@@ -0,0 +1,4 @@
+# What the server does once it has too many pending requests, see TDispatcher.
+# It lives apart from the dispatcher, so that the command line could offer the
+# choices without importing the server (and the database layer with it).
+DISPATCHER_POLICIES = ["block", "drop_oldest_prefetch", "reject"]
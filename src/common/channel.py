@@ -0,0 +1,94 @@
+import time
+from multiprocessing import Queue
+from queue import Full
+
+from src.common import TMessage
+from src.common.failure import TFailure
+from src.common.metrics import metrics
+
+
+CHANNEL_POLICIES = ["block", "reject"]
+
+
+class TChannel:
+    """
+    Carry messages from one process to another through a bounded queue
+
+    When the queue is full, the sender either waits for some free space
+    (`block`, optionally for at most `timeout` seconds) or gives up right away
+    (`reject`). Giving up raises a TFailure that the sender could forward to
+    whoever made the request.
+
+    The depth of the queue and the time messages spend waiting in it are
+    published to `src.common.metrics.metrics` of the process that sends and
+    of the process that receives.
+
+    :param name: the name of the channel, used as the prefix of its metrics
+    :param maxsize: the maximum number of messages in the queue
+    :param policy: what to do when the queue is full, see CHANNEL_POLICIES
+    :param timeout: the longest time (in seconds) to block, None is forever
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 64,
+        policy: str = "block",
+        timeout: float = None,
+    ) -> None:
+
+        if policy not in CHANNEL_POLICIES:
+            raise RuntimeError(f"Expected policy from {CHANNEL_POLICIES}, was {policy}")
+
+        if maxsize <= 0:
+            raise RuntimeError(f"Expected maxsize > 0, was {maxsize}")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+
+        self.queue = Queue(maxsize)
+
+    def put(self, message: TMessage) -> None:
+        """Send the message, raise TFailure if the channel is full"""
+
+        started_at = time.monotonic()
+
+        try:
+            if self.policy == "block":
+                self.queue.put((time.time(), message), True, self.timeout)
+            else:
+                self.queue.put_nowait((time.time(), message))
+        except Full:
+            metrics.increment(f"{self.name}.rejected")
+
+            failure = TFailure(f"Channel {self.name} is full, try again later")
+            failure.request_id = getattr(message, "id", None)
+
+            raise failure
+        finally:
+            metrics.timing(f"{self.name}.put", time.monotonic() - started_at)
+
+        metrics.increment(f"{self.name}.sent")
+        metrics.gauge(f"{self.name}.depth", self.qsize())
+
+    def get(self, timeout: float = None) -> TMessage:
+        """Receive the next message, raise queue.Empty if there is none in time"""
+
+        sent_at, message = self.queue.get(True, timeout)
+
+        metrics.increment(f"{self.name}.received")
+        metrics.gauge(f"{self.name}.depth", self.qsize())
+        metrics.timing(f"{self.name}.wait", max(0.0, time.time() - sent_at))
+
+        return message
+
+    def qsize(self) -> int:
+        """Return the approximate number of messages, or -1 if unknown"""
+
+        try:
+            return self.queue.qsize()
+        except NotImplementedError:
+            # multiprocessing.Queue.qsize is not available on macOS
+            return -1
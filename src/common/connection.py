@@ -0,0 +1,164 @@
+import pickle
+import select
+import socket
+import struct
+import time
+from queue import Empty
+from threading import Lock
+
+from src.common import TMessage
+from src.common.failure import TFailure
+from src.common.metrics import metrics
+
+
+# Every frame starts with the length of its payload as a 4-byte unsigned int
+# in network byte order, the payload is the pickled message
+FRAME_HEADER = struct.Struct("!I")
+FRAME_LIMIT = 64 * 1024 * 1024
+
+
+def send_frame(sock: socket.socket, message: TMessage) -> None:
+    """Write one framed message to the socket"""
+
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if len(payload) > FRAME_LIMIT:
+        raise TFailure(f"Message is too large to send: {len(payload)} bytes")
+
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly `size` bytes, raise EOFError if the peer hangs up"""
+
+    chunks, remaining = [], size
+
+    while remaining > 0:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+
+        if not chunk:
+            raise EOFError("Connection was closed by the peer")
+
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> TMessage:
+    """Read one framed message from the socket"""
+
+    (size,) = FRAME_HEADER.unpack(recv_exactly(sock, FRAME_HEADER.size))
+
+    if size > FRAME_LIMIT:
+        raise EOFError(f"Frame is too large to receive: {size} bytes")
+
+    return pickle.loads(recv_exactly(sock, size))
+
+
+class TConnection:
+    """
+    Carry messages both ways over a connected Unix domain socket
+
+    The connection has the same `put`/`get` interface as a TChannel, so it
+    could be used in place of both the incoming and the outgoing channel.
+    Several threads may `put` at the same time, but only one should `get`.
+
+    :param sock: the connected socket
+    :param name: the name of the connection, used as the prefix of its metrics
+    """
+
+    def __init__(self, sock: socket.socket, name: str = "connection") -> None:
+        self.sock = sock
+        self.name = name
+
+        self.lock = Lock()
+        self.closed = False
+
+    def put(self, message: TMessage) -> None:
+        """Send the message, raise TFailure if the connection is gone"""
+
+        started_at = time.monotonic()
+
+        try:
+            with self.lock:
+                send_frame(self.sock, message)
+        except OSError as exception:
+            metrics.increment(f"{self.name}.rejected")
+
+            failure = TFailure(f"Connection {self.name} is gone: {exception}")
+            failure.request_id = getattr(message, "id", None)
+
+            raise failure
+        finally:
+            metrics.timing(f"{self.name}.put", time.monotonic() - started_at)
+
+        metrics.increment(f"{self.name}.sent")
+
+    def get(self, timeout: float = None) -> TMessage:
+        """
+        Receive the next message
+
+        Raise queue.Empty if there is none in time and EOFError once the peer
+        has closed the connection.
+        """
+
+        if self.closed:
+            raise EOFError("Connection is closed")
+
+        try:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+        except (OSError, ValueError) as exception:
+            raise EOFError(f"Connection is closed: {exception}")
+
+        if not readable:
+            raise Empty
+
+        try:
+            message = recv_frame(self.sock)
+        except (OSError, pickle.UnpicklingError) as exception:
+            raise EOFError(f"Connection is broken: {exception}")
+
+        metrics.increment(f"{self.name}.received")
+
+        return message
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # the peer is already gone
+
+        self.sock.close()
+
+
+def connect(address: str, timeout: float = 0) -> TConnection:
+    """
+    Connect to the server that listens on the Unix domain socket
+
+    :param address: the path to the socket
+    :param timeout: keep retrying for this long (in seconds) while the server
+                    is starting up
+    """
+
+    deadline = time.monotonic() + timeout
+
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            sock.connect(str(address))
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+
+            if time.monotonic() >= deadline:
+                raise
+
+            time.sleep(0.05)
+        else:
+            return TConnection(sock, name="client")
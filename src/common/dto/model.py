@@ -1,11 +1,15 @@
+import datetime
 import pendulum
 
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from pendulum import DateTime
+from pendulum import Date, DateTime
 from pendulum.tz.timezone import Timezone
 
-from src.db.model import SlotModel, TaskModel, TagModel
+if TYPE_CHECKING:
+    # Only for annotations: SQLAlchemy takes long to import and the client,
+    # which only ever gets these models from the server, has no use for it
+    from src.db.model import SlotModel, TaskModel, TagModel
 
 
 # Q: Why do these models (almost) replicate the ones from src/db/models.py?
@@ -41,7 +45,7 @@ class TTagModel:
         return cls(name, id)
 
     @classmethod
-    def from_model(cls, model: SlotModel):
+    def from_model(cls, model: 'SlotModel'):
         return cls(model.name, model.id)
 
     def __eq__(self, other):
@@ -89,7 +93,7 @@ class TTaskModel:
         return cls(name, id)
 
     @classmethod
-    def from_model(cls, model: TaskModel):
+    def from_model(cls, model: 'TaskModel'):
         return cls(model.name, model.id)
 
     def __eq__(self, other):
@@ -162,7 +166,7 @@ class TSlotModel:
         return cls(fst, lst, id)
 
     @classmethod
-    def from_model(cls, model: SlotModel):
+    def from_model(cls, model: 'SlotModel'):
         fst, lst = pendulum.instance(model.fst).in_timezone("UTC"), None
 
         if model.lst is not None:
@@ -190,12 +194,37 @@ class TEntryModel:
     def __init__(
             self,
             slot: TSlotModel,
-            task: TTaskModel = TTaskModel(),
+            task: TTaskModel = None,
             tags: List[TTagModel] = None,
     ) -> None:
         self.slot = slot
-        self.task = task
+        # A default instance would be shared by all the entries without a task
+        self.task = TTaskModel() if task is None else task
         self.tags = [] if tags is None else tags
 
     def __repr__(self) -> str:
         return f"{self.task.name}: {self.slot.fst} -- {self.slot.lst}"
+
+
+class TTotalModel:
+    """
+    Holds the time spent within one group of a report, e.g. on a task per day
+
+    Only the attributes the report is grouped by are set, the others are None.
+    The date is the first day of the period (a day, week, month or year).
+    """
+
+    def __init__(
+            self,
+            elapsed: datetime.timedelta,
+            date: Date = None,
+            task: TTaskModel = None,
+            tag: TTagModel = None,
+    ) -> None:
+        self.elapsed = elapsed
+        self.date = date
+        self.task = task
+        self.tag = tag
+
+    def __repr__(self) -> str:
+        return f"{self.date} {self.task} {self.tag}: {self.elapsed}"
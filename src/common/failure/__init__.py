@@ -4,6 +4,8 @@ from src.common import TMessage
 class TFailure(TMessage, Exception):
     """Base class for all failure messages"""
 
+    request_id = None
+
     def __init__(self, message):
         super().__init__(message)
 
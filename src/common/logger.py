@@ -1,14 +1,36 @@
+import atexit
 import logging.config
+import os
+import queue
+import sys
+import threading
 
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+
+from src.common.metrics import metrics
+
+
+# Names of the loggers whose disabled functions are traced anyway, e.g.
+# TSLOT_TRACE=tslot-main,tslot-data
+TRACED = set(filter(None, os.environ.get('TSLOT_TRACE', '').split(',')))
+
+# Name of a logger -> (function, wrapper) of all its disabled functions, so
+# that their tracing could be switched on and off at runtime, see `trace`
+TRACEABLE = {}
+TRACEABLE_LOCK = threading.Lock()
 
 
 def logged(logger=logging.getLogger('tslot-main'), disabled=True):
     """
     Create a configured decorator that controls logging output of a function
 
+    A disabled function is returned as is: it costs nothing to call, which
+    matters for paint, data and the like. Its tracing could still be switched
+    on per logger, with TSLOT_TRACE at startup or with `trace` at runtime.
+
     :param logger: the logger to send output to
-    :param disabled: True if the logger should be disabled, False otherwise
+    :param disabled: True if the function should not be traced by default
     """
 
     def logged_decorator(foo):
@@ -23,26 +45,207 @@ def logged(logger=logging.getLogger('tslot-main'), disabled=True):
 
         @wraps(foo)
         def wrapper(*args, **kwargs):
-            was_disabled = logger.disabled
-
-            logger.disabled = disabled
-
             logger.debug(f'enter {foo.__qualname__}')
 
             result = foo(*args, **kwargs)
 
             logger.debug(f'leave {foo.__qualname__} ({result})')
 
-            logger.disabled = was_disabled
-
             return result
 
-        return wrapper
+        if not disabled:
+            return wrapper
+
+        with TRACEABLE_LOCK:
+            TRACEABLE.setdefault(logger.name, []).append((foo, wrapper))
+
+        return wrapper if logger.name in TRACED else foo
 
     return logged_decorator
 
 
-logging.config.dictConfig({
+def trace(logger: logging.Logger, enabled: bool = True) -> None:
+    """
+    Switch tracing of the disabled functions of the logger on or off
+
+    Functions are swapped for their wrappers (and back) where they are
+    defined, i.e. on their classes or modules. References that were taken
+    before, e.g. connected slots, keep calling what they were connected to.
+
+    :param logger: the logger whose functions to trace
+    :param enabled: True to trace the functions, False to stop tracing
+    """
+
+    with TRACEABLE_LOCK:
+        if enabled:
+            TRACED.add(logger.name)
+        else:
+            TRACED.discard(logger.name)
+
+        for foo, wrapper in TRACEABLE.get(logger.name, []):
+            owner, name = find_owner(foo)
+
+            # Leave alone what was wrapped again by some other decorator
+            if owner is not None and vars(owner).get(name) in (foo, wrapper):
+                setattr(owner, name, wrapper if enabled else foo)
+
+
+class TQueueHandler(QueueHandler):
+    """
+    Put records into a bounded queue, never wait for space there
+
+    Records that do not fit are dropped and counted, both in `dropped` and in
+    the "logging.dropped" counter of `src.common.metrics.metrics`.
+    """
+
+    def __init__(self, queue: queue.Queue) -> None:
+        super().__init__(queue)
+
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped += 1
+
+            metrics.increment('logging.dropped')
+
+
+class TQueueListener(QueueListener):
+    """
+    Take records off the queue and pass them to the handlers of their logger
+
+    All loggers share one queue, but each keeps its own handlers: a record of
+    tslot-data must not end up in the file of tslot-main.
+    """
+
+    def __init__(
+        self, queue: queue.Queue, handler: TQueueHandler, routes: dict
+    ) -> None:
+        super().__init__(queue, respect_handler_level=True)
+
+        # The handler that feeds the queue and, per name of a logger, the
+        # handlers that the logger had before
+        self.handler = handler
+        self.routes = routes
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for space: the queue could be full, but the thread empties it
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+
+        for handler in self.routes.get(record.name, []):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# The listener of the current process, if logging is asynchronous
+listener = None
+
+
+def start_async_logging(capacity: int = 10000, names: list = None) -> None:
+    """
+    Make the loggers only enqueue records, their handlers run on a thread
+
+    Then a slow disk or terminal never stalls the GUI thread or a reader
+    thread. Records are written in order; records that do not fit into the
+    queue are dropped, see TQueueHandler.
+
+    :param capacity: the maximum number of records waiting to be written
+    :param names: the names of the loggers, tslot-main and tslot-data by default
+    """
+
+    global listener
+
+    if listener is not None:
+        return
+
+    names = names or ['tslot-main', 'tslot-data']
+
+    records = queue.Queue(capacity)
+    handler = TQueueHandler(records)
+
+    routes = {}
+
+    for name in names:
+        logger = logging.getLogger(name)
+
+        routes[name], logger.handlers = logger.handlers, [handler]
+
+    listener = TQueueListener(records, handler, routes)
+    listener.start()
+
+
+def stop_async_logging() -> None:
+    """Write the records that are still queued and stop the listener"""
+
+    global listener
+
+    if listener is None:
+        return
+
+    listener.stop()
+
+    for name, handlers in listener.routes.items():
+        logging.getLogger(name).handlers = handlers
+
+    if listener.handler.dropped:
+        logging.getLogger(next(iter(listener.routes))).warning(
+            f'Dropped {listener.handler.dropped} log records, the queue was full'
+        )
+
+    listener = None
+
+
+def restart_async_logging() -> None:
+    """
+    Give a forked process its own queue and a thread that empties it
+
+    The child inherits the queue, but not the thread; the queue could even be
+    locked by that thread at the moment of the fork. The records queued by
+    the parent are left to the parent.
+    """
+
+    global listener
+
+    if listener is None:
+        return
+
+    handler = listener.handler
+
+    handler.queue = queue.Queue(handler.queue.maxsize)
+    handler.dropped_lock = threading.Lock()
+
+    listener = TQueueListener(handler.queue, handler, listener.routes)
+    listener.start()
+
+
+atexit.register(stop_async_logging)
+os.register_at_fork(after_in_child=restart_async_logging)
+
+
+def find_owner(foo) -> tuple:
+    """Find the class or module that defines the function and its name there"""
+
+    *path, name = foo.__qualname__.split('.')
+
+    owner = sys.modules.get(foo.__module__)
+
+    for part in path:
+        owner = getattr(owner, part, None)
+
+    if owner is None or '<locals>' in path:
+        return None, name  # defined within another function, cannot swap
+
+    return owner, name
+
+
+LOGGING = {
     'version': 1,
     'formatters': {
         'verbose': {
@@ -70,6 +273,8 @@ logging.config.dictConfig({
             , 'filename': 'tslot.log'
             , 'maxBytes': 10485760  # 10 MiB
             , 'backupCount': 3
+            # Open the file with the first record, not once configured
+            , 'delay': True
         }
     },
     'loggers': {
@@ -82,13 +287,26 @@ logging.config.dictConfig({
             , 'level': 'DEBUG'
         }
     }
-})
+}
+
+
+def configure_logging() -> None:
+    """
+    Configure the loggers, see LOGGING
+
+    Nothing is configured at import: importing a module must not open files
+    (tslot.log used to appear wherever tests or tools were run). The
+    application calls this once it starts, before any other thread does.
+    """
+
+    logging.config.dictConfig(LOGGING)
+
+    logmain.debug('tslot-main logger is online')
+    logdata.debug('tslot-data logger is online')
+
 
 # The reason there are two loggers is because there is the gui (main) thread
 # and a database (data) thread. If both threads use the same logger, it all
 # becomes messy quite quickly (messages go missing or pop up when disabled)
 logmain = logging.getLogger('tslot-main')
-logmain.debug('tslot-main logger is online')
-
 logdata = logging.getLogger('tslot-data')
-logdata.debug('tslot-data logger is online')
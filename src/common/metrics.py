@@ -0,0 +1,62 @@
+import time
+from threading import Lock
+
+
+# When the process started, close enough: tslot.py imports this module before
+# the client or the server. Startup timings are measured from here
+STARTED_AT = time.monotonic()
+
+
+class TMetrics:
+    """
+    Collect counters, gauges and timings of the current process
+
+    Counters only grow (e.g. the number of rejected requests), gauges hold the
+    latest value (e.g. the depth of a queue) and timings summarize durations in
+    seconds (e.g. how long requests waited in a queue).
+
+    There is one instance per process, see `metrics` below.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        with self.lock:
+            self.gauges[name] = value
+
+    def timing(self, name: str, seconds: float) -> None:
+        with self.lock:
+            count, total, top = self.timings.get(name, (0, 0.0, 0.0))
+
+            self.timings[name] = (count + 1, total + seconds, max(top, seconds))
+
+    def snapshot(self) -> dict:
+        """Copy all the current values into a plain (picklable) dictionary"""
+
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timings": {
+                    name: {"count": count, "total": total, "max": top}
+                    for name, (count, total, top) in self.timings.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.timings.clear()
+
+
+metrics = TMetrics()
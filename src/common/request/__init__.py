@@ -1,7 +1,29 @@
+from uuid import uuid4
+
 from src.common import TMessage
 
 
 class TRequest(TMessage):
-    """Base class for all requests"""
+    """
+    Base class for all requests
+
+    Every request carries a unique id so that it can later be cancelled and so
+    that the response can be matched against it. Requests may also belong to a
+    group: a request with `supersede` set cancels all the other requests of its
+    group that are still queued or running.
+
+    A prefetch request asks for data that nobody is waiting for yet, so it
+    may be dropped when the backend has too much work.
+
+    :param group: the name of the group this request belongs to (if any)
+    :param supersede: cancel older requests of the same group when received
+    :param prefetch: the request is speculative and could be dropped
+    """
 
-    pass
+    def __init__(
+        self, group: str = None, supersede: bool = False, prefetch: bool = False
+    ) -> None:
+        self.id = uuid4().hex
+        self.group = group
+        self.supersede = supersede
+        self.prefetch = prefetch
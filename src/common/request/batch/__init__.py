@@ -0,0 +1,22 @@
+from typing import List
+
+from src.common.request import TRequest
+from src.common.request.fetch import TFetchRequest
+
+
+class TBatchRequest(TRequest):
+    """
+    Ask the backend to fulfill several fetch requests at once
+
+    The requests are read within one transaction on one connection, so all of
+    them see the same state of the database and the session is set up once.
+    The answer is a single TBatchResponse with one response (or failure) per
+    request, in the same order.
+
+    :param requests: the fetch requests to fulfill
+    """
+
+    def __init__(self, requests: List[TFetchRequest]) -> None:
+        super().__init__()
+
+        self.requests = requests
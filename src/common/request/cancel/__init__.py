@@ -0,0 +1,21 @@
+from typing import List
+
+from src.common.request import TRequest
+
+
+class TCancelRequest(TRequest):
+    """
+    Ask the backend to drop some previous requests
+
+    Requests that are still queued are dropped before they start. Requests that
+    are already running are interrupted. No responses are sent back for any of
+    the cancelled requests.
+
+    :param ids: the ids of the requests to cancel
+    :param group: cancel all the requests of this group as well
+    """
+
+    def __init__(self, ids: List[str] = None, group: str = None) -> None:
+        super().__init__(group=group)
+
+        self.ids = [] if ids is None else ids
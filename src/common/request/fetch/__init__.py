@@ -16,4 +16,4 @@ class TFetchRequest(TRequest):
     """
 
     def __init__(self):
-        pass
+        super().__init__()
@@ -0,0 +1,7 @@
+from src.common.request.fetch import TFetchRequest
+
+
+class TMetricsFetchRequest(TFetchRequest):
+    """Request the current metrics (queue depths, wait times) of the backend"""
+
+    pass
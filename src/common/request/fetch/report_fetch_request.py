@@ -0,0 +1,64 @@
+from typing import Sequence
+
+import pendulum
+
+from pendulum import DateTime
+from pendulum.tz.timezone import Timezone
+
+from src.common.request.fetch import TFetchRequest
+
+
+REPORT_PERIODS = ["day", "week", "month", "year"]
+REPORT_GROUPS = REPORT_PERIODS + ["task", "tag"]
+
+
+class TReportFetchRequest(TFetchRequest):
+    """
+    Ask for the total time spent within a range, grouped by period, task or tag
+
+    Slots count from where they start: a slot belongs to the range if it
+    starts within [fst, lst), and to the day (in the time zone) it starts on.
+    A week, month or year holds the days from its first day on, weeks start
+    on Monday.
+    Slots of a task with several tags count for each of the tags. The running
+    timer does not count.
+
+    Example (time spent on each task each day):
+    TReportFetchRequest(fst, lst, group_by=["day", "task"])
+
+    :param fst     : the start of the range
+    :param lst     : the end of the range, excluded
+    :param group_by: what to total by, from REPORT_GROUPS, in that order, at
+                     most one of REPORT_PERIODS
+    :param tz      : where the days begin and end, the local time zone by
+                     default
+    """
+
+    def __init__(
+        self,
+        fst: DateTime,
+        lst: DateTime,
+        group_by: Sequence[str] = ("day",),
+        tz: Timezone = None,
+    ) -> None:
+        super().__init__()
+
+        if fst >= lst:
+            raise RuntimeError("Expected fst < lst, but was >=")
+
+        for group in group_by:
+            if group not in REPORT_GROUPS:
+                raise RuntimeError(f"Expected group from {REPORT_GROUPS}, was {group}")
+
+        if len(set(group_by)) != len(group_by):
+            raise RuntimeError(f"Expected every group once, was {group_by}")
+
+        if len(set(group_by) & set(REPORT_PERIODS)) > 1:
+            raise RuntimeError(f"Expected one period at most, was {group_by}")
+
+        self.fst = fst
+        self.lst = lst
+        self.group_by = list(group_by)
+
+        # The time zone of whoever makes the request, not of the server
+        self.tz = pendulum.local_timezone() if tz is None else tz
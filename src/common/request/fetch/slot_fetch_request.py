@@ -69,7 +69,7 @@ class TRaySlotFetchRequest(TSlotFetchRequest):
     then the ray begins at some point in the past and ends at the
     datetime offset.
 
-    :param dt_offset: the datetime offset
+    :param dt_offset: the datetime offset, the start of today by default
     :param direction: the direction of the ray
     :param dates_dir: sort dates from past to future or vice versa
     :param times_dir: sort times from past to future or vice versa
@@ -79,7 +79,7 @@ class TRaySlotFetchRequest(TSlotFetchRequest):
 
     def __init__(
         self,
-        dt_offset: Date = pendulum.today(),
+        dt_offset: Date = None,
         direction: str = "future_to_past",
         dates_dir: str = "future_to_past",
         times_dir: str = "past_to_future",
@@ -93,7 +93,8 @@ class TRaySlotFetchRequest(TSlotFetchRequest):
                 f"Expected direction from {LOAD_DIRECTIONS}, was {direction}"
             )
 
-        self.dt_offset = dt_offset
+        # Today is when the request is made, not when this module was imported
+        self.dt_offset = pendulum.today() if dt_offset is None else dt_offset
         self.direction = direction
 
 
@@ -121,7 +122,7 @@ class TRaySlotWithTagFetchRequest(TSlotFetchRequest):
 
     def __init__(
         self,
-        dt_offset: Date = pendulum.today(),
+        dt_offset: Date = None,
         direction: str = "future_to_past",
         dates_dir: str = "future_to_past",
         times_dir: str = "past_to_future",
@@ -136,6 +137,6 @@ class TRaySlotWithTagFetchRequest(TSlotFetchRequest):
                 f"Expected direction from {LOAD_DIRECTIONS}, was {direction}"
             )
 
-        self.dt_offset = dt_offset
+        self.dt_offset = pendulum.today() if dt_offset is None else dt_offset
         self.direction = direction
         self.flat_tags = flat_tags
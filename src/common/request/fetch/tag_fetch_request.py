@@ -2,6 +2,8 @@ from src.common.request.fetch import TFetchRequest
 
 
 class TTagFetchRequest(TFetchRequest):
+    """Request all the tags, e.g. for the tag index of the client"""
+
     pass
 
 
@@ -0,0 +1,31 @@
+from typing import Tuple
+
+from src.common.request.fetch import TFetchRequest
+
+
+class TTaskFetchRequest(TFetchRequest):
+    pass
+
+
+class TTaskSearchFetchRequest(TTaskFetchRequest):
+    """
+    Ask for the recorded time slots of the tasks whose names match the text
+
+    Slots of the best matching tasks come first, the latest slots of a task
+    first. Results come in pages: to get the next page, ask again with the
+    `after` of the previous response.
+
+    :param text : the words to find in task names, each could be a prefix
+    :param limit: the maximum number of slots in a page
+    :param after: where the previous page ended, None for the first page
+    """
+
+    def __init__(self, text: str, limit: int = 64, after: Tuple = None) -> None:
+        super().__init__()
+
+        if limit <= 0:
+            raise RuntimeError(f"Expected limit > 0, was {limit}")
+
+        self.text = text
+        self.limit = limit
+        self.after = after
@@ -6,4 +6,6 @@ from src.common.request.stash import TStashRequest
 
 class TEntryStashRequest(TStashRequest):
     def __init__(self, items: List[TEntryModel]):
+        super().__init__()
+
         self.items = items
@@ -4,4 +4,6 @@ from src.common.request.stash import TStashRequest
 
 class TTimerStashRequest(TStashRequest):
     def __init__(self, data: TEntryModel):
+        super().__init__()
+
         self.tdata = data
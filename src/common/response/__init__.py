@@ -2,6 +2,11 @@ from src.common import TMessage
 
 
 class TResponse(TMessage):
-    """Base class for all responses"""
+    """
+    Base class for all responses
 
-    pass
+    The id of the request that caused this response is stored in `request_id`
+    by whoever dispatched the request (it stays None for unsolicited responses).
+    """
+
+    request_id = None
@@ -0,0 +1,17 @@
+from typing import List
+
+from src.common.response import TResponse
+
+
+class TBatchResponse(TResponse):
+    """
+    Respond to a TBatchRequest
+
+    Every item is either a response or a failure and carries the id of its
+    own request from the batch.
+
+    :param responses: one response (or failure) per request of the batch
+    """
+
+    def __init__(self, responses: List[TResponse]) -> None:
+        self.responses = responses
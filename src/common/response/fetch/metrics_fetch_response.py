@@ -0,0 +1,17 @@
+from src.common.response.fetch import TFetchResponse
+
+
+class TMetricsFetchResponse(TFetchResponse):
+    """
+    Respond with a snapshot of the backend metrics
+
+    Metrics are collected per process, so the client broker adds a snapshot of
+    its own process (e.g. how many requests it had to reject) on arrival.
+
+    :param metrics: see TMetrics.snapshot for the layout of the dictionary
+    :param client_metrics: the same for the client, filled in by the client
+    """
+
+    def __init__(self, metrics: dict, client_metrics: dict = None) -> None:
+        self.metrics = metrics
+        self.client_metrics = client_metrics
@@ -0,0 +1,21 @@
+from typing import List
+
+from src.common.dto.model import TTotalModel
+from src.common.response.fetch import TFetchResponse
+
+
+class TReportFetchResponse(TFetchResponse):
+    """
+    Return the totals of a report, see TReportFetchRequest
+
+    Args:
+        totals  : one total per group, ordered by the groups
+        group_by: what the totals are grouped by, from the request
+    """
+
+    def __init__(self, totals: List[TTotalModel], group_by: List[str]) -> None:
+        self.totals = totals
+        self.group_by = group_by
+
+    def is_empty(self) -> bool:
+        return not self.totals
@@ -49,13 +49,16 @@ class TSlotFetchResponse(TFetchResponse):
     def is_empty(self) -> bool:
         return True if not self.items else False
 
-    def in_timezone(self, tz: Timezone = pendulum.local_timezone()):
+    def in_timezone(self, tz: Timezone = None):
         """
         Convert all the time slots into the supplied timezone
 
-        :param tz: the supplied timezone
+        :param tz: the supplied timezone, the local one by default
         """
 
+        if tz is None:
+            tz = pendulum.local_timezone()
+
         for i, item in enumerate(self.items):
             slot = item.slot
 
@@ -153,13 +156,16 @@ class TRaySlotFetchResponse(TSlotFetchResponse):
         self.dt_offset = dt_offset
         self.direction = direction
 
-    def in_timezone(self, tz: Timezone = pendulum.local_timezone()):
+    def in_timezone(self, tz: Timezone = None):
         """
         Convert all the time slots into the supplied timezone
 
-        :param tz: the supplied timezone
+        :param tz: the supplied timezone, the local one by default
         """
 
+        if tz is None:
+            tz = pendulum.local_timezone()
+
         self.dt_offset = self.dt_offset.in_timezone(tz)
 
         super().in_timezone(tz)
@@ -216,13 +222,16 @@ class TRaySlotWithTagFetchResponse(TSlotFetchResponse):
         if not self.flat_tags:
             self.condense_tags()
 
-    def in_timezone(self, tz: Timezone = pendulum.local_timezone()):
+    def in_timezone(self, tz: Timezone = None):
         """
         Convert all the time slots into the supplied timezone
 
-        :param tz: the supplied timezone
+        :param tz: the supplied timezone, the local one by default
         """
 
+        if tz is None:
+            tz = pendulum.local_timezone()
+
         self.dt_offset = self.dt_offset.in_timezone(tz)
 
         super().in_timezone(tz)
@@ -1,14 +1,14 @@
 from typing import List
 
+from src.common.dto.model import TTagModel
 from src.common.response.fetch import TFetchResponse
-from src.db.model import TagModel
 
 
 class TTagFetchResponse(TFetchResponse):
-    def __init__(self, tags: List[TagModel]):
+    def __init__(self, tags: List[TTagModel]):
         self.tags = tags
 
 
 class TTagsByNameFetchResponse(TTagFetchResponse):
-    def __init__(self, tags: List[TagModel]):
+    def __init__(self, tags: List[TTagModel]):
         super().__init__(tags=tags)
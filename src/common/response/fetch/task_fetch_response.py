@@ -0,0 +1,26 @@
+from typing import List, Tuple
+
+from src.common.dto.model import TEntryModel
+from src.common.response.fetch import TFetchResponse
+
+
+class TTaskFetchResponse(TFetchResponse):
+    pass
+
+
+class TTaskSearchFetchResponse(TTaskFetchResponse):
+    """
+    Return one page of the slots of the tasks that match some search
+
+    Args:
+        items: the slots of the page, the best matches first
+        after: pass it to the next request for the next page, None if this
+               is the last page
+    """
+
+    def __init__(self, items: List[TEntryModel], after: Tuple = None) -> None:
+        self.items = items
+        self.after = after
+
+    def is_empty(self) -> bool:
+        return not self.items
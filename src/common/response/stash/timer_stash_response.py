@@ -1,6 +1,14 @@
+from src.common.dto.model import TEntryModel
 from src.common.response.stash import TStashResponse
 
 
 class TTimerStashResponse(TStashResponse):
+    """
+    Respond with the timer as it was stashed
 
-    pass
+    The entry carries the ids assigned by the database, so it is a delta that
+    clients could apply to what they already show instead of refetching.
+    """
+
+    def __init__(self, timer: TEntryModel = None) -> None:
+        self.timer = timer
@@ -0,0 +1,68 @@
+from threading import Event
+from threading import Lock
+
+from sqlalchemy.exc import OperationalError
+
+
+class TCancelToken:
+    """
+    Let one thread cancel the database work that runs in another thread
+
+    Once installed into a session, the token interrupts any SQLite statement
+    that runs on the session's connection as soon as the token is cancelled.
+    This uses both `sqlite3.Connection.interrupt` (to stop a long statement
+    right away) and a progress handler (to stop statements that begin after
+    the cancellation).
+
+    :param period: number of SQLite VM instructions between progress checks
+    """
+
+    def __init__(self, period: int = 1000) -> None:
+        self.period = period
+
+        self.lock = Lock()
+        self.event = Event()
+
+        self.connection = None
+
+    def cancel(self) -> None:
+        """Cancel the work and interrupt the running statement, if any"""
+
+        with self.lock:
+            self.event.set()
+
+            if self.connection is not None:
+                self.connection.interrupt()
+
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def install(self, session) -> None:
+        """Interrupt the statements of this session once cancelled"""
+
+        connection = session.connection().connection
+
+        with self.lock:
+            self.connection = connection
+
+            connection.set_progress_handler(self.is_cancelled, self.period)
+
+    def uninstall(self) -> None:
+        """Release the connection so that it can be safely reused"""
+
+        with self.lock:
+            if self.connection is None:
+                return
+
+            self.connection.set_progress_handler(None, self.period)
+
+            self.connection = None
+
+
+def is_interrupted(exception: Exception) -> bool:
+    """Check if the exception was raised by an interrupted SQLite statement"""
+
+    if not isinstance(exception, OperationalError):
+        return False
+
+    return "interrupted" in str(exception.orig)
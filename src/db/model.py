@@ -1,9 +1,12 @@
 from sqlalchemy import Column
+from sqlalchemy import Date
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Table
+from sqlalchemy import UniqueConstraint
+from sqlalchemy import event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -138,3 +141,109 @@ class SlotModel(Base):
 
     def __hash__(self):
         return hash((self.id, self.fst, self.lst))
+
+
+
+class DailyTotalModel(Base):
+    """
+    Store the time spent within a day on a task or with a tag (a rollup)
+
+    Rows with a task hold the totals of day x task, rows with a tag hold the
+    totals of day x tag, the row with neither holds the time spent on tasks
+    without tags. Days are local to the time zone of the rollup, see
+    SettingModel and TDailyTotals. The elapsed time is in microseconds.
+    """
+
+    __tablename__ = 'daily_totals'
+
+    __table_args__ = (UniqueConstraint('day', 'task_id', 'tag_id'),)
+
+    id = Column(Integer, primary_key=True)
+
+    day = Column(Date, nullable=False)
+
+    task_id = Column(Integer, ForeignKey('task.id'), nullable=True)
+    tag_id = Column(Integer, ForeignKey('tag.id'), nullable=True)
+
+    elapsed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f'DailyTotalModel(day={self.day}, task_id={self.task_id}, '
+            f'tag_id={self.tag_id}, elapsed={self.elapsed})'
+        )
+
+
+class SettingModel(Base):
+    """Store a named value that belongs with the data, e.g. a time zone"""
+
+    __tablename__ = 'setting'
+
+    name = Column(String, primary_key=True)
+
+    value = Column(String, nullable=True)
+
+    def __repr__(self):
+        return f'SettingModel(name={self.name}, value={self.value})'
+
+
+# Full-text index of task names, see TTaskRepository.search_tasks. It holds
+# only the index, the names stay in `task` (external content). The triggers
+# update it within the transaction of whatever writer changes a task.
+TASK_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE task_fts USING fts5(
+        name, content='task', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts (rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts (task_fts, rowid, name)
+        VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF name ON task BEGIN
+        INSERT INTO task_fts (task_fts, rowid, name)
+        VALUES ('delete', old.id, old.name);
+        INSERT INTO task_fts (rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    # Search results join the slots of the matching tasks
+    "CREATE INDEX IF NOT EXISTS slot_task_id ON slot (task_id)",
+]
+
+
+def create_task_search(connection) -> None:
+    """
+    Create the full-text index of task names, unless there is one already
+
+    Databases from before the index get it with the names of all the tasks.
+    """
+
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'task_fts'"
+    ).scalar()
+
+    if exists:
+        return
+
+    for statement in TASK_SEARCH_DDL:
+        connection.execute(statement)
+
+    connection.execute("INSERT INTO task_fts (task_fts) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def handle_after_create(target, connection, **kwargs):
+    create_task_search(connection)
+
+
+@event.listens_for(Base.metadata, 'before_drop')
+def handle_before_drop(target, connection, **kwargs):
+    connection.execute("DROP TABLE IF EXISTS task_fts")
@@ -0,0 +1,202 @@
+import datetime
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import pendulum
+
+from pendulum import Date
+from pendulum.tz.timezone import Timezone
+
+from src.common.logger import logged, logdata
+from src.db.model import DailyTotalModel, SettingModel, SlotModel, TaskModel
+from src.db.model import tags_and_tasks
+
+
+def microseconds(elapsed: datetime.timedelta) -> int:
+    return (elapsed.days * 86400 + elapsed.seconds) * 1000000 + elapsed.microseconds
+
+
+class TDailyTotals:
+    """
+    Keep the daily_totals rollup in step with the slots, see DailyTotalModel
+
+    Writers call `remove` with a slot as it was before they change it, `retag`
+    if they change the tags of a task, and `add` with the slot as it is after.
+    All of it goes through the session of the writer, so the rollup changes in
+    the same transaction as the slots. Slots that still run and slots without
+    a task do not count.
+
+    Days are local to the time zone stored with the rollup. A database gets
+    the local time zone with its first total or with `rebuild`.
+
+    Args:
+        session: the session of the writer
+    """
+
+    SETTING = 'daily_totals.tz'
+
+    def __init__(self, session) -> None:
+        self.session = session
+
+        self._tz = None
+
+    @property
+    def tz(self) -> Timezone:
+        if self._tz is None:
+            setting = self.session.query(SettingModel).get(self.SETTING)
+
+            if setting is None:
+                self._tz = pendulum.local_timezone()
+
+                self.session.add(SettingModel(name=self.SETTING, value=self._tz.name))
+            else:
+                self._tz = pendulum.timezone(setting.value)
+
+        return self._tz
+
+    def day(self, fst: datetime.datetime) -> Date:
+        """Return the local day of the moment, naive moments are in UTC"""
+
+        return pendulum.instance(fst, tz='UTC').in_timezone(self.tz).date()
+
+    def add(self, slot: SlotModel, task: TaskModel, sign: int = 1) -> None:
+        """Count the slot of the task (with the current tags of the task)"""
+
+        if slot.lst is None or task is None:
+            return
+
+        elapsed = sign * microseconds(slot.lst - slot.fst)
+
+        day = self.day(slot.fst)
+
+        self.change(day, task.id, None, elapsed)
+        self.change_tags(day, [tag.id for tag in task.tags], elapsed)
+
+    def remove(self, slot: SlotModel, task: TaskModel) -> None:
+        self.add(slot, task, sign=-1)
+
+    def retag(self, task: TaskModel, old_tag_ids: List[int]) -> None:
+        """Move the totals of the task from its old tags to its current ones"""
+
+        new_tag_ids = [tag.id for tag in task.tags]
+
+        if task.id is None or sorted(old_tag_ids) == sorted(new_tag_ids):
+            return
+
+        rows = (
+            self.session.query(DailyTotalModel.day, DailyTotalModel.elapsed)
+            .filter(DailyTotalModel.task_id == task.id)
+            .all()
+        )
+
+        for day, elapsed in rows:
+            self.change_tags(day, old_tag_ids, -elapsed)
+            self.change_tags(day, new_tag_ids, elapsed)
+
+    def change_tags(self, day: Date, tag_ids: List[int], elapsed: int) -> None:
+        for tag_id in tag_ids or [None]:
+            self.change(day, None, tag_id, elapsed)
+
+    def change(self, day: Date, task_id: int, tag_id: int, elapsed: int) -> None:
+        row = (
+            self.session.query(DailyTotalModel)
+            .filter(
+                DailyTotalModel.day == day,
+                DailyTotalModel.task_id == task_id,
+                DailyTotalModel.tag_id == tag_id,
+            )
+            .first()
+        )
+
+        if row is None:
+            row = DailyTotalModel(day=day, task_id=task_id, tag_id=tag_id, elapsed=0)
+
+            self.session.add(row)
+
+        row.elapsed += elapsed
+
+        if row.elapsed == 0:
+            self.session.delete(row)
+
+    def compute(self) -> Dict[Tuple, int]:
+        """Return what the rollup should hold: (day, task id, tag id) -> elapsed"""
+
+        totals, tag_ids = defaultdict(int), defaultdict(list)
+
+        for task_id, tag_id in self.session.query(
+            tags_and_tasks.c.task_id, tags_and_tasks.c.tag_id
+        ):
+            tag_ids[task_id].append(tag_id)
+
+        query = (
+            self.session.query(SlotModel.fst, SlotModel.lst, SlotModel.task_id)
+            .filter(SlotModel.lst != None, SlotModel.task_id != None)
+        )
+
+        for fst, lst, task_id in query.yield_per(1024):
+            day, elapsed = self.day(fst), microseconds(lst - fst)
+
+            totals[(day, task_id, None)] += elapsed
+
+            for tag_id in tag_ids[task_id] or [None]:
+                totals[(day, None, tag_id)] += elapsed
+
+        return {key: elapsed for key, elapsed in totals.items() if elapsed != 0}
+
+    def stored(self) -> Dict[Tuple, int]:
+        return {
+            (row.day, row.task_id, row.tag_id): row.elapsed
+            for row in self.session.query(DailyTotalModel)
+        }
+
+    @logged(logger=logging.getLogger('tslot-data'), disabled=True)
+    def rebuild(self, tz: Timezone = None) -> int:
+        """
+        Compute the rollup from all the slots, e.g. for an older database
+
+        :param tz: the time zone of the days, the local time zone by default
+        :return: the number of rows of the rollup
+        """
+
+        self._tz = pendulum.local_timezone() if tz is None else tz
+
+        self.session.query(SettingModel).filter(
+            SettingModel.name == self.SETTING
+        ).delete()
+        self.session.add(SettingModel(name=self.SETTING, value=self._tz.name))
+
+        self.session.query(DailyTotalModel).delete()
+
+        totals = self.compute()
+
+        self.session.bulk_insert_mappings(
+            DailyTotalModel,
+            [
+                {'day': day, 'task_id': task_id, 'tag_id': tag_id, 'elapsed': elapsed}
+                for (day, task_id, tag_id), elapsed in totals.items()
+            ],
+        )
+
+        logdata.info(f'Rebuilt {len(totals)} daily totals in {self._tz.name}')
+
+        return len(totals)
+
+    def check(self) -> List[Tuple]:
+        """
+        Compare the rollup with the slots, return where they differ
+
+        :return: (day, task id, tag id, stored elapsed, expected elapsed) for
+                 every total that differs, an empty list if all is well
+        """
+
+        stored, expected = self.stored(), self.compute()
+
+        return [
+            (*key, stored.get(key, 0), expected.get(key, 0))
+            for key in sorted(
+                set(stored) | set(expected),
+                key=lambda key: (key[0], key[1] or 0, key[2] or 0),
+            )
+            if stored.get(key, 0) != expected.get(key, 0)
+        ]
@@ -63,8 +63,6 @@ class TWorker(QObject):
         if not isinstance(self.path, Path) or not self.path.exists():
             return self.alerted.emit(TFailure(f"Path to database is gone {self.path}"))
 
-        self.logger.debug(f"Will create db session to {self.path}")
-
         engine = create_engine(f"sqlite:///{self.path}")
         SessionMaker = sessionmaker(bind=engine)
 
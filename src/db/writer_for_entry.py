@@ -7,6 +7,7 @@ from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
 from src.common.request.stash.entry_stash_request import TEntryStashRequest
 from src.common.response.stash.entry_stash_response import TEntryStashResponse
 from src.db.model import Base, SlotModel, TagModel, TaskModel
+from src.db.rollup import TDailyTotals
 from src.db.worker import TWriter
 
 
@@ -33,9 +34,20 @@ class TEntryWriter(TWriter):
         if self.session is None:
             self.session = self.create_session()
 
+        # The totals change in the same transaction as the slot
+        rollup = TDailyTotals(self.session)
+
+        if item.slot.id is not None:
+            old_slot = self.fetch_by_id_or_new(SlotModel, item.slot.id)
+
+            if old_slot is not None:
+                rollup.remove(old_slot, old_slot.task)
+
         slot = self.choose_old_or_new_slot(item.slot)
         task = self.choose_old_or_new_task(item.task)
 
+        old_tag_ids = [tag.id for tag in task.tags]
+
         # Either the id should be None (i.e. the model is new) or both should be
         # not None (i.e. the model is old). Must be always equal though:
         if slot.id != item.slot.id:
@@ -88,6 +100,12 @@ class TEntryWriter(TWriter):
                     {'name': tag.name}
                 )
 
+        # The new slot, task and tags need their ids for the totals
+        self.session.flush()
+
+        rollup.retag(task, old_tag_ids)
+        rollup.add(slot, task)
+
         self.session.commit()
 
         self.stashed.emit(
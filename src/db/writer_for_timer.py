@@ -8,6 +8,7 @@ from src.common.request.stash.timer_stash_request import TTimerStashRequest
 from src.common.failure import TFailure
 from src.common.logger import logged
 from src.db.model import SlotModel, TagModel, TaskModel
+from src.db.rollup import TDailyTotals
 from src.db.reader_for_timer import TSlotModel, TTaskModel
 from src.db.worker import TWriter
 
@@ -21,7 +22,7 @@ class TTimerWriter(TWriter):
         , parent : QObject=None
     ) -> None:
 
-        super().__init__(path, parent)
+        super().__init__(request, path, parent)
 
         self.tdata = request.tdata
 
@@ -51,6 +52,10 @@ class TTimerWriter(TWriter):
 
             return
 
+        # The totals change in the same transaction as the slot
+        rollup = TDailyTotals(session)
+        rollup.remove(slot, slot.task)
+
         slot.fst = tdata.slot.fst
         slot.lst = tdata.slot.lst
 
@@ -68,6 +73,8 @@ class TTimerWriter(TWriter):
 
         task.name = tdata.task.name
 
+        old_tag_ids = [tag.id for tag in task.tags]
+
         # tags are different:
         # 1. There could be no tags, meaning tdata.tags is []
         # 2. If there are tags present:
@@ -90,6 +97,12 @@ class TTimerWriter(TWriter):
         slot.task = task
         task.tags = new_tags + old_tags
 
+        # The new slot, task and tags need their ids for the totals
+        session.flush()
+
+        rollup.retag(task, old_tag_ids)
+        rollup.add(slot, task)
+
         session.commit()
 
         session.close()
@@ -1,45 +1,263 @@
-from multiprocessing import Pool
-from multiprocessing import Queue
+from pathlib import Path
+from typing import Callable
 
+from src.common.channel import TChannel
+from src.common.failure import TFailure
+from src.common.metrics import metrics
+from src.common.request import TRequest
+from src.common.request.batch import TBatchRequest
+from src.common.request.cancel import TCancelRequest
+from src.common.request.fetch import TFetchRequest
+from src.common.request.fetch.metrics_fetch_request import TMetricsFetchRequest
+from src.common.request.fetch.report_fetch_request import TReportFetchRequest
 from src.common.request.fetch.slot_fetch_request import TSlotFetchRequest
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.common.request.fetch.task_fetch_request import TTaskFetchRequest
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.common.response.batch import TBatchResponse
+from src.common.response.fetch.metrics_fetch_response import TMetricsFetchResponse
+from src.db.cancel import TCancelToken
+from src.server.cache import TResponseCache
+from src.server.controller.report_controller import TReportController
 from src.server.controller.slot_controller import TSlotController
+from src.server.controller.tag_controller import TTagController
+from src.server.controller.task_controller import TTaskController
+from src.server.controller.timer_controller import TTimerController
+from src.server.dispatcher import TDispatcher
+from src.server.prefetcher import TPrefetcher
+from src.server.repository import TRepository
 
 
 class Server:
-    def __init__(self, incoming_messages: Queue, outgoing_messages: Queue):
+    """
+    Receive requests from a client, handle them and send back the responses
 
-        self.pool = Pool()
+    :param incoming_messages: the channel that carries requests from the client
+    :param outgoing_messages: the channel that carries responses to the client
+    :param path: the path to the SQLite database
+    :param capacity: the maximum number of pending requests, None is unbounded
+    :param policy: what to do when there are too many pending requests
+    """
+
+    def __init__(
+        self,
+        incoming_messages: TChannel,
+        outgoing_messages: TChannel,
+        path: Path = None,
+        capacity: int = None,
+        policy: str = "block",
+    ):
 
         self.incoming_messages = incoming_messages
         self.outgoing_messages = outgoing_messages
 
-        self.timer_controller = TTimerController()
-        self.slot_controller = TSlotController()
-        self.tag_controller = TTagController()
+        self.dispatcher = TDispatcher(
+            respond=self.handle_success, capacity=capacity, policy=policy
+        )
+
+        self.repository = TRepository(path)
+
+        self.slot_controller = TSlotController(path)
+        self.timer_controller = TTimerController(path)
+        self.tag_controller = TTagController(path)
+        self.task_controller = TTaskController(path)
+        self.report_controller = TReportController(path)
+
+        self.cache = TResponseCache()
+        # The prefetcher puts the pages into the cache itself
+        self.prefetcher = TPrefetcher(
+            self.cache, self.dispatcher, self.slot_controller.fetch
+        )
 
     def start(self):
+        self.repository.prepare()
+
         while True:
             try:
                 request = self.incoming_messages.get()
             except Exception as exception:
                 break
 
-            if isinstance(request, TSlotFetchRequest):
-                self.handle_slot_fetch_request(request)
-            elif isinstance(message, TagRequest):
-                self.handle_tag_request(message)
-            else:
-                raise RuntimeError("Failed to recognize message")
+            if request is None:
+                break  # the client asked to shut down
+
+            self.handle(request)
+
+        self.dispatcher.stop()
+
+    def handle(self, request: TRequest, respond: Callable = None):
+        """
+        Handle one request from a client
+
+        :param request: the request to handle
+        :param respond: called with the response, by default it is sent to
+                        the outgoing channel
+        """
+
+        respond = respond or self.handle_success
+
+        if isinstance(request, TCancelRequest):
+            self.handle_cancel_request(request, respond)
+        elif isinstance(request, TMetricsFetchRequest):
+            self.handle_metrics_fetch_request(request, respond)
+        elif isinstance(request, TBatchRequest):
+            self.handle_batch_request(request, respond)
+        elif isinstance(request, TSlotFetchRequest):
+            self.handle_slot_fetch_request(request, respond)
+        elif isinstance(request, TTimerFetchRequest):
+            self.handle_timer_fetch_request(request, respond)
+        elif isinstance(request, TTimerStashRequest):
+            self.handle_timer_stash_request(request, respond)
+        elif isinstance(request, TTagFetchRequest):
+            self.handle_tag_fetch_request(request, respond)
+        elif isinstance(request, TTaskFetchRequest):
+            self.handle_task_fetch_request(request, respond)
+        elif isinstance(request, TReportFetchRequest):
+            self.handle_report_fetch_request(request, respond)
+        else:
+            failure = TFailure(f"Failed to recognize message {request}")
+            failure.request_id = getattr(request, "id", None)
+
+            respond(failure)
+
+    def handle_cancel_request(self, request: TCancelRequest, respond: Callable):
+        self.dispatcher.cancel(request.ids, request.group, respond)
+
+    def handle_metrics_fetch_request(
+        self, request: TMetricsFetchRequest, respond: Callable
+    ):
+        # Answer right away, metrics are most useful when the server is busy
+        response = TMetricsFetchResponse(metrics.snapshot())
+        response.request_id = request.id
+
+        respond(response)
+
+    def handle_slot_fetch_request(self, request: TSlotFetchRequest, respond: Callable):
+        response = self.cache.get(request)
+
+        if response is None:
+            self.dispatcher.submit(request, self.fetch_slots, respond)
+        else:
+            self.supersede(request, respond)
+
+            response.request_id = request.id
+
+            respond(response)
+
+        self.prefetcher.observe(request, response is not None, respond)
+
+    def supersede(self, request: TRequest, respond: Callable):
+        """Cancel the older requests of the group, if the request asks to"""
+
+        if request.supersede and request.group is not None:
+            self.dispatcher.cancel(group=request.group, respond=respond)
+
+    def handle_timer_fetch_request(
+        self, request: TTimerFetchRequest, respond: Callable
+    ):
+        self.dispatcher.submit(request, self.timer_controller.fetch, respond)
+
+    def handle_timer_stash_request(
+        self, request: TTimerStashRequest, respond: Callable
+    ):
+        self.dispatcher.submit(request, self.stash_timer, respond)
+
+    def handle_tag_fetch_request(self, request: TTagFetchRequest, respond: Callable):
+        self.dispatcher.submit(request, self.tag_controller.fetch, respond)
+
+    def handle_task_fetch_request(
+        self, request: TTaskFetchRequest, respond: Callable
+    ):
+        self.dispatcher.submit(request, self.task_controller.fetch, respond)
 
-    def handle_slot_request(self, request: TSlotFetchRequest):
-        self.pool.apply_async(func=self.slot_controller.fetch, args=(request))
+    def handle_report_fetch_request(
+        self, request: TReportFetchRequest, respond: Callable
+    ):
+        self.dispatcher.submit(request, self.report_controller.fetch, respond)
+
+    def handle_batch_request(self, request: TBatchRequest, respond: Callable):
+        # Slot requests in a batch supersede and prefetch as they do alone
+        slot_requests = [
+            item for item in request.requests if isinstance(item, TSlotFetchRequest)
+        ]
+
+        hits = [self.cache.contains(item) for item in slot_requests]
+
+        for item in slot_requests:
+            self.supersede(item, respond)
+
+        self.dispatcher.submit(request, self.fetch_batch, respond)
+
+        for item, hit in zip(slot_requests, hits):
+            self.prefetcher.observe(item, hit, respond)
+
+    def fetch_slots(self, request: TSlotFetchRequest, token: TCancelToken = None):
+        response = self.slot_controller.fetch(request, token)
+
+        self.cache.put(request, response)
+
+        return response
+
+    def stash_timer(self, request: TTimerStashRequest, token: TCancelToken = None):
+        response = self.timer_controller.stash(request, token)
+
+        # Responses cached before this point could miss the stashed slot
+        self.cache.invalidate()
+
+        return response
+
+    def fetch_batch(self, request: TBatchRequest, token: TCancelToken = None):
+        """Fetch all the requests of the batch within one read transaction"""
+
+        responses = []
+
+        with self.repository.snapshot(token):
+            for item in request.requests:
+                try:
+                    response = self.find_fetch(item)(item, token)
+                except TFailure as failure:
+                    response = failure
+
+                response.request_id = item.id
+
+                responses.append(response)
+
+        return TBatchResponse(responses)
+
+    def find_fetch(self, request: TFetchRequest) -> Callable:
+        """Find the function that fetches the response to the request"""
+
+        if isinstance(request, TSlotFetchRequest):
+            return self.fetch_slots
+
+        if isinstance(request, TTimerFetchRequest):
+            return self.timer_controller.fetch
+
+        if isinstance(request, TTagFetchRequest):
+            return self.tag_controller.fetch
+
+        if isinstance(request, TTaskFetchRequest):
+            return self.task_controller.fetch
+
+        if isinstance(request, TReportFetchRequest):
+            return self.report_controller.fetch
+
+        raise TFailure(f"Failed to recognize message {request}")
 
     def handle_success(self, response):
         self.outgoing_messages.put(response)
 
     def handle_failure(self, response):
-        print(f"handle failure: {response}")
+        self.outgoing_messages.put(response)
 
 
-def server(incoming_messages: Queue, outgoing_messages: Queue):
-    return Server(incoming_messages, outgoing_messages).start()
+def server(
+    incoming_messages: TChannel,
+    outgoing_messages: TChannel,
+    capacity: int = None,
+    policy: str = "block",
+):
+    return Server(
+        incoming_messages, outgoing_messages, capacity=capacity, policy=policy
+    ).start()
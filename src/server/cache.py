@@ -0,0 +1,109 @@
+import copy
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from src.common.metrics import metrics
+from src.common.request import TRequest
+from src.common.response import TResponse
+
+
+class TResponseCache:
+    """
+    Keep the latest responses in memory, keyed by the requests that made them
+
+    Two requests are the same if they ask for the same thing: their ids,
+    groups and other delivery details do not matter. The least recently used
+    responses are evicted once there are more than `capacity` of them, and
+    responses older than `ttl` seconds are never returned (other clients could
+    have changed the data since).
+
+    Hits and misses are published to `src.common.metrics.metrics` under the
+    "cache." prefix.
+
+    :param capacity: the maximum number of responses to keep
+    :param ttl: the time (in seconds) a response stays fresh
+    """
+
+    # Attributes that only say how to deliver the request, not what it asks
+    TRANSIENT = ["id", "group", "supersede", "prefetch"]
+
+    def __init__(self, capacity: int = 256, ttl: float = 60.0) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+
+        self.lock = Lock()
+        self.items = OrderedDict()
+
+    def key(self, request: TRequest) -> tuple:
+        """Return what the request asks for, or None if it cannot be cached"""
+
+        fields = sorted(
+            (name, value)
+            for name, value in vars(request).items()
+            if name not in self.TRANSIENT
+        )
+
+        key = (request.__class__.__name__, tuple(fields))
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def get(self, request: TRequest) -> TResponse:
+        """Return a copy of the cached response, None if there is none"""
+
+        key = self.key(request)
+
+        with self.lock:
+            stored_at, response = self.items.get(key, (None, None))
+
+            if response is not None and time.monotonic() - stored_at > self.ttl:
+                del self.items[key]
+
+                response = None
+
+            if response is not None:
+                self.items.move_to_end(key)
+
+        if response is None:
+            metrics.increment("cache.miss")
+
+            return None
+
+        metrics.increment("cache.hit")
+
+        # Every request stamps its own id on the response it gets
+        return copy.copy(response)
+
+    def contains(self, request: TRequest) -> bool:
+        key = self.key(request)
+
+        with self.lock:
+            return key in self.items
+
+    def put(self, request: TRequest, response: TResponse) -> None:
+        key = self.key(request)
+
+        if key is None:
+            return
+
+        with self.lock:
+            self.items[key] = (time.monotonic(), copy.copy(response))
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.capacity:
+                self.items.popitem(last=False)
+
+            metrics.gauge("cache.size", len(self.items))
+
+    def invalidate(self) -> None:
+        """Forget all responses, e.g. once the data has changed"""
+
+        with self.lock:
+            self.items.clear()
+
+            metrics.gauge("cache.size", 0)
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from src.common.request.fetch.report_fetch_request import TReportFetchRequest
+from src.common.response.fetch.report_fetch_response import TReportFetchResponse
+from src.db.cancel import TCancelToken
+from src.server.service.report_service import TReportService
+
+
+class TReportController:
+    def __init__(self, path: Path = None):
+        self.service = TReportService(path)
+
+    def fetch(
+        self, request: TReportFetchRequest, token: TCancelToken = None
+    ) -> TReportFetchResponse:
+        if isinstance(request, TReportFetchRequest):
+            return self.service.fetch_report(request, token)
+        else:
+            raise RuntimeError(f"{__class__.__name__} failed to identify request")
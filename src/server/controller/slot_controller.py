@@ -1,21 +1,23 @@
-from multiprocessing.queues import Queue
+from pathlib import Path
 
 from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
 from src.common.request.fetch.slot_fetch_request import TRaySlotWithTagFetchRequest  # NOQA
 from src.common.request.fetch.slot_fetch_request import TSlotFetchRequest
+from src.common.response.fetch.slot_fetch_response import TSlotFetchResponse
+from src.db.cancel import TCancelToken
 from src.server.service.slot_service import TSlotService
 
 
 class TSlotController:
-    def __init__(self, outgoing_messages: Queue):
-        self.outgoing_messages = outgoing_messages
+    def __init__(self, path: Path = None):
+        self.service = TSlotService(path)
 
-        self.service = TSlotService()
-
-    def fetch(self, request: TSlotFetchRequest):
+    def fetch(
+        self, request: TSlotFetchRequest, token: TCancelToken = None
+    ) -> TSlotFetchResponse:
         if isinstance(request, TRaySlotFetchRequest):
-            self.outgoing_messages.put(self.service.fetch_ray_slot(request))
+            return self.service.fetch_ray_slot(request, token)
         elif isinstance(request, TRaySlotWithTagFetchRequest):
-            self.outgoing_messages.put(self.service.fetch_ray_slot_with_tag(request))
+            return self.service.fetch_ray_slot_with_tag(request, token)
         else:
             raise RuntimeError(f"{__class__.__name__} failed to identify request")
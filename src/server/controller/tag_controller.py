@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.common.response.fetch.tag_fetch_response import TTagFetchResponse
+from src.db.cancel import TCancelToken
+from src.server.service.tag_service import TTagService
+
+
+class TTagController:
+    def __init__(self, path: Path = None):
+        self.service = TTagService(path)
+
+    def fetch(
+        self, request: TTagFetchRequest, token: TCancelToken = None
+    ) -> TTagFetchResponse:
+        # Only all the tags at once, the client looks them up by name itself
+        if type(request) is TTagFetchRequest:
+            return self.service.fetch_tags(request, token)
+        else:
+            raise RuntimeError(f"{__class__.__name__} failed to identify request")
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from src.common.request.fetch.task_fetch_request import TTaskFetchRequest
+from src.common.request.fetch.task_fetch_request import TTaskSearchFetchRequest
+from src.common.response.fetch.task_fetch_response import TTaskFetchResponse
+from src.db.cancel import TCancelToken
+from src.server.service.task_service import TTaskService
+
+
+class TTaskController:
+    def __init__(self, path: Path = None):
+        self.service = TTaskService(path)
+
+    def fetch(
+        self, request: TTaskFetchRequest, token: TCancelToken = None
+    ) -> TTaskFetchResponse:
+        if isinstance(request, TTaskSearchFetchRequest):
+            return self.service.search_tasks(request, token)
+        else:
+            raise RuntimeError(f"{__class__.__name__} failed to identify request")
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from src.db.cancel import TCancelToken
+from src.server.service.timer_service import TTimerService
+
+
+class TTimerController:
+    def __init__(self, path: Path = None):
+        self.service = TTimerService(path)
+
+    def fetch(
+        self, request: TTimerFetchRequest, token: TCancelToken = None
+    ) -> TTimerFetchResponse:
+        if isinstance(request, TTimerFetchRequest):
+            return self.service.fetch_timer(request, token)
+        else:
+            raise RuntimeError(f"{__class__.__name__} failed to identify request")
+
+    def stash(
+        self, request: TTimerStashRequest, token: TCancelToken = None
+    ) -> TTimerStashResponse:
+        if isinstance(request, TTimerStashRequest):
+            return self.service.stash_timer(request, token)
+        else:
+            raise RuntimeError(f"{__class__.__name__} failed to identify request")
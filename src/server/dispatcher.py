@@ -0,0 +1,319 @@
+import time
+from collections import deque
+from threading import Condition
+from threading import Thread
+from typing import Callable
+from typing import List
+
+from src.common.backpressure import DISPATCHER_POLICIES
+from src.common.failure import TFailure
+from src.common.logger import logdata
+from src.common.metrics import metrics
+from src.common.request import TRequest
+from src.common.response import TResponse
+from src.db.cancel import TCancelToken
+from src.db.cancel import is_interrupted
+
+
+class TJob:
+    """
+    Hold a request together with the function that will handle it
+
+    :param request: the request to handle
+    :param handler: called as handler(request, token) and returns a response
+    :param respond: called with the response once the request is handled
+    """
+
+    def __init__(
+        self, request: TRequest, handler: Callable, respond: Callable = None
+    ) -> None:
+        self.request = request
+        self.handler = handler
+        self.respond = respond
+
+        self.token = TCancelToken()
+        self.state = "pending"
+
+        self.submitted_at = time.monotonic()
+
+    def run(self) -> TResponse:
+        return self.handler(self.request, self.token)
+
+
+class TDispatcher:
+    """
+    Run requests on a few threads, allow to cancel and supersede them
+
+    Requests are handled in the order they were submitted, except that prefetch
+    requests run only when there is nothing else to do. A request that is
+    cancelled while it is still pending is dropped before it starts. A request
+    that is cancelled while running has its SQLite statement interrupted and
+    its response (if any) is discarded.
+
+    At most `capacity` requests could be pending. Once there are that many, a
+    new request is handled according to the policy:
+
+    - block: hold the request back until some pending request starts
+    - drop_oldest_prefetch: drop the oldest pending prefetch request to make
+      space; if there are no prefetch requests, then block
+    - reject: respond with a TFailure right away
+
+    Submitting never waits: the thread that reads requests must stay free to
+    read cancellations and metrics requests even when the dispatcher is full.
+    So a blocked request is held back in a second queue (of `capacity` too)
+    and it is rejected only once that queue is full as well.
+
+    The depth of the queue and the time requests wait in it are published to
+    `src.common.metrics.metrics` under the "dispatcher." prefix.
+
+    :param respond: called with every response (or failure) that is produced
+    :param workers: the number of threads that handle requests
+    :param capacity: the maximum number of pending requests, None is unbounded
+    :param policy: what to do when there are too many pending requests
+    """
+
+    def __init__(
+        self,
+        respond: Callable,
+        workers: int = 4,
+        capacity: int = None,
+        policy: str = "block",
+    ) -> None:
+
+        if policy not in DISPATCHER_POLICIES:
+            raise RuntimeError(
+                f"Expected policy from {DISPATCHER_POLICIES}, was {policy}"
+            )
+
+        self.respond = respond
+
+        self.capacity = capacity
+        self.policy = policy
+
+        self.condition = Condition()
+        self.stopped = False
+
+        self.pending = deque()
+        self.blocked = deque()
+        self.jobs = {}
+
+        self.threads = [
+            Thread(target=self.loop, name=f"tslot-dispatcher-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+        for thread in self.threads:
+            thread.start()
+
+    def submit(
+        self, request: TRequest, handler: Callable, respond: Callable = None
+    ) -> None:
+        """
+        Queue the request, supersede older requests of its group if asked
+
+        :param respond: called with the response instead of the dispatcher's
+                        own `respond`, e.g. to answer a particular client
+        """
+
+        respond = respond or self.respond
+
+        with self.condition:
+            if request.supersede and request.group is not None:
+                self.cancel_group(request.group, respond)
+
+            job = TJob(request, handler, respond)
+
+            if self.make_space():
+                failure = None
+
+                self.jobs[request.id] = job
+                self.pending.append(job)
+
+                metrics.gauge("dispatcher.depth", len(self.pending))
+
+                self.condition.notify_all()
+            elif self.can_hold(request):
+                failure = None
+
+                job.state = "blocked"
+
+                self.jobs[request.id] = job
+                self.blocked.append(job)
+
+                metrics.increment("dispatcher.blocked")
+            else:
+                failure = TFailure("Too many pending requests, try again later")
+                failure.request_id = request.id
+
+        if failure is not None:
+            metrics.increment("dispatcher.rejected")
+
+            if not request.prefetch:
+                respond(failure)  # nobody waits for a prefetch, drop it quietly
+
+    def is_full(self) -> bool:
+        if self.capacity is None:
+            return False
+
+        return len(self.pending) >= self.capacity
+
+    def make_space(self) -> bool:
+        """Apply the policy without waiting, return False if still full"""
+
+        if self.is_full() and self.policy == "drop_oldest_prefetch":
+            for job in self.pending:
+                if job.request.prefetch:
+                    metrics.increment("dispatcher.dropped")
+
+                    self.cancel_job(job)
+
+                    break
+
+        return not self.is_full() and not self.stopped
+
+    def can_hold(self, request: TRequest) -> bool:
+        """Check if a request that does not fit could be held back"""
+
+        if self.stopped or self.policy == "reject" or request.prefetch:
+            return False
+
+        return len(self.blocked) < self.capacity
+
+    def unblock(self) -> None:
+        """Move the requests that were held back into the freed space"""
+
+        while self.blocked and not self.is_full():
+            job = self.blocked.popleft()
+            job.state = "pending"
+
+            self.pending.append(job)
+
+            metrics.timing("dispatcher.held", time.monotonic() - job.submitted_at)
+
+    def cancel(
+        self, ids: List[str] = None, group: str = None, respond: Callable = None
+    ) -> None:
+        """
+        Cancel the requests with the given ids and/or from the given group
+
+        :param respond: if given, only cancel the requests that would be
+                        answered with it, i.e. the requests of one client
+        """
+
+        with self.condition:
+            for id in ids or []:
+                job = self.jobs.get(id)
+
+                if job is not None and self.is_owner(job, respond):
+                    self.cancel_job(job)
+
+            if group is not None:
+                self.cancel_group(group, respond)
+
+    def cancel_respond(self, respond: Callable) -> None:
+        """Cancel all the requests that would be answered with `respond`"""
+
+        with self.condition:
+            for job in list(self.jobs.values()):
+                if job.respond == respond:
+                    self.cancel_job(job)
+
+    def cancel_group(self, group: str, respond: Callable = None) -> None:
+        for job in list(self.jobs.values()):
+            if job.request.group == group and self.is_owner(job, respond):
+                self.cancel_job(job)
+
+    def is_owner(self, job: TJob, respond: Callable = None) -> bool:
+        return respond is None or job.respond == respond
+
+    def cancel_job(self, job: TJob) -> None:
+        logdata.debug(f"Cancel {job.state} request {job.request.id}")
+
+        if job.state == "pending":
+            self.pending.remove(job)
+        elif job.state == "blocked":
+            self.blocked.remove(job)
+
+        job.state = "cancelled"
+        job.token.cancel()
+
+        del self.jobs[job.request.id]
+
+        if self.blocked and not self.is_full():
+            self.unblock()
+            self.condition.notify_all()
+
+    def stop(self) -> None:
+        """Drop all pending requests and wait for the running ones to finish"""
+
+        with self.condition:
+            self.stopped = True
+
+            self.pending.clear()
+            self.blocked.clear()
+            self.condition.notify_all()
+
+        for thread in self.threads:
+            thread.join()
+
+    def loop(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+
+                if self.stopped:
+                    return
+
+                job = self.next_job()
+                job.state = "running"
+
+                self.unblock()
+
+                metrics.gauge("dispatcher.depth", len(self.pending))
+                metrics.timing("dispatcher.wait", time.monotonic() - job.submitted_at)
+
+            response = self.work(job)
+
+            with self.condition:
+                if job.state != "running":
+                    continue  # cancelled while running, discard the response
+
+                job.state = "done"
+
+                del self.jobs[job.request.id]
+
+            if response is not None:
+                response.request_id = job.request.id
+
+                try:
+                    job.respond(response)
+                except Exception:
+                    # The client could be gone, keep the thread for the others
+                    logdata.exception(f"Failed to respond to {job.request.id}")
+
+    def next_job(self) -> TJob:
+        """Take the oldest pending request, prefetch requests go last"""
+
+        for job in self.pending:
+            if not job.request.prefetch:
+                self.pending.remove(job)
+
+                return job
+
+        return self.pending.popleft()
+
+    def work(self, job: TJob) -> TResponse:
+        try:
+            return job.run()
+        except TFailure as failure:
+            return failure
+        except Exception as exception:
+            if job.token.is_cancelled() and is_interrupted(exception):
+                logdata.debug(f"Interrupted request {job.request.id}")
+
+                return None
+
+            logdata.exception(f"Failed to handle {job.request}")
+
+            return TFailure(f"Failed to handle request: {exception}")
@@ -0,0 +1,140 @@
+import copy
+from threading import Lock
+from typing import Callable
+from uuid import uuid4
+
+from src.common.logger import logdata
+from src.common.metrics import metrics
+from src.common.request.fetch.slot_fetch_request import TSlotFetchRequest
+from src.db.cancel import TCancelToken
+from src.server.cache import TResponseCache
+from src.server.dispatcher import TDispatcher
+
+
+class TPrefetcher:
+    """
+    Warm the response cache with the pages a client is going to ask for next
+
+    A client that scrolls through its history asks for the pages of days one
+    after another: [0, 1), then [1, 2) and so on. So, after each such page,
+    the next few pages are fetched at low priority into the cache.
+
+    The number of pages fetched ahead adapts: it doubles (up to `depth`) each
+    time the client asks for a page that was prefetched and falls back to one
+    page once the client jumps elsewhere. Pages are only prefetched ahead of
+    actual requests, so prefetching stops as soon as the client stops asking.
+
+    Prefetch requests belong to the group of the request that caused them, so
+    a superseding request of the client cancels them as well.
+
+    :param cache: the cache to put the prefetched responses into
+    :param dispatcher: the dispatcher to run the prefetch requests on
+    :param fetch: called as fetch(request, token) and returns a response, the
+                  prefetcher puts it into the cache
+    :param depth: the maximum number of pages to fetch ahead
+    """
+
+    def __init__(
+        self,
+        cache: TResponseCache,
+        dispatcher: TDispatcher,
+        fetch: Callable,
+        depth: int = 4,
+    ) -> None:
+        self.cache = cache
+        self.dispatcher = dispatcher
+        self.fetch = fetch
+        self.depth = depth
+
+        self.lock = Lock()
+
+        # Per client (keyed by its respond) the last page and the current depth
+        self.clients = {}
+
+        # Keys of the pages that are being prefetched mapped to request ids
+        self.inflight = {}
+
+    def observe(self, request: TSlotFetchRequest, hit: bool, respond: Callable):
+        """Prefetch the pages that follow the page a client has just asked for"""
+
+        if request.prefetch:
+            return
+
+        width = request.slice_lst - request.slice_fst
+
+        if width <= 0:
+            return
+
+        with self.lock:
+            last, depth = self.clients.get(respond, (None, 1))
+
+            if hit and self.follows(last, request):
+                depth = min(2 * depth, self.depth)
+            elif not self.follows(last, request):
+                depth = 1
+
+            self.clients[respond] = (request, depth)
+
+        for page in range(1, depth + 1):
+            self.prefetch(self.shift(request, page * width), respond)
+
+    def forget(self, respond: Callable) -> None:
+        """Forget a client that has gone away"""
+
+        with self.lock:
+            self.clients.pop(respond, None)
+
+    def follows(self, last: TSlotFetchRequest, request: TSlotFetchRequest) -> bool:
+        """Check if the request asks for the page right after the last one"""
+
+        if last is None or last.slice_lst != request.slice_fst:
+            return False
+
+        # Same ray and page width, only the slices are different
+        return self.cache.key(self.shift(last, -last.slice_fst)) == self.cache.key(
+            self.shift(request, -request.slice_fst)
+        )
+
+    def shift(self, request: TSlotFetchRequest, offset: int) -> TSlotFetchRequest:
+        """Copy the request, but ask for a page that is `offset` days further"""
+
+        shifted = copy.copy(request)
+
+        shifted.id = uuid4().hex
+        shifted.supersede = False
+        shifted.prefetch = True
+
+        shifted.slice_fst = request.slice_fst + offset
+        shifted.slice_lst = request.slice_lst + offset
+
+        return shifted
+
+    def prefetch(self, request: TSlotFetchRequest, respond: Callable) -> None:
+        key = self.cache.key(request)
+
+        with self.lock:
+            if key is None or self.is_inflight(key) or self.cache.contains(request):
+                return
+
+            self.inflight[key] = request.id
+
+        metrics.increment("prefetch.submitted")
+
+        self.dispatcher.submit(request, self.handle, respond)
+
+    def is_inflight(self, key: tuple) -> bool:
+        # A prefetch that was dropped or cancelled is no longer a job
+        return self.inflight.get(key) in self.dispatcher.jobs
+
+    def handle(self, request: TSlotFetchRequest, token: TCancelToken):
+        """Fetch the page into the cache, nobody waits for the response"""
+
+        try:
+            self.cache.put(request, self.fetch(request, token))
+        except Exception as exception:
+            logdata.debug(f"Failed to prefetch {request.id}: {exception}")
+        finally:
+            with self.lock:
+                self.inflight.pop(self.cache.key(request), None)
+
+        return None
@@ -1,8 +1,21 @@
 import logging
-
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.common.failure import TFailure
 from src.common.logger import logged, logdata
+from src.db.cancel import TCancelToken
+from src.db.model import Base
+from src.db.rollup import TDailyTotals
+
+
+# The session of the snapshot that the current thread runs in, if any. It is
+# shared by all repositories, so that a batch could span several of them.
+local = threading.local()
 
 
 class TRepository:
@@ -14,20 +27,118 @@ class TRepository:
             path: path to the SQLite database file
         """
 
+        if path is None:
+            path = Path(Path.cwd(), Path("tslot.db"))
+
         self.path = path
         self.query = None
         self.session = None
 
     @logged(logger=logging.getLogger("tslot-data"), disabled=True)
-    def create_session(self):
-        """Open a brand new SQLite/SQLAlchemy database session"""
+    def create_session(self, token: TCancelToken = None):
+        """
+        Open a brand new SQLite/SQLAlchemy database session
 
-        if not isinstance(self.path, Path) or not self.path.exists():
-            raise TFailure(f"Path to database is gone {self.path}")
+        Several threads may use the same repository, so the session is not
+        stored anywhere. If a session was supplied from outside (e.g. by tests),
+        then reuse it instead of creating a new one.
+
+        Args:
+            token: if provided, interrupts the queries of the session on cancel
+        """
+
+        if getattr(local, "session", None) is not None:
+            return local.session  # within a snapshot, see `snapshot`
+
+        if self.session is not None:
+            session = self.session
+        else:
+            if not isinstance(self.path, Path) or not self.path.exists():
+                raise TFailure(f"Path to database is gone {self.path}")
+
+            engine = create_engine(f"sqlite:///{self.path}")
+            SessionMaker = sessionmaker(bind=engine)
+
+            session = SessionMaker()
+
+        if token is not None:
+            token.install(session)
+
+        return session
+
+    def prepare(self) -> None:
+        """
+        Bring a database of an older version up to date
+
+        Adds the tables and indexes that are missing. The daily totals of a
+        database without them are computed from its slots.
+
+        There may be no database yet (they are created elsewhere, see
+        `Base.metadata.create_all`), then there is nothing to do.
+        """
 
-        logdata.debug(f"Will create db session to {self.path}")
+        if not isinstance(self.path, Path) or not self.path.exists():
+            return
 
         engine = create_engine(f"sqlite:///{self.path}")
-        SessionMaker = sessionmaker(bind=engine)
 
-        return SessionMaker()
+        try:
+            with engine.begin() as connection:
+                rollup = engine.dialect.has_table(connection, "daily_totals")
+
+                # Creates only the tables that are missing (and the task search)
+                Base.metadata.create_all(connection)
+
+                if not rollup:
+                    session = Session(bind=connection)
+
+                    TDailyTotals(session).rebuild()
+
+                    session.flush()
+                    session.close()
+        except Exception as exception:
+            logdata.warning(f"Failed to prepare database {self.path}: {exception}")
+        finally:
+            engine.dispose()
+
+    def close_session(self, session, token: TCancelToken = None) -> None:
+        """Close the session that was opened with `create_session`"""
+
+        if session is getattr(local, "session", None):
+            return  # the snapshot closes its session once it is over
+
+        if token is not None:
+            token.uninstall()
+
+        session.close()
+
+    @contextmanager
+    def snapshot(self, token: TCancelToken = None):
+        """
+        Run all the queries of this thread in one read transaction
+
+        Within the snapshot, every repository uses the same session, so all the
+        queries see the same state of the database. In WAL mode other
+        connections may write meanwhile, otherwise they wait for the snapshot.
+
+        Args:
+            token: if provided, interrupts the queries of the snapshot on cancel
+        """
+
+        session = self.create_session(token)
+
+        # The sqlite3 module begins transactions only before writes, so begin
+        # the read transaction explicitly (unless one is already open)
+        connection = session.connection().connection
+
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+
+        local.session = session
+
+        try:
+            yield session
+        finally:
+            local.session = None
+
+            self.close_session(session, token)
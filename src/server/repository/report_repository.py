@@ -0,0 +1,237 @@
+import datetime
+import logging
+from typing import List, Tuple
+
+import pendulum
+
+from pendulum import DateTime
+from pendulum.tz.timezone import Timezone
+from sqlalchemy import case
+from sqlalchemy.sql.functions import func
+
+from src.common.dto.model import TTagModel, TTaskModel, TTotalModel
+from src.common.logger import logged
+from src.common.request.fetch.report_fetch_request import TReportFetchRequest
+from src.common.response.fetch.report_fetch_response import TReportFetchResponse
+from src.db.cancel import TCancelToken
+from src.db.model import DailyTotalModel, SettingModel
+from src.db.model import SlotModel, TagModel, TaskModel, tags_and_tasks
+from src.db.rollup import TDailyTotals
+from src.server.repository import TRepository
+
+
+def utc(dt: DateTime) -> datetime.datetime:
+    """Return the moment as stored in the database: naive, in UTC"""
+
+    return pendulum.instance(dt).in_timezone("UTC").naive()
+
+
+def offset(tz: Timezone, dt: DateTime) -> int:
+    """Return the offset of the time zone from UTC at the moment, in minutes"""
+
+    return int(dt.in_timezone(tz).utcoffset().total_seconds()) // 60
+
+
+def offsets(tz: Timezone, fst: DateTime, lst: DateTime) -> List[Tuple]:
+    """
+    Return the offsets of the time zone from UTC within [fst, lst)
+
+    Each offset comes with the moment (naive, in UTC) it stops being valid,
+    the last one with None. The range is walked a day at a time, so at most
+    one change a day is found (time zones change twice a year at most).
+    """
+
+    fst = pendulum.instance(fst).in_timezone("UTC")
+    lst = pendulum.instance(lst).in_timezone("UTC")
+
+    found, minutes = [], offset(tz, fst)
+
+    while fst < lst:
+        nxt = min(fst.add(days=1), lst)
+
+        if offset(tz, nxt) != minutes:
+            # Narrow it down to the second of the change
+            lo, hi = fst, nxt
+
+            while hi.diff(lo).in_seconds() > 1:
+                mid = lo.add(seconds=hi.diff(lo).in_seconds() // 2)
+
+                lo, hi = (mid, hi) if offset(tz, mid) == minutes else (lo, mid)
+
+            found.append((utc(hi), minutes))
+
+            minutes = offset(tz, hi)
+
+        fst = nxt
+
+    return found + [(None, minutes)]
+
+
+def local_date(column, tz: Timezone, fst: DateTime, lst: DateTime):
+    """Return the SQL date of the moment in the column, in the time zone"""
+
+    # SQLite knows no time zones, only fixed offsets: apply the offset that
+    # was valid at the moment, there is one branch per change of the offset
+    dates = [
+        (until, func.DATE(column, f"{minutes:+d} minutes"))
+        for until, minutes in offsets(tz, fst, lst)
+    ]
+
+    if len(dates) == 1:
+        return dates[0][1]
+
+    return case(
+        [(column < until, date) for until, date in dates[:-1]], else_=dates[-1][1]
+    )
+
+
+# How to get the first day of the period of a date, all are SQL dates
+PERIODS = {
+    "day": lambda date: date,
+    "week": lambda date: func.DATE(date, "weekday 0", "-6 days"),
+    "month": lambda date: func.DATE(date, "start of month"),
+    "year": lambda date: func.DATE(date, "start of year"),
+}
+
+
+def is_midnight(dt: DateTime, tz: Timezone) -> bool:
+    return pendulum.instance(dt).in_timezone(tz).time() == datetime.time()
+
+
+class TReportRepository(TRepository):
+    @logged(logger=logging.getLogger("tslot-data"), disabled=True)
+    def fetch_report(
+        self, request: TReportFetchRequest, token: TCancelToken = None
+    ) -> TReportFetchResponse:
+        # SQLite/SQLAlchemy session must be created and used by the same
+        # thread. Several threads could be using this repository at the same
+        # time, so the session is local to this call.
+        session = self.create_session(token)
+
+        try:
+            if self.can_use_rollup(session, request):
+                rows = self.fetch_from_rollup(session, request)
+            else:
+                rows = self.fetch_from_slots(session, request)
+        finally:
+            self.close_session(session, token)
+
+        totals = []
+
+        for row in rows:
+            row, elapsed = list(row[:-1]), row[-1]
+
+            total = TTotalModel(elapsed)
+
+            for group in request.group_by:
+                if group in PERIODS:
+                    total.date = pendulum.parse(row.pop(0)).date()
+                elif group == "task":
+                    name, id = row.pop(0), row.pop(0)
+
+                    total.task = TTaskModel(name, id)
+                else:
+                    name, id = row.pop(0), row.pop(0)
+
+                    total.tag = None if id is None else TTagModel(name, id)
+
+            totals.append(total)
+
+        return TReportFetchResponse(totals, request.group_by)
+
+    def columns(self, request: TReportFetchRequest, date) -> list:
+        """Return the columns to group by, `date` is the SQL date of a slot"""
+
+        groups = {
+            # By name first, tasks and tags could share names
+            "task": [TaskModel.name, TaskModel.id],
+            "tag": [TagModel.name, TagModel.id],
+        }
+
+        groups.update({period: [PERIODS[period](date)] for period in PERIODS})
+
+        return [column for group in request.group_by for column in groups[group]]
+
+    def can_use_rollup(self, session, request: TReportFetchRequest) -> bool:
+        """
+        Check if the daily totals hold the report, see TDailyTotals
+
+        They do if their days are in the time zone of the request, the range
+        is made of whole days and the report is not by task and tag at once.
+        """
+
+        if "task" in request.group_by and "tag" in request.group_by:
+            return False
+
+        if not (is_midnight(request.fst, request.tz) and is_midnight(request.lst, request.tz)):
+            return False
+
+        setting = session.query(SettingModel).get(TDailyTotals.SETTING)
+
+        return setting is not None and setting.value == request.tz.name
+
+    def fetch_from_rollup(self, session, request: TReportFetchRequest) -> list:
+        columns = self.columns(request, func.DATE(DailyTotalModel.day))
+
+        fst = pendulum.instance(request.fst).in_timezone(request.tz).date()
+        lst = pendulum.instance(request.lst).in_timezone(request.tz).date()
+
+        ReportQuery = (
+            session.query(*columns, func.SUM(DailyTotalModel.elapsed))
+            .select_from(DailyTotalModel)
+            .filter(DailyTotalModel.day >= fst, DailyTotalModel.day < lst)
+        )
+
+        if "tag" in request.group_by:
+            # The row without a tag holds the time on tasks without tags
+            ReportQuery = ReportQuery.filter(
+                DailyTotalModel.task_id == None
+            ).outerjoin(TagModel, TagModel.id == DailyTotalModel.tag_id)
+        else:
+            # Every slot counts once within the totals of its task
+            ReportQuery = ReportQuery.filter(DailyTotalModel.task_id != None)
+
+        if "task" in request.group_by:
+            ReportQuery = ReportQuery.join(
+                TaskModel, TaskModel.id == DailyTotalModel.task_id
+            )
+
+        rows = ReportQuery.group_by(*columns).order_by(*columns).all()
+
+        return [
+            (*row[:-1], datetime.timedelta(seconds=round(row[-1] / 1000000)))
+            for row in rows
+        ]
+
+    def fetch_from_slots(self, session, request: TReportFetchRequest) -> list:
+        columns = self.columns(
+            request, local_date(SlotModel.fst, request.tz, request.fst, request.lst)
+        )
+
+        elapsed = func.SUM(
+            (func.julianday(SlotModel.lst) - func.julianday(SlotModel.fst)) * 86400
+        )
+
+        # All the sums are done by SQLite, only the totals come back
+        ReportQuery = (
+            session.query(*columns, elapsed)
+            .select_from(SlotModel)
+            .filter(SlotModel.lst != None)
+            .filter(SlotModel.fst >= utc(request.fst), SlotModel.fst < utc(request.lst))
+        )
+
+        if "task" in request.group_by:
+            ReportQuery = ReportQuery.join(TaskModel, SlotModel.task_id == TaskModel.id)
+
+        if "tag" in request.group_by:
+            # Slots of a task without tags add up to a total without a tag
+            ReportQuery = ReportQuery.outerjoin(
+                tags_and_tasks, tags_and_tasks.c.task_id == SlotModel.task_id
+            ).outerjoin(TagModel, TagModel.id == tags_and_tasks.c.tag_id)
+
+        rows = ReportQuery.group_by(*columns).order_by(*columns).all()
+
+        return [
+            (*row[:-1], datetime.timedelta(seconds=round(row[-1])))
+            for row in rows
+        ]
@@ -10,41 +10,40 @@ from src.common.request.fetch.slot_fetch_request import (
     TRaySlotFetchRequest, TRaySlotWithTagFetchRequest)
 from src.common.response.fetch.slot_fetch_response import (
     TRaySlotFetchResponse, TRaySlotWithTagFetchResponse)
+from src.db.cancel import TCancelToken
 from src.db.model import SlotModel, TagModel, TaskModel
 from src.server.repository import TRepository
 
 
 class TSlotRepository(TRepository):
     @logged(logger=logging.getLogger("tslot-data"), disabled=True)
-    def fetch_ray_slot(self, request: TRaySlotFetchRequest):
-        if self.direction == "past_to_future":
+    def fetch_ray_slot(
+        self, request: TRaySlotFetchRequest, token: TCancelToken = None
+    ):
+        if request.direction == "past_to_future":
             key = operator.ge
         else:
             key = operator.le
 
-        if self.dates_dir == "past_to_future":
+        if request.dates_dir == "past_to_future":
             dates_order = func.DATE(SlotModel.fst).asc()
         else:
             dates_order = func.DATE(SlotModel.fst).desc()
 
-        if self.times_dir == "past_to_future":
+        if request.times_dir == "past_to_future":
             times_order = func.TIME(SlotModel.fst).asc()
         else:
             times_order = func.TIME(SlotModel.fst).desc()
 
-        # TODO: the comment below may no longer be relevant/true.
-        # SQLite/SQLAlchemy session must be created and used by the
-        # same thread. Since this object is first created in one
-        # thread and then moved to another one, you must create your
-        # session here (not in constructor, nor anywhere else).
-
-        if self.session is None:
-            self.session = self.create_session()
+        # SQLite/SQLAlchemy session must be created and used by the same
+        # thread. Several threads could be using this repository at the same
+        # time, so the session is local to this call.
+        session = self.create_session(token)
 
         # First, filter out the right number of dates that are either before or
         # after the given date offset. Sort and store these dates to use later.
         DateLimitQuery = (
-            self.session.query(func.DATE(SlotModel.fst).label("fst_date"))
+            session.query(func.DATE(SlotModel.fst).label("fst_date"))
             .filter(key(SlotModel.fst, request.dt_offset))
             .order_by(dates_order)
             .distinct()
@@ -55,7 +54,7 @@ class TSlotRepository(TRepository):
         # Given the right number of dates, filter out all the slots that were
         # recorded on those dates.
         RayDateQuery = (
-            self.session.query(SlotModel, TaskModel)
+            session.query(SlotModel, TaskModel)
             .filter(SlotModel.lst != None)
             .filter(
                 func.DATE(SlotModel.fst) == DateLimitQuery.c.fst_date,
@@ -67,28 +66,31 @@ class TSlotRepository(TRepository):
 
         # Must convert to TEntryModel because once the session is closed, the
         # result of the query will become unreachable.
-        items = [
-            TEntryModel(TSlotModel.from_model(slot), TTaskModel.from_model(task))
-            for (slot, task) in RayDateQuery.all()
-        ]
-
-        self.session.close()
+        try:
+            items = [
+                TEntryModel(TSlotModel.from_model(slot), TTaskModel.from_model(task))
+                for (slot, task) in RayDateQuery.all()
+            ]
+        finally:
+            self.close_session(session, token)
 
-        return TRaySlotFetchResponse.from_request(items, self.request)
+        return TRaySlotFetchResponse.from_request(items, request)
 
     @logged(logger=logging.getLogger("tslot-data"), disabled=True)
-    def fetch_ray_slot_with_tag(self, request: TRaySlotWithTagFetchRequest):
-        if self.direction == "past_to_future":
+    def fetch_ray_slot_with_tag(
+        self, request: TRaySlotWithTagFetchRequest, token: TCancelToken = None
+    ):
+        if request.direction == "past_to_future":
             key = operator.ge
         else:
             key = operator.le
 
-        if self.dates_dir == "past_to_future":
+        if request.dates_dir == "past_to_future":
             dates_order = func.DATE(SlotModel.fst).asc()
         else:
             dates_order = func.DATE(SlotModel.fst).desc()
 
-        if self.times_dir == "past_to_future":
+        if request.times_dir == "past_to_future":
             times_order = func.TIME(SlotModel.fst).asc()
         else:
             times_order = func.TIME(SlotModel.fst).desc()
@@ -96,17 +98,13 @@ class TSlotRepository(TRepository):
         # TODO: maybe order most specific -> least specific tags
         tags_order = TagModel.id.asc()
 
-        # TODO: the comment below may no longer be relevant/true.
-        # SQLite/SQLAlchemy session must be created and used by the
-        # same thread. Since this object is first created in one
-        # thread and then moved to another one, you must create your
-        # session here (not in constructor, nor anywhere else).
-
-        if self.session is None:
-            self.session = self.create_session()
+        # SQLite/SQLAlchemy session must be created and used by the same
+        # thread. Several threads could be using this repository at the same
+        # time, so the session is local to this call.
+        session = self.create_session(token)
 
         DateLimitQuery = (
-            self.session.query(func.DATE(SlotModel.fst).label("fst_date"))
+            session.query(func.DATE(SlotModel.fst).label("fst_date"))
             .filter(SlotModel.lst != None)
             .filter(key(SlotModel.fst, request.dt_offset))
             .order_by(dates_order)
@@ -116,7 +114,7 @@ class TSlotRepository(TRepository):
         )
 
         RayDateQuery = (
-            self.session.query(SlotModel, TaskModel, TagModel)
+            session.query(SlotModel, TaskModel, TagModel)
             .filter(SlotModel.lst != None)
             .filter(
                 func.DATE(SlotModel.fst) == DateLimitQuery.c.fst_date,
@@ -130,15 +128,16 @@ class TSlotRepository(TRepository):
 
         # Must convert to TEntryModel because once the session is closed, the
         # result of the query will become unreachable.
-        items = [
-            TEntryModel(
-                TSlotModel.from_model(slot),
-                TTaskModel.from_model(task),
-                [TTagModel.from_model(tag)],
-            )
-            for (slot, task, tag) in RayDateQuery.all()
-        ]
-
-        self.session.close()
-
-        return TRaySlotWithTagFetchResponse.from_request(items, self.request)
+        try:
+            items = [
+                TEntryModel(
+                    TSlotModel.from_model(slot),
+                    TTaskModel.from_model(task),
+                    [TTagModel.from_model(tag)],
+                )
+                for (slot, task, tag) in RayDateQuery.all()
+            ]
+        finally:
+            self.close_session(session, token)
+
+        return TRaySlotWithTagFetchResponse.from_request(items, request)
@@ -0,0 +1,29 @@
+import logging
+
+from src.common.dto.model import TTagModel
+from src.common.logger import logged
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.common.response.fetch.tag_fetch_response import TTagFetchResponse
+from src.db.cancel import TCancelToken
+from src.db.model import TagModel
+from src.server.repository import TRepository
+
+
+class TTagRepository(TRepository):
+    @logged(logger=logging.getLogger("tslot-data"), disabled=True)
+    def fetch_tags(
+        self, request: TTagFetchRequest, token: TCancelToken = None
+    ) -> TTagFetchResponse:
+        session = self.create_session(token)
+
+        # Must convert to TTagModel because once the session is closed, the
+        # result of the query will become unreachable.
+        try:
+            tags = [
+                TTagModel.from_model(tag)
+                for tag in session.query(TagModel).order_by(TagModel.name)
+            ]
+        finally:
+            self.close_session(session, token)
+
+        return TTagFetchResponse(tags)
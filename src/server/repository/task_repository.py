@@ -0,0 +1,98 @@
+import logging
+
+from sqlalchemy import text
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.logger import logged
+from src.common.request.fetch.task_fetch_request import TTaskSearchFetchRequest
+from src.common.response.fetch.task_fetch_response import TTaskSearchFetchResponse
+from src.db.cancel import TCancelToken
+from src.db.model import SlotModel
+from src.server.repository import TRepository
+
+
+# FTS5 has no mapping in SQLAlchemy, so the search is plain SQL. A smaller
+# bm25 is a better match. Pages are keyset-paged on the order of results:
+# a page starts right after the (rank, fst, id) of the last slot before it.
+SEARCH_QUERY = text(
+    """
+    SELECT slot.id AS id, matches.rank AS rank, slot.fst AS fst
+    FROM (
+        SELECT rowid AS task_id, bm25(task_fts) AS rank
+        FROM task_fts
+        WHERE task_fts MATCH :match
+    ) AS matches
+    JOIN slot ON slot.task_id = matches.task_id
+    WHERE slot.lst IS NOT NULL AND (
+        :rank IS NULL
+        OR matches.rank > :rank
+        OR matches.rank = :rank AND (
+            slot.fst < :fst OR slot.fst = :fst AND slot.id < :id
+        )
+    )
+    ORDER BY matches.rank, slot.fst DESC, slot.id DESC
+    LIMIT :limit
+    """
+)
+
+
+def match_query(words: str) -> str:
+    """Return the FTS5 query that finds all the words, each as a prefix"""
+
+    # Quoted, the words never read as FTS5 syntax (e.g. AND, NEAR, column:)
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words.split())
+
+
+class TTaskRepository(TRepository):
+    @logged(logger=logging.getLogger("tslot-data"), disabled=True)
+    def search_tasks(
+        self, request: TTaskSearchFetchRequest, token: TCancelToken = None
+    ) -> TTaskSearchFetchResponse:
+        match = match_query(request.text)
+
+        if not match:
+            return TTaskSearchFetchResponse([])
+
+        rank, fst, id = request.after or (None, None, None)
+
+        session = self.create_session(token)
+
+        # Must convert to TEntryModel because once the session is closed, the
+        # result of the query will become unreachable.
+        try:
+            # One more than asked, to know if there is another page
+            rows = session.execute(
+                SEARCH_QUERY,
+                {
+                    "match": match,
+                    "rank": rank,
+                    "fst": fst,
+                    "id": id,
+                    "limit": request.limit + 1,
+                },
+            ).fetchall()
+
+            ids = [row.id for row in rows[:request.limit]]
+
+            slots = {
+                slot.id: slot
+                for slot in session.query(SlotModel).filter(SlotModel.id.in_(ids))
+            }
+
+            items = [
+                TEntryModel(
+                    slot=TSlotModel.from_model(slots[id]),
+                    task=TTaskModel.from_model(slots[id].task),
+                    tags=[TTagModel.from_model(tag) for tag in slots[id].task.tags],
+                )
+                for id in ids
+            ]
+        finally:
+            self.close_session(session, token)
+
+        if len(rows) > request.limit:
+            last = rows[request.limit - 1]
+
+            return TTaskSearchFetchResponse(items, (last.rank, last.fst, last.id))
+
+        return TTaskSearchFetchResponse(items)
@@ -0,0 +1,118 @@
+import logging
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.failure import TFailure
+from src.common.logger import logged, logdata
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from src.db.cancel import TCancelToken
+from src.db.model import SlotModel, TagModel, TaskModel
+from src.db.rollup import TDailyTotals
+from src.server.repository import TRepository
+
+
+class TTimerRepository(TRepository):
+    @logged(logger=logging.getLogger("tslot-data"), disabled=True)
+    def fetch_timer(
+        self, request: TTimerFetchRequest, token: TCancelToken = None
+    ) -> TTimerFetchResponse:
+        session = self.create_session(token)
+
+        # Must convert to TEntryModel because once the session is closed, the
+        # result of the query will become unreachable.
+        try:
+            timers = [
+                TEntryModel(
+                    slot=TSlotModel.from_model(slot),
+                    task=TTaskModel.from_model(slot.task),
+                    tags=[TTagModel.from_model(tag) for tag in slot.task.tags],
+                )
+                for slot in session.query(SlotModel).filter(SlotModel.lst == None)
+            ]
+        finally:
+            self.close_session(session, token)
+
+        if len(timers) > 1:
+            logdata.warning(f"Found too many active timers: {timers}")
+
+            raise TFailure("There should be 0 or 1 active timer")
+
+        return TTimerFetchResponse(timers[0] if timers else None)
+
+    @logged(logger=logging.getLogger("tslot-data"), disabled=True)
+    def stash_timer(
+        self, request: TTimerStashRequest, token: TCancelToken = None
+    ) -> TTimerStashResponse:
+        session = self.create_session(token)
+
+        tdata = request.tdata
+
+        try:
+            # If the id has been provided, then update the value. If there is
+            # no id, then create a brand new instance with the provided value.
+            if tdata.slot.id is not None:
+                slot = session.query(SlotModel).get(tdata.slot.id)
+            else:
+                slot = SlotModel()
+
+                session.add(slot)
+
+            if slot is None:
+                raise TFailure(f"Could not fetch slot {tdata.slot.id}")
+
+            # The totals change in the same transaction as the slot
+            rollup = TDailyTotals(session)
+            rollup.remove(slot, slot.task)
+
+            slot.fst = tdata.slot.fst
+            slot.lst = tdata.slot.lst
+
+            if tdata.task.id is not None:
+                task = session.query(TaskModel).get(tdata.task.id)
+            else:
+                task = TaskModel()
+
+                session.add(task)
+
+            if task is None:
+                raise TFailure(f"Could not fetch task {tdata.task.id}")
+
+            task.name = tdata.task.name
+
+            old_tag_ids = [tag.id for tag in task.tags]
+
+            # Tags without an id are brand new, the others already exist
+            new_tags = [TagModel(name=tag.name) for tag in tdata.tags if tag.id is None]
+
+            old_tags = (
+                session.query(TagModel)
+                .filter(TagModel.id.in_([tag.id for tag in tdata.tags if tag.id]))
+                .all()
+            )
+
+            slot.task = task
+            task.tags = new_tags + old_tags
+
+            # The new slot, task and tags need their ids for the totals
+            session.flush()
+
+            rollup.retag(task, old_tag_ids)
+            rollup.add(slot, task)
+
+            session.commit()
+
+            timer = TEntryModel(
+                slot=TSlotModel.from_model(slot),
+                task=TTaskModel.from_model(task),
+                tags=[TTagModel.from_model(tag) for tag in task.tags],
+            )
+        except Exception:
+            session.rollback()
+
+            raise
+        finally:
+            self.close_session(session, token)
+
+        return TTimerStashResponse(timer)
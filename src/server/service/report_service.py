@@ -0,0 +1,13 @@
+from pathlib import Path
+
+from src.common.request.fetch.report_fetch_request import TReportFetchRequest
+from src.db.cancel import TCancelToken
+from src.server.repository.report_repository import TReportRepository
+
+
+class TReportService:
+    def __init__(self, path: Path = None):
+        self.repository = TReportRepository(path)
+
+    def fetch_report(self, request: TReportFetchRequest, token: TCancelToken = None):
+        return self.repository.fetch_report(request, token)
@@ -0,0 +1,13 @@
+from pathlib import Path
+
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.db.cancel import TCancelToken
+from src.server.repository.tag_repository import TTagRepository
+
+
+class TTagService:
+    def __init__(self, path: Path = None):
+        self.repository = TTagRepository(path)
+
+    def fetch_tags(self, request: TTagFetchRequest, token: TCancelToken = None):
+        return self.repository.fetch_tags(request, token)
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from src.common.request.fetch.task_fetch_request import TTaskSearchFetchRequest
+from src.db.cancel import TCancelToken
+from src.server.repository.task_repository import TTaskRepository
+
+
+class TTaskService:
+    def __init__(self, path: Path = None):
+        self.repository = TTaskRepository(path)
+
+    def search_tasks(
+        self, request: TTaskSearchFetchRequest, token: TCancelToken = None
+    ):
+        return self.repository.search_tasks(request, token)
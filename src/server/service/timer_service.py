@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.db.cancel import TCancelToken
+from src.server.repository.timer_repository import TTimerRepository
+
+
+class TTimerService:
+    def __init__(self, path: Path = None):
+        self.repository = TTimerRepository(path)
+
+    def fetch_timer(self, request: TTimerFetchRequest, token: TCancelToken = None):
+        return self.repository.fetch_timer(request, token)
+
+    def stash_timer(self, request: TTimerStashRequest, token: TCancelToken = None):
+        return self.repository.stash_timer(request, token)
@@ -0,0 +1,230 @@
+import os
+import signal
+import socket
+from pathlib import Path
+from threading import Event
+from threading import Lock
+from threading import Thread
+from threading import Timer
+
+from src.common.connection import TConnection
+from src.common.failure import TFailure
+from src.common.logger import logdata
+from src.common.metrics import metrics
+from src.server import Server
+
+
+class TSocketServer(Server):
+    """
+    Serve any number of clients that connect to a Unix domain socket
+
+    All clients share the same dispatcher, repositories and database, so a
+    GUI, a report tool and an importer could all talk to one warm server.
+    Every connection is read on its own thread and each response is sent back
+    only to the client that made the request. Once a client disconnects, its
+    unfinished requests are cancelled. Request groups are per connection: a
+    client could only cancel or supersede its own requests.
+
+    :param address: the path to the Unix domain socket to listen on
+    :param path: the path to the SQLite database
+    :param capacity: the maximum number of pending requests, None is unbounded
+    :param policy: what to do when there are too many pending requests
+    :param idle_timeout: stop after this many seconds without any clients,
+                         None to serve forever
+    """
+
+    def __init__(
+        self,
+        address: Path,
+        path: Path = None,
+        capacity: int = None,
+        policy: str = "block",
+        idle_timeout: float = None,
+    ):
+        super().__init__(None, None, path=path, capacity=capacity, policy=policy)
+
+        self.address = Path(address)
+        self.idle_timeout = idle_timeout
+        self.idle_timer = None
+
+        self.lock = Lock()
+        self.connections = set()
+
+        self.listening = Event()
+        self.stopped = Event()
+
+        self.sock = None
+
+    def bind(self) -> None:
+        """Listen on the address, take over a socket that nobody listens on"""
+
+        if self.address.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+            try:
+                probe.connect(str(self.address))
+            except ConnectionRefusedError:
+                logdata.info(f"Remove stale socket {self.address}")
+
+                self.address.unlink()
+            else:
+                raise RuntimeError(f"Another server listens on {self.address}")
+            finally:
+                probe.close()
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Only the user that runs the server may talk to it. Messages are
+        # pickled, so the socket must never be reachable by others, not even
+        # for a moment between `bind` and `chmod`
+        umask = os.umask(0o077)
+
+        try:
+            self.sock.bind(str(self.address))
+        finally:
+            os.umask(umask)
+
+        self.sock.listen()
+
+        self.listening.set()
+
+    def start(self):
+        self.repository.prepare()
+
+        self.bind()
+
+        logdata.info(f"Listen on {self.address}")
+
+        self.watch_idle()
+
+        while not self.stopped.is_set():
+            try:
+                sock, _ = self.sock.accept()
+            except OSError:
+                break  # the listening socket was closed by `stop`
+
+            connection = TConnection(sock, name="server")
+
+            with self.lock:
+                self.connections.add(connection)
+
+                if self.idle_timer is not None:
+                    self.idle_timer.cancel()
+
+            metrics.gauge("server.connections", len(self.connections))
+
+            Thread(
+                target=self.serve,
+                args=(connection,),
+                name="tslot-connection",
+                daemon=True,
+            ).start()
+
+        self.dispatcher.stop()
+
+    def serve(self, connection: TConnection) -> None:
+        """Handle the requests of one client until it disconnects"""
+
+        while not self.stopped.is_set():
+            try:
+                request = connection.get()
+            except EOFError:
+                break
+
+            if request is None:
+                break  # the client asked to disconnect
+
+            self.handle(request, connection.put)
+
+        self.dispatcher.cancel_respond(connection.put)
+        self.prefetcher.forget(connection.put)
+
+        connection.close()
+
+        with self.lock:
+            self.connections.discard(connection)
+
+        metrics.gauge("server.connections", len(self.connections))
+
+        self.watch_idle()
+
+    def watch_idle(self) -> None:
+        """Stop the server if no client connects for `idle_timeout` seconds"""
+
+        if self.idle_timeout is None:
+            return
+
+        with self.lock:
+            if self.connections or self.stopped.is_set():
+                return
+
+            if self.idle_timer is not None:
+                self.idle_timer.cancel()
+
+            self.idle_timer = Timer(self.idle_timeout, self.stop_if_idle)
+            self.idle_timer.daemon = True
+            self.idle_timer.start()
+
+    def stop_if_idle(self) -> None:
+        with self.lock:
+            if self.connections:
+                return
+
+        logdata.info(f"No clients for {self.idle_timeout}s, stop serving")
+
+        self.stop()
+
+    def handle_success(self, response):
+        raise TFailure("Socket server responds only to a particular connection")
+
+    def stop(self) -> None:
+        """Stop accepting clients and disconnect the connected ones"""
+
+        if self.stopped.is_set():
+            return
+
+        self.stopped.set()
+
+        with self.lock:
+            if self.idle_timer is not None:
+                self.idle_timer.cancel()
+
+        # Remove the socket first: once `start` returns, it must be gone and
+        # new clients must not find a server that is going away
+        if self.listening.is_set() and self.address.exists():
+            self.address.unlink()
+
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # not connected, accept still wakes up on close
+
+            self.sock.close()
+
+        with self.lock:
+            connections = list(self.connections)
+
+        for connection in connections:
+            connection.close()
+
+
+def socket_server(
+    address: Path,
+    capacity: int = None,
+    policy: str = "block",
+    idle_timeout: float = None,
+):
+    server = TSocketServer(
+        address, capacity=capacity, policy=policy, idle_timeout=idle_timeout
+    )
+
+    def stop_on_signal(number, stack_frame):
+        server.stop()
+
+    # A detached server has no console, so SIGTERM/SIGHUP are the way to stop
+    # it. Stopping also removes the socket, so that it is not left behind
+    signal.signal(signal.SIGTERM, stop_on_signal)
+    signal.signal(signal.SIGHUP, stop_on_signal)
+
+    return server.start()
@@ -0,0 +1,54 @@
+from src.client.common.widget.label.animated_label import TAnimatedLabel
+from src.client.common.widget.label.animated_label import TAnimationDriver
+
+
+def test_animated_label_0(qtbot):
+    """Labels share one driver, reuse their fades and drop the effect after"""
+
+    labels = [TAnimatedLabel(), TAnimatedLabel()]
+
+    for label in labels:
+        qtbot.addWidget(label)
+        label.base_animation_duration = 50
+
+    driver = TAnimationDriver()
+    effect = labels[0].opacity_effect
+
+    for _ in range(3):
+        with qtbot.waitSignal(labels[0].enter_animation_played):
+            for label in labels:
+                label.show()
+
+            assert driver.timer.isActive()
+            assert effect.isEnabled()
+
+        with qtbot.waitSignal(labels[0].leave_animation_played):
+            for label in labels:
+                label.hide()
+
+    qtbot.waitUntil(lambda: not driver.fades)
+
+    assert not driver.timer.isActive()
+    assert labels[0].opacity_effect is effect
+    assert labels[0].graphicsEffect() is effect
+    assert not effect.isEnabled()
+
+
+def test_animated_label_1(qtbot):
+    """Showing again in the middle of leaving plays the enter fade instead"""
+
+    label = TAnimatedLabel()
+    qtbot.addWidget(label)
+
+    label.base_animation_duration = 10000
+
+    label.show()
+    label.hide()
+    label.show()
+
+    driver = TAnimationDriver()
+
+    assert label.enter_animation in driver.fades
+    assert label.leave_animation not in driver.fades
+
+    driver.stop(label.enter_animation)
@@ -0,0 +1,49 @@
+from src.client.broker import TServerBroker
+from src.common.channel import TChannel
+from src.common.metrics import metrics
+from src.common.request.batch import TBatchRequest
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.response import TResponse
+from src.common.response.batch import TBatchResponse
+from src.common.response.fetch.metrics_fetch_response import TMetricsFetchResponse
+
+
+def test_server_broker_0():
+    """Metrics of the server arrive together with the metrics of the client"""
+
+    metrics.reset()
+    metrics.increment("requests.rejected")
+
+    broker = TServerBroker(TChannel("responses"), TChannel("requests"))
+
+    responses = []
+    broker.responded.connect(responses.append)
+
+    broker.handle_received(TMetricsFetchResponse({"counters": {}}))
+
+    assert responses[0].metrics == {"counters": {}}
+    assert responses[0].client_metrics["counters"]["requests.rejected"] == 1
+
+
+def test_server_broker_1():
+    """Requests made within a batch are sent at once, answered one by one"""
+
+    requests = TChannel("requests")
+
+    broker = TServerBroker(TChannel("responses"), requests)
+
+    with broker.batch():
+        broker.handle_requested(TTimerFetchRequest())
+        broker.handle_requested(TTimerFetchRequest())
+
+    batch = requests.get(timeout=5)
+
+    assert isinstance(batch, TBatchRequest)
+    assert len(batch.requests) == 2
+
+    responses = []
+    broker.responded.connect(responses.append)
+
+    broker.handle_received(TBatchResponse([TResponse(), TResponse()]))
+
+    assert len(responses) == 2
@@ -0,0 +1,102 @@
+import pendulum
+
+from src.client.cache import TCacheBroker
+from src.common.dto.model import TEntryModel, TSlotModel, TTaskModel
+from src.common.request.cancel import TCancelRequest
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.common.response.fetch.slot_fetch_response import TRaySlotFetchResponse
+
+
+DT_OFFSET = pendulum.datetime(2021, 1, 31, tz="UTC")
+
+
+def make_response(request):
+    """Answer with one entry per day, the i-th day is i days before offset"""
+
+    items = [
+        TEntryModel(
+            TSlotModel(DT_OFFSET.subtract(days=index + 1)), TTaskModel(f"{index}")
+        )
+        for index in range(request.slice_fst, request.slice_lst)
+    ]
+
+    response = TRaySlotFetchResponse.from_request(items, request)
+    response.request_id = request.id
+
+    return response
+
+
+def connect(cache):
+    sent, received = [], []
+
+    cache.requested.connect(sent.append)
+    cache.responded.connect(received.append)
+
+    return sent, received
+
+
+def test_cache_broker_0():
+    """Known days are answered from memory, only missing days are fetched"""
+
+    cache = TCacheBroker()
+    sent, received = connect(cache)
+
+    request = TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=0, slice_lst=2)
+    cache.handle_requested(request)
+
+    cache.handle_responded(make_response(sent[-1]))
+
+    assert received[-1].request_id == request.id
+    assert [item.task.name for item in received[-1].items] == ["0", "1"]
+
+    request = TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=1, slice_lst=4)
+    cache.handle_requested(request)
+
+    assert (sent[-1].slice_fst, sent[-1].slice_lst) == (2, 4)
+
+    cache.handle_responded(make_response(sent[-1]))
+
+    assert received[-1].request_id == request.id
+    assert [item.task.name for item in received[-1].items] == ["1", "2", "3"]
+
+    request = TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=0, slice_lst=4)
+    cache.handle_requested(request)
+
+    assert len(sent) == 2
+    assert received[-1].request_id == request.id
+    assert len(received[-1].items) == 4
+
+
+def test_cache_broker_1():
+    """The least recently used days are evicted"""
+
+    cache = TCacheBroker(capacity=2)
+    sent, received = connect(cache)
+
+    cache.handle_requested(
+        TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=0, slice_lst=3)
+    )
+    cache.handle_responded(make_response(sent[-1]))
+
+    assert cache.size == 2
+
+    cache.handle_requested(
+        TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=0, slice_lst=1)
+    )
+
+    assert (sent[-1].slice_fst, sent[-1].slice_lst) == (0, 1)
+
+
+def test_cache_broker_2():
+    """Cancelling a request cancels the request sent in its place"""
+
+    cache = TCacheBroker()
+    sent, received = connect(cache)
+
+    request = TRaySlotFetchRequest(dt_offset=DT_OFFSET, slice_fst=0, slice_lst=1)
+    cache.handle_requested(request)
+
+    cache.handle_requested(TCancelRequest(ids=[request.id]))
+
+    assert sent[-1].ids == [sent[0].id]
+    assert not cache.forwarded
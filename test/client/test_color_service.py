@@ -0,0 +1,43 @@
+from src.client.srv_color.service.color import TColorService
+
+
+def test_color_service_0(qtbot):
+    """Within a batch, each signal fires once, when the batch ends"""
+
+    service = TColorService()
+
+    emitted = []
+    slots = {
+        service.fg_color_fst_lgt_changed: lambda: emitted.append("fg"),
+        service.bg_color_fst_lgt_changed: lambda: emitted.append("bg"),
+        service.colors_changed: lambda: emitted.append("colors"),
+    }
+
+    for signal, slot in slots.items():
+        signal.connect(slot)
+
+    fg_color, bg_color = service.fg_color_fst_lgt, service.bg_color_fst_lgt
+
+    try:
+        with service.batch():
+            service.fg_color_fst_lgt = "#000001"
+            service.bg_color_fst_lgt = "#000002"
+
+            with service.batch():
+                service.fg_color_fst_lgt = "#000003"
+
+            assert emitted == []
+
+        assert emitted == ["fg", "bg", "colors"]
+        assert service.fg_color_fst_lgt == "#000003"
+
+        service.fg_color_fst_lgt = "#000004"
+
+        assert emitted[3:] == ["fg", "colors"]
+    finally:
+        for signal, slot in slots.items():
+            signal.disconnect(slot)
+
+        with service.batch():
+            service.fg_color_fst_lgt = fg_color
+            service.bg_color_fst_lgt = bg_color
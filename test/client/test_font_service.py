@@ -0,0 +1,114 @@
+import shutil
+import time
+from pathlib import Path
+from threading import Thread
+
+from PyQt5.QtGui import QFontDatabase
+
+from src.client.srv_font.service.font import TFontManifest
+from src.client.srv_font.service.font import TFontService
+
+
+def test_font_service_0(qtbot):
+    """Within a batch, a font is built once however many settings change"""
+
+    service = TFontService()
+
+    emitted = []
+    slots = {
+        service.font_serif_changed: lambda: emitted.append("serif"),
+        service.base_height_changed: lambda: emitted.append("height"),
+    }
+
+    for signal, slot in slots.items():
+        signal.connect(slot)
+
+    name, size, height = (
+        service.font_serif_name, service.font_serif_size, service.base_height
+    )
+
+    try:
+        with service.batch():
+            service.font_serif_name = "Monospace"
+            service.font_serif_size = 17
+            service.base_height = 40
+            service.base_height = 41
+
+            assert emitted == []
+
+        assert emitted == ["serif", "height"]
+        assert service.font_serif.pointSize() == 17
+
+        service.font_serif_size = 18
+
+        assert emitted[2:] == ["serif"]
+    finally:
+        for signal, slot in slots.items():
+            signal.disconnect(slot)
+
+        with service.batch():
+            service.font_serif_name = name
+            service.font_serif_size = size
+            service.base_height = height
+
+
+def test_font_service_1(qtbot, tmp_path):
+    """An up to date manifest finds the fonts of a family without a scan"""
+
+    asset = Path(TFontService().default_font_path(), "quicksand")
+
+    root = tmp_path / "asset"
+    shutil.copytree(asset, root / "quicksand")
+
+    manifest = TFontManifest(root, tmp_path / "fonts.json")
+
+    assert not manifest.load()
+
+    manifest.scan(QFontDatabase())
+    manifest.save()
+
+    assert len(manifest.fonts) == 4
+    assert manifest.fonts["quicksand/Quicksand-Bold.ttf"]["families"] == ["Quicksand"]
+
+    loaded = TFontManifest(root, tmp_path / "fonts.json")
+
+    assert loaded.load()
+    assert loaded.add_families(QFontDatabase(), ["Inconsolata"]) == 0
+    assert loaded.add_families(QFontDatabase(), ["Quick"]) == 4
+    assert loaded.add_families(QFontDatabase(), ["Quicksand"]) == 0
+
+    # A new file changes the mtime of its folder
+    time.sleep(0.01)
+    shutil.copy(asset / "Quicksand-Bold.ttf", root / "Quicksand-Copy.ttf")
+
+    assert not TFontManifest(root, tmp_path / "fonts.json").load()
+
+
+def test_font_service_2(qtbot, tmp_path):
+    """Threads that add the same families add every file once between them"""
+
+    asset = Path(TFontService().default_font_path(), "quicksand")
+
+    root = tmp_path / "asset"
+    shutil.copytree(asset, root / "quicksand")
+
+    manifest = TFontManifest(root, tmp_path / "fonts.json")
+    manifest.scan(QFontDatabase())
+    manifest.added.clear()
+
+    counts = []
+
+    threads = [
+        Thread(target=lambda: counts.append(
+            manifest.add_families(QFontDatabase(), ["Quicksand"])
+        ))
+        for _ in range(4)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(counts) == 4
+    assert len(manifest.added) == 4
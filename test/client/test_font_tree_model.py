@@ -0,0 +1,40 @@
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtGui import QFontDatabase
+
+from src.client.srv_font.model.font_tree_model import TFontTreeModel
+
+
+def test_font_tree_model_0(qtbot):
+    """Families arrive in chunks, their styles once a family is expanded"""
+
+    families = QFontDatabase().families()
+
+    model = TFontTreeModel(chunk=2)
+    model.load()
+
+    qtbot.waitUntil(lambda: model.rowCount() == len(families))
+
+    assert model.families == families
+
+    family = model.index(0, 0)
+
+    assert model.hasChildren(family)
+    assert model.canFetchMore(family)
+    assert model.rowCount(family) == 0
+
+    model.fetchMore(family)
+
+    styles = QFontDatabase().styles(families[0])
+
+    assert not model.canFetchMore(family)
+    assert model.rowCount(family) == len(styles)
+
+    if styles:
+        style = model.index(0, 0, family)
+
+        assert model.parent(style) == family
+        assert model.data(style) == styles[0]
+        assert not model.hasChildren(style)
+
+    assert not model.parent(family).isValid()
+    assert not model.canFetchMore(QModelIndex())
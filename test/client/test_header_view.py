@@ -0,0 +1,55 @@
+from PyQt5.QtGui import QFont, QFontMetrics
+from PyQt5.QtWidgets import QHeaderView
+
+from src.client.wgt_timer_table.model.table_model import TTableModel
+from src.client.wgt_timer_table.widget.header_view import FIXED_COLUMNS
+from src.client.wgt_timer_table.widget.header_view import fixed_widths
+from src.client.wgt_timer_table.widget.home_table_view import THomeTableView
+from test.client.test_table_model import make_entry
+
+
+def test_header_view_0(qtbot):
+    """Time columns get fixed widths from the font, not from their cells"""
+
+    view = THomeTableView()
+    qtbot.addWidget(view)
+
+    view.setModel(TTableModel([make_entry(hour, hour) for hour in range(1, 4)]))
+
+    header = view.horizontalHeader()
+    widths = fixed_widths(header.font())
+
+    for column, width in zip(FIXED_COLUMNS, widths):
+        assert header.sectionResizeMode(column) == QHeaderView.Fixed
+        assert header.sectionSize(column) == width
+
+    assert widths[0] > QFontMetrics(header.font()).horizontalAdvance("23:59:59")
+
+    # All the tables share the widths, computed once per font
+    assert fixed_widths(QFont(header.font())) is widths
+
+    font = QFont(header.font())
+    font.setPointSize(font.pointSize() * 2)
+    view.setFont(font)
+
+    assert header.sectionSize(FIXED_COLUMNS[0]) == fixed_widths(font)[0]
+    assert fixed_widths(font)[0] > widths[0]
+
+    assert view.sizeHint().height() == 3 * view.verticalHeader().defaultSectionSize()
+
+
+def test_header_view_1(qtbot):
+    """A reused view keeps its header and applies the modes to every model"""
+
+    view = THomeTableView()
+    qtbot.addWidget(view)
+
+    header = view.horizontalHeader()
+
+    for hours in [range(1, 4), range(0), range(4, 6)]:
+        view.setModel(TTableModel([make_entry(hour, hour) for hour in hours]))
+
+        assert view.horizontalHeader() is header
+
+    assert header.sectionResizeMode(0) == QHeaderView.Stretch
+    assert header.sectionResizeMode(FIXED_COLUMNS[0]) == QHeaderView.Fixed
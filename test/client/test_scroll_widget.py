@@ -0,0 +1,101 @@
+import pendulum
+
+from src.client.wgt_timer_table.widget.scroll_widget import TScrollWidget
+from src.common.dto.model import TEntryModel, TSlotModel
+from src.common.response.fetch.slot_fetch_response import TRaySlotWithTagFetchResponse
+
+
+def test_scroll_widget_0(qtbot):
+    """Reversing the direction supersedes the requests in flight"""
+
+    widget = TScrollWidget()
+    qtbot.addWidget(widget)
+
+    requests = []
+    widget.requested.connect(requests.append)
+
+    widget.kickstart()
+    widget.reverse()
+
+    assert len(requests) == 2
+    assert not requests[0].supersede
+    assert requests[1].supersede
+    assert requests[1].group == requests[0].group == TScrollWidget.GROUP
+    assert requests[1].direction == "past_to_future"
+
+    assert widget.pending == {requests[1].id}
+
+    # The response to the first request comes late and is dropped
+    response = TRaySlotWithTagFetchResponse(
+        items=[],
+        dt_offset=requests[0].dt_offset,
+        direction=requests[0].direction,
+        dates_dir=requests[0].dates_dir,
+        times_dir=requests[0].times_dir,
+        flat_tags=False,
+        slice_fst=0,
+        slice_lst=1,
+    )
+    response.request_id = requests[0].id
+
+    assert widget.is_stale(response)
+
+
+def make_response(request, entries: int = 4):
+    """Answer the request with a few entries of one day"""
+
+    day = pendulum.datetime(2021, 1, 31, tz="UTC").subtract(days=request.slice_fst)
+
+    items = [
+        TEntryModel(TSlotModel(day.add(hours=hour), day.add(hours=hour + 1)))
+        for hour in range(entries)
+    ]
+
+    response = TRaySlotWithTagFetchResponse.from_request(items, request)
+    response.request_id = request.id
+
+    return response
+
+
+def test_scroll_widget_1(qtbot):
+    """Views far from the viewport are pooled and their days requested back"""
+
+    widget = TScrollWidget(window=1, pool_size=2)
+    qtbot.addWidget(widget)
+
+    requests, shifts = [], []
+    widget.requested.connect(requests.append)
+    widget.shifted.connect(shifts.append)
+
+    widget.kickstart()
+
+    for _ in range(10):
+        widget.handle_responded(make_response(requests[-1]))
+        widget.request_next()
+
+    widget.pending.clear()
+
+    extent = widget.extent(widget.views[0])
+
+    assert len(widget.views) == 10
+
+    # Look at the days 6 and 7, keep one viewport of days on either side
+    widget.handle_scrolled(6 * extent, 8 * extent)
+
+    assert len(widget.views) == 7
+    assert (widget.slice_fst, widget.slice_lst) == (3, 10)
+    assert shifts == [-3 * extent]
+    assert len(widget.pool) == 2
+
+    # Scroll back to the top of what is left, the day before is requested
+    widget.handle_scrolled(0, 2 * extent)
+
+    assert (widget.slice_fst, widget.slice_lst) == (3, 8)
+    assert (requests[-1].slice_fst, requests[-1].slice_lst) == (2, 3)
+
+    widget.handle_responded(make_response(requests[-1]))
+
+    assert widget.slice_fst == 2
+    assert len(widget.views) == 6
+    assert shifts[-1] == extent
+    assert widget.views[0].model().items[0].slot.fst.day == 29
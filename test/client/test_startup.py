@@ -0,0 +1,158 @@
+import json
+import pickle
+
+import pendulum
+
+from src.client.startup import TStartupSnapshot
+from src.client.wgt_timer.widget.timer_controls import TTimerControlsWidget
+from src.client.wgt_timer_table.widget.timeline_view import TTimelineView
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.request.fetch.slot_fetch_request import TRaySlotWithTagFetchRequest
+from src.common.response.fetch.slot_fetch_response import TRaySlotWithTagFetchResponse
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+
+
+DT_OFFSET = pendulum.datetime(2021, 1, 31, tz="UTC")
+
+
+def make_response(request, name: str, days: int = 1):
+    items = [
+        TEntryModel(
+            TSlotModel(
+                DT_OFFSET.subtract(days=day + 1, hours=2),
+                DT_OFFSET.subtract(days=day + 1, hours=1),
+                id=day + 1,
+            ),
+            TTaskModel(name),
+        )
+        for day in range(days)
+    ]
+
+    response = TRaySlotWithTagFetchResponse.from_request(items, request)
+    response.request_id = request.id
+
+    return response
+
+
+def test_startup_0(tmp_path):
+    """The first pages of history and the running timer survive a relaunch"""
+
+    path = tmp_path / "tslot.snapshot"
+    snapshot = TStartupSnapshot(path, pages=2)
+
+    request = TRaySlotWithTagFetchRequest(DT_OFFSET, slice_fst=0, slice_lst=1)
+
+    snapshot.record(make_response(request, "first"))
+
+    for fst in (1, 2):
+        request.slice_fst, request.slice_lst = fst, fst + 1
+        snapshot.record(make_response(request, "next"))
+
+    timer = TEntryModel(TSlotModel(DT_OFFSET, id=7), TTaskModel("timer"))
+
+    snapshot.record(TTimerFetchResponse(None))
+    snapshot.record(TTimerStashResponse(timer))
+
+    snapshot.save()
+
+    loaded = TStartupSnapshot(path)
+
+    assert loaded.load()
+    assert [response.slice_fst for response in loaded.days] == [0, 1]
+    assert loaded.timer.slot.id == 7
+
+    path.write_bytes(b"not a snapshot")
+
+    assert not TStartupSnapshot(path).load()
+    assert not TStartupSnapshot(tmp_path / "missing").load()
+
+
+def test_startup_1(qtbot):
+    """The days of the snapshot give way to the days of the first response"""
+
+    view = TTimelineView()
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    request = TRaySlotWithTagFetchRequest(view.dt_offset, slice_fst=0, slice_lst=2)
+
+    view.show_snapshot(make_response(request, "old", days=2))
+
+    assert view.provisional
+    assert view.timeline.rowCount() == 2
+    assert not requests  # the days of the snapshot do not count as loaded
+
+    view.kickstart()
+    view.handle_responded(make_response(requests[0], "new"))
+
+    assert not view.provisional
+    assert view.timeline.rowCount() == 1
+    assert view.timeline.data(view.timeline.index(0, 0, view.timeline.index(0, 0))) == "new"
+
+
+def test_startup_2(qtbot):
+    """The timer of the snapshot keeps running only if the server has it too"""
+
+    widget = TTimerControlsWidget()
+    qtbot.addWidget(widget)
+
+    fst = pendulum.now(tz="UTC").subtract(minutes=5)
+
+    widget.show_snapshot(TEntryModel(TSlotModel(fst, id=1), TTaskModel("old")))
+
+    assert widget.timer_wgt.isActive()
+    assert not widget.push_btn.isEnabled()
+
+    renamed = TEntryModel(TSlotModel(fst, id=1), TTaskModel("renamed"))
+    widget.handle_responded(TTimerFetchResponse(renamed))
+
+    assert widget.timer_wgt.isActive()
+    assert widget.push_btn.isEnabled()
+    assert widget.item is renamed
+    assert widget.task_ldt.text() == "renamed"
+
+    other = TTimerControlsWidget()
+    qtbot.addWidget(other)
+
+    other.show_snapshot(TEntryModel(TSlotModel(fst, id=1), TTaskModel("old")))
+    other.handle_responded(TTimerFetchResponse(None))
+
+    assert not other.timer_wgt.isActive()
+    assert other.item is None
+
+
+def test_startup_3(tmp_path):
+    """The snapshot is JSON: entries come back whole, pickles are ignored"""
+
+    path = tmp_path / "tslot.snapshot"
+    snapshot = TStartupSnapshot(path)
+
+    request = TRaySlotWithTagFetchRequest(DT_OFFSET, slice_fst=0, slice_lst=1)
+
+    response = make_response(request, "tagged")
+    response.items[0].tags = [TTagModel("work", 1), TTagModel("deep", 2)]
+
+    snapshot.record(response)
+    snapshot.save()
+
+    json.loads(path.read_text())
+
+    loaded = TStartupSnapshot(path)
+
+    assert loaded.load()
+    assert loaded.timer is None
+
+    item, = loaded.days[0].items
+
+    assert item.slot == response.items[0].slot
+    assert item.task == response.items[0].task
+    assert item.tags == response.items[0].tags
+    assert loaded.days[0].dt_offset == DT_OFFSET
+    assert loaded.days[0].direction == response.direction
+
+    path.write_bytes(pickle.dumps({"version": TStartupSnapshot.VERSION}))
+
+    assert not TStartupSnapshot(path).load()
@@ -0,0 +1,90 @@
+from PyQt5.QtWidgets import QApplication
+
+from src.client.common.widget.label.color_aware_label import TFailureColorAwareLabel
+from src.client.common.widget.label.color_aware_label import TPrimaryColorAwareLabel
+from src.client.common.widget.label.styled_label import FailureLabel
+from src.client.srv_color.service.color import TColorService
+from src.client.srv_color.service.style_sheet import TStyleSheetService
+
+
+class TRenamedLabel(TPrimaryColorAwareLabel):
+
+    role = "failure"
+
+
+def test_style_sheet_0(qtbot):
+    """Widgets carry no stylesheets, the application has one rule per class"""
+
+    labels = [TPrimaryColorAwareLabel(), TPrimaryColorAwareLabel(), TRenamedLabel()]
+
+    for label in labels:
+        qtbot.addWidget(label)
+        assert label.styleSheet() == ""
+
+    service = TStyleSheetService()
+    service.apply()
+
+    style_sheet = QApplication.instance().styleSheet()
+
+    assert style_sheet.count("TPrimaryColorAwareLabel {") == 1
+    assert style_sheet.index("TPrimaryColorAwareLabel {") < style_sheet.index(
+        "TRenamedLabel {"
+    )
+
+    qtbot.addWidget(TFailureColorAwareLabel())
+
+    assert service.scheduled
+    qtbot.waitUntil(lambda: not service.scheduled)
+
+    assert "TFailureColorAwareLabel {" in QApplication.instance().styleSheet()
+
+
+def test_style_sheet_1(qtbot):
+    """A change of colors applies once, whatever the number of signals"""
+
+    service = TStyleSheetService()
+    service.register(TPrimaryColorAwareLabel, "main")
+    service.apply()
+
+    applied = []
+    apply = service.apply
+
+    def count():
+        applied.append(True)
+        apply()
+
+    service.apply = count
+
+    color_service = TColorService()
+    fg_color, bg_color = color_service.fg_color_fst_lgt, color_service.bg_color_fst_lgt
+
+    try:
+        color_service.fg_color_fst_lgt = "#123456"
+        color_service.bg_color_fst_lgt = "#654321"
+
+        qtbot.waitUntil(lambda: not service.scheduled)
+
+        assert "color: #123456; background-color: #654321;" in (
+            QApplication.instance().styleSheet()
+        )
+    finally:
+        color_service.fg_color_fst_lgt = fg_color
+        color_service.bg_color_fst_lgt = bg_color
+
+        del service.apply
+
+    assert len(applied) == 1
+
+
+def test_style_sheet_2(qtbot):
+    """Styled labels register their role too, no widget styles itself"""
+
+    label = FailureLabel()
+    qtbot.addWidget(label)
+
+    service = TStyleSheetService()
+    service.apply()
+
+    assert label.styleSheet() == ""
+    assert service.classes[FailureLabel] == "failure"
+    assert "FailureLabel {" in QApplication.instance().styleSheet()
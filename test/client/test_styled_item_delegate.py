@@ -0,0 +1,45 @@
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QPainter, QPixmap, QPixmapCache, QStandardItemModel
+from PyQt5.QtWidgets import QStyleOptionViewItem
+
+from src.client.wgt_timer_table.widget.styled_item_delegate import THomeTableStyleDelegate
+
+
+class TCountingDelegate(THomeTableStyleDelegate):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.drawn = 0
+
+    def draw_button(self, *args):
+        self.drawn += 1
+
+        super().draw_button(*args)
+
+
+def test_styled_item_delegate_0(qtbot):
+    """The style draws a button once per size, the rows blit the pixmap"""
+
+    QPixmapCache.clear()
+
+    model = QStandardItemModel(10, 6)
+    delegate = TCountingDelegate()
+
+    canvas = QPixmap(200, 400)
+    painter = QPainter(canvas)
+
+    option = QStyleOptionViewItem()
+
+    for row in range(10):
+        option.rect = QRect(0, 20 * row, 60, 20)
+        delegate.paint(painter, option, model.index(row, 5))
+
+    assert delegate.drawn == 1
+
+    option.rect = QRect(0, 0, 80, 20)
+    delegate.paint(painter, option, model.index(0, 5))
+
+    assert delegate.drawn == 2
+
+    painter.end()
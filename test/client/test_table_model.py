@@ -0,0 +1,77 @@
+import pendulum
+from PyQt5.QtCore import QThreadPool
+
+from src.client.wgt_timer_table.model.table_model import TTableModel
+from src.common.dto.model import TEntryModel, TSlotModel, TTaskModel
+
+
+DAY = pendulum.datetime(2021, 1, 31, tz="UTC")
+
+
+def make_entry(id: int, hour: int, name: str = "") -> TEntryModel:
+    return TEntryModel(
+        TSlotModel(DAY.add(hours=hour), DAY.add(hours=hour, minutes=30), id=id),
+        TTaskModel(name),
+    )
+
+
+def test_table_model_0():
+    """New entries are inserted in order, known ones are updated in place"""
+
+    model = TTableModel([make_entry(1, 12), make_entry(2, 8)])
+
+    inserted, changed, removed = [], [], []
+
+    model.rowsInserted.connect(lambda parent, fst, lst: inserted.append((fst, lst)))
+    model.dataChanged.connect(lambda fst, lst: changed.append((fst.row(), lst.row())))
+    model.rowsRemoved.connect(lambda parent, fst, lst: removed.append((fst, lst)))
+
+    model.apply(make_entry(3, 10))
+
+    assert inserted == [(1, 1)]
+    assert [item.slot.id for item in model.items] == [1, 3, 2]
+
+    model.apply(make_entry(3, 10, "renamed"))
+
+    assert changed == [(1, 1)]
+    assert model.items[1].task.name == "renamed"
+    assert not removed
+
+    # The entry moved earlier than the others, so it moves to the last row
+    model.apply(make_entry(3, 6))
+
+    assert removed == [(1, 1)]
+    assert inserted[-1] == (2, 2)
+    assert [item.slot.id for item in model.items] == [1, 2, 3]
+
+
+def test_table_model_1():
+    """Display strings are rendered once and again only after setData"""
+
+    model = TTableModel([make_entry(1, 12, "task")])
+
+    index = model.index(0, 0)
+
+    assert model.data(index) == "task"
+
+    # Changed behind the back of the model, so the strings are not rendered
+    model.items[0].task.name = "stale"
+
+    assert model.data(index) == "task"
+
+    model.setData(index, "renamed")
+
+    assert model.data(index) == "renamed"
+
+
+def test_table_model_2(monkeypatch):
+    """Large pages are rendered on a worker thread"""
+
+    monkeypatch.setattr(TTableModel, "PRECOMPUTE_THRESHOLD", 2)
+
+    model = TTableModel([make_entry(id, id) for id in range(1, 5)])
+
+    QThreadPool.globalInstance().waitForDone()
+
+    assert len(model.rendered) == 4
+    assert model.data(model.index(3, 2)) == " 4:00:00"
@@ -0,0 +1,81 @@
+from PyQt5.QtWidgets import QLineEdit
+
+from src.client.tag_index import TTagIndex
+from src.client.wgt_timer_table.model.table_model import TTableModel
+from src.client.wgt_timer_table.widget.tag_completer import TTagCompleter
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.response.fetch.tag_fetch_response import TTagFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from test.client.test_table_model import DAY, make_entry
+
+
+def make_index() -> TTagIndex:
+    index = TTagIndex()
+    index.clear()
+
+    names = ["work", "homework", "Workshop", "reading", "networking"]
+
+    index.handle_responded(
+        TTagFetchResponse([TTagModel(name, id) for id, name in enumerate(names, 1)])
+    )
+
+    return index
+
+
+def test_tag_index_0():
+    """Prefix matches come first, then the names that contain the text"""
+
+    index = make_index()
+
+    assert index.search("work") == ["work", "Workshop", "homework", "networking"]
+    assert index.search("WORK", limit=2) == ["work", "Workshop"]
+    assert index.search("rea") == ["reading"]
+    assert index.search("ad") == ["reading"]
+    assert index.search("kro") == []
+    assert index.search("") == []
+
+    timer = TEntryModel(
+        TSlotModel(DAY), TTaskModel("timer"), [TTagModel("writing", id=6)]
+    )
+    index.handle_responded(TTimerStashResponse(timer))
+
+    assert index.search("wr") == ["writing"]
+    assert index.find("Writing").id == 6
+
+
+def test_tag_index_1():
+    """Tags are set by name, known names resolve to the existing tags"""
+
+    make_index()
+
+    item = make_entry(1, 8)
+    item.tags = [TTagModel("reading", id=4)]
+
+    model = TTableModel([item])
+    model.setData(model.index(0, 1), "reading WORK brand-new")
+
+    assert [(tag.name, tag.id) for tag in item.tags] == [
+        ("reading", 4), ("work", 1), ("brand-new", None)
+    ]
+    assert model.data(model.index(0, 1)) == "reading work brand-new"
+
+
+def test_tag_index_2(qtbot):
+    """The completer looks up the tag under the cursor once typing stops"""
+
+    make_index()
+
+    editor = QLineEdit()
+    qtbot.addWidget(editor)
+
+    completer = TTagCompleter(editor, delay=20)
+
+    editor.setText("reading sho")
+    editor.textEdited.emit(editor.text())
+    editor.textEdited.emit(editor.text())
+
+    qtbot.waitUntil(lambda: completer.model().stringList() == ["Workshop"])
+
+    completer.insert("Workshop")
+
+    assert editor.text() == "reading Workshop"
@@ -0,0 +1,201 @@
+import pendulum
+
+from src.client.wgt_timer_table.widget.timeline_view import TTimelineView
+from src.common.dto.model import TEntryModel, TSlotModel, TTaskModel
+from src.common.response.fetch.slot_fetch_response import TRaySlotWithTagFetchResponse
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+
+
+DT_OFFSET = pendulum.datetime(2021, 1, 31, tz="UTC")
+
+
+def make_response(request, days: int = 1, entries: int = 2):
+    """Answer the request with a few entries for each of a few days"""
+
+    items = [
+        TEntryModel(
+            TSlotModel(
+                DT_OFFSET.subtract(days=day + 1, hours=entry + 1),
+                DT_OFFSET.subtract(days=day + 1, hours=entry),
+            ),
+            TTaskModel(f"{day}-{entry}"),
+        )
+        for day in range(days)
+        for entry in range(entries)
+    ]
+
+    response = TRaySlotWithTagFetchResponse.from_request(items, request)
+    response.request_id = request.id
+
+    return response
+
+
+def test_timeline_view_0(qtbot):
+    """Days become rows of one model, entries become rows below the days"""
+
+    view = TTimelineView()
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    view.kickstart()
+    view.handle_responded(make_response(requests[0], days=2, entries=3))
+
+    model = view.timeline
+
+    assert model.rowCount() == 2
+    assert model.rowCount(model.index(0, 0)) == 3
+
+    day = model.index(1, 0)
+    entry = model.index(2, 0, day)
+
+    assert model.parent(entry) == day
+    assert not model.parent(day).isValid()
+    assert model.data(entry) == "1-2"
+    assert model.data(model.index(1, 4)) == " 3:00:00"
+
+    assert view.isExpanded(day)
+
+
+def test_timeline_view_1(qtbot):
+    """Days that do not fill the viewport ask for more, until there are none"""
+
+    view = TTimelineView()
+    view.resize(400, 2000)
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    view.kickstart()
+    view.handle_responded(make_response(requests[-1]))
+
+    assert len(requests) == 2
+    assert (requests[-1].slice_fst, requests[-1].slice_lst) == (1, 2)
+
+    view.handle_responded(make_response(requests[-1], days=0))
+
+    assert view.exhausted
+
+    view.handle_scrolled()
+
+    assert len(requests) == 2
+
+    view.reverse()
+
+    assert not view.exhausted
+    assert view.timeline.rowCount() == 0
+    assert requests[-1].supersede
+
+
+def test_timeline_view_2(qtbot):
+    """Stashed entries go into their day in place, or into a new day"""
+
+    view = TTimelineView()
+    view.dt_offset = DT_OFFSET
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    view.kickstart()
+    view.handle_responded(make_response(requests[-1], days=2))
+
+    model = view.timeline
+    day = model.index(0, 0)
+
+    entry = model.entry(model.index(0, 0, day))
+    entry.slot.id = 1
+
+    renamed = TEntryModel(
+        TSlotModel(entry.slot.fst, entry.slot.lst, id=1), TTaskModel("renamed")
+    )
+
+    view.handle_responded(TTimerStashResponse(renamed))
+
+    assert model.rowCount(day) == 2
+    assert model.data(model.index(0, 0, day)) == "renamed"
+
+    # A day between the loaded ones, the next pages move by one
+    view.handle_responded(make_response(requests[-1], days=0))
+
+    newer = TEntryModel(
+        TSlotModel(DT_OFFSET.subtract(hours=2), DT_OFFSET.subtract(hours=1), id=2)
+    )
+
+    slice_lst = view.slice_lst
+
+    view.handle_responded(TTimerStashResponse(newer))
+
+    assert model.rowCount() == 3
+    assert model.rowCount(model.index(0, 0)) == 1
+    assert view.slice_lst == slice_lst + 1
+
+    # The entry moves to another day, its old day is gone
+    moved = TEntryModel(
+        TSlotModel(
+            newer.slot.fst.subtract(days=2), newer.slot.lst.subtract(days=2), id=2
+        )
+    )
+
+    view.handle_responded(TTimerStashResponse(moved))
+
+    assert model.rowCount() == 2
+    assert model.rowCount(model.index(1, 0)) == 3
+
+
+def test_timeline_view_3(qtbot):
+    """The next day is asked for once, a slice that is loaded is dropped"""
+
+    view = TTimelineView()
+    view.dt_offset = DT_OFFSET
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    view.kickstart()
+    view.handle_show_next_shortcut()
+
+    assert len(requests) == 1
+
+    view.handle_responded(make_response(requests[0]))
+    view.handle_show_next_shortcut()
+
+    # Either the view or the shortcut asked for the next day, not both
+    assert [(request.slice_fst, request.slice_lst) for request in requests] == [
+        (0, 1), (1, 2)
+    ]
+
+    # Two responses for the same slice, only the first one counts
+    view.request(1, 2)
+
+    view.handle_responded(make_response(requests[1]))
+    view.handle_responded(make_response(requests[2]))
+
+    assert view.timeline.rowCount() == 2
+
+
+def test_timeline_view_4(qtbot):
+    """The strings of a removed day go away together with the day"""
+
+    view = TTimelineView()
+    qtbot.addWidget(view)
+
+    requests = []
+    view.requested.connect(requests.append)
+
+    view.kickstart()
+    view.handle_responded(make_response(requests[0], days=2, entries=3))
+
+    model = view.timeline
+
+    removed = model.days[0]
+    model.data(model.index(0, 0, model.index(0, 0)))
+
+    model.remove_day(0)
+
+    assert model.rowCount() == 1
+    assert not any(id(item) in model.rendered for item in removed)
+    assert len(model.rendered) == 3
@@ -0,0 +1,74 @@
+import pytest
+
+from src.common.channel import TChannel
+from src.common.failure import TFailure
+from src.common.metrics import metrics
+from src.common.request import TRequest
+
+
+def test_channel_0():
+    """Messages go through the channel in order"""
+
+    channel = TChannel("test-channel-0", maxsize=2)
+
+    request0, request1 = TRequest(), TRequest()
+
+    channel.put(request0)
+    channel.put(request1)
+
+    assert channel.get(timeout=5).id == request0.id
+    assert channel.get(timeout=5).id == request1.id
+
+
+def test_channel_1():
+    """A full channel rejects the message with a failure"""
+
+    metrics.reset()
+
+    channel = TChannel("test-channel-1", maxsize=1, policy="reject")
+
+    channel.put(TRequest())
+
+    request = TRequest()
+
+    with pytest.raises(TFailure) as failure:
+        channel.put(request)
+
+    assert failure.value.request_id == request.id
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["counters"]["test-channel-1.sent"] == 1
+    assert snapshot["counters"]["test-channel-1.rejected"] == 1
+
+
+def test_channel_2():
+    """A full channel blocks for at most the timeout, then fails"""
+
+    channel = TChannel("test-channel-2", maxsize=1, policy="block", timeout=0.1)
+
+    channel.put(TRequest())
+
+    with pytest.raises(TFailure):
+        channel.put(TRequest())
+
+
+def test_channel_3():
+    """Depth and wait times are published as metrics"""
+
+    metrics.reset()
+
+    channel = TChannel("test-channel-3", maxsize=4)
+
+    channel.put(TRequest())
+    channel.get(timeout=5)
+
+    snapshot = metrics.snapshot()
+
+    assert "test-channel-3.depth" in snapshot["gauges"]
+    assert snapshot["timings"]["test-channel-3.wait"]["count"] == 1
+
+
+def test_channel_4():
+    with pytest.raises(RuntimeError):
+        TChannel("test-channel-4", policy="drop_everything")
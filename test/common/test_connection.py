@@ -0,0 +1,69 @@
+import socket
+from queue import Empty
+from threading import Thread
+
+import pytest
+
+from src.common.connection import TConnection, recv_frame, send_frame
+from src.common.request import TRequest
+
+
+@pytest.fixture
+def connections():
+    """Two connections that talk to each other"""
+
+    sock0, sock1 = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    connection0, connection1 = TConnection(sock0), TConnection(sock1)
+
+    yield connection0, connection1
+
+    connection0.close()
+    connection1.close()
+
+
+def test_frame_0():
+    """A frame keeps its boundaries even if large and sent back to back"""
+
+    sock0, sock1 = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock1.settimeout(5)
+
+    messages = [list(range(100000)), "tslot", None]
+
+    def send():
+        for message in messages:
+            send_frame(sock0, message)
+
+    # A large frame does not fit into the socket buffer, so send it meanwhile
+    sender = Thread(target=send)
+    sender.start()
+
+    assert [recv_frame(sock1) for _ in messages] == messages
+
+    sender.join(timeout=5)
+
+    sock0.close()
+    sock1.close()
+
+
+def test_connection_0(connections):
+    connection0, connection1 = connections
+
+    request = TRequest()
+    connection0.put(request)
+
+    assert connection1.get(timeout=5).id == request.id
+
+
+def test_connection_1(connections):
+    """An idle connection times out, a closed one raises EOFError"""
+
+    connection0, connection1 = connections
+
+    with pytest.raises(Empty):
+        connection1.get(timeout=0.05)
+
+    connection0.close()
+
+    with pytest.raises(EOFError):
+        connection1.get(timeout=5)
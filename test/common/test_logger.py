@@ -0,0 +1,93 @@
+import logging
+import threading
+
+from src.common.logger import logged, start_async_logging, stop_async_logging, trace
+
+
+logger = logging.getLogger('tslot-test')
+
+
+class TTraced:
+    @logged(logger=logger, disabled=True)
+    def quiet(self):
+        return 'quiet'
+
+    @logged(logger=logger, disabled=False)
+    def loud(self):
+        return 'loud'
+
+
+def test_logged_0(caplog):
+    """Disabled functions are bare until tracing is switched on"""
+
+    original = TTraced.__dict__['quiet']
+
+    assert not hasattr(original, '__wrapped__')
+
+    with caplog.at_level(logging.DEBUG, logger='tslot-test'):
+        assert TTraced().quiet() == 'quiet'
+        assert TTraced().loud() == 'loud'
+
+        assert [record.message for record in caplog.records] == [
+            'enter TTraced.loud', 'leave TTraced.loud (loud)'
+        ]
+
+        caplog.clear()
+
+        trace(logger)
+
+        try:
+            assert TTraced().quiet() == 'quiet'
+        finally:
+            trace(logger, enabled=False)
+
+        assert TTraced.__dict__['quiet'] is original
+
+        assert [record.message for record in caplog.records] == [
+            'enter TTraced.quiet', 'leave TTraced.quiet (quiet)'
+        ]
+
+
+class TSlowHandler(logging.Handler):
+    """Keep records, but only once the test lets it"""
+
+    def __init__(self):
+        super().__init__()
+
+        self.released = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.released.wait(timeout=5)
+
+        self.records.append(record.getMessage())
+
+
+def test_async_logging_0():
+    """Callers never wait for a slow handler, records that do not fit drop"""
+
+    handler = TSlowHandler()
+
+    logger.handlers = [handler]
+
+    start_async_logging(capacity=2, names=[logger.name])
+
+    try:
+        for i in range(10):
+            logger.warning(f'record {i}')
+
+        assert not handler.records
+
+        handler.released.set()
+    finally:
+        stop_async_logging()
+
+    assert logger.handlers == [handler]
+
+    # One record is taken by the listener right away and two more wait in the
+    # queue; the rest do not fit, but at the end the drops are reported
+    assert handler.records[0] == 'record 0'
+    assert len(handler.records) < 10
+    assert handler.records[-1].startswith('Dropped')
+
+    logger.handlers = []
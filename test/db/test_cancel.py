@@ -0,0 +1,70 @@
+from threading import Timer
+
+import pytest
+
+from sqlalchemy.exc import OperationalError
+
+from src.db.cancel import TCancelToken, is_interrupted
+
+# Count up to a huge number, which takes much longer than any test should
+SLOW_QUERY = """
+    WITH RECURSIVE counter(x) AS (
+        SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < 1000000000
+    )
+    SELECT MAX(x) FROM counter
+"""
+
+
+def test_cancel_token_0(session):
+    """An installed token that was not cancelled changes nothing"""
+
+    token = TCancelToken()
+    token.install(session)
+
+    assert session.execute("SELECT 42").scalar() == 42
+
+    token.uninstall()
+
+
+def test_cancel_token_1(session):
+    """A token cancelled before the query starts stops the query"""
+
+    token = TCancelToken()
+    token.install(session)
+    token.cancel()
+
+    with pytest.raises(OperationalError) as error:
+        session.execute(SLOW_QUERY).scalar()
+
+    assert is_interrupted(error.value)
+
+    token.uninstall()
+
+
+def test_cancel_token_2(session):
+    """A token cancelled from another thread interrupts a running query"""
+
+    token = TCancelToken()
+    token.install(session)
+
+    timer = Timer(0.1, token.cancel)
+    timer.start()
+
+    with pytest.raises(OperationalError) as error:
+        session.execute(SLOW_QUERY).scalar()
+
+    assert is_interrupted(error.value)
+
+    timer.join()
+    token.uninstall()
+
+
+def test_cancel_token_3(session):
+    """An uninstalled token no longer affects the connection"""
+
+    token = TCancelToken()
+    token.install(session)
+    token.uninstall()
+    token.cancel()
+
+    assert session.execute("SELECT 42").scalar() == 42
@@ -0,0 +1,72 @@
+import pendulum
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.db.model import DailyTotalModel, SlotModel, TagModel
+from src.db.rollup import TDailyTotals
+from src.db.writer_for_timer import TTimerWriter
+
+
+FST = pendulum.datetime(2010, 6, 15, 10, 30, tz="UTC")
+
+
+def stash(session, item: TEntryModel) -> None:
+    worker = TTimerWriter(TTimerStashRequest(item))
+    worker.session = session
+
+    worker.work()
+
+
+def test_rollup_0(session):
+    """Writers keep the daily totals in step with the slots and the tags"""
+
+    rollup = TDailyTotals(session)
+    rollup.rebuild(pendulum.timezone("UTC"))
+
+    stash(session, TEntryModel(TSlotModel(FST, FST.add(hours=1)), TTaskModel("a"), [TTagModel("x")]))
+
+    slot_id, task_id = session.query(SlotModel.id, SlotModel.task_id).one()
+    tag_id = session.query(TagModel.id).scalar()
+
+    assert rollup.stored() == {
+        (FST.date(), task_id, None): 3600 * 10 ** 6,
+        (FST.date(), None, tag_id): 3600 * 10 ** 6,
+    }
+
+    # Another slot of the task, two days later
+    lst = FST.add(days=2)
+
+    stash(
+        session,
+        TEntryModel(
+            TSlotModel(lst, lst.add(hours=1)),
+            TTaskModel("a", task_id),
+            [TTagModel("x", tag_id)],
+        ),
+    )
+
+    # Move the slot to the next day, make it shorter and drop the tag of the
+    # task: the other slot of the task moves to the time without a tag too
+    fst = FST.add(days=1)
+
+    stash(
+        session,
+        TEntryModel(
+            TSlotModel(fst, fst.add(minutes=30), id=slot_id), TTaskModel("a", task_id)
+        ),
+    )
+
+    assert rollup.stored() == {
+        (fst.date(), task_id, None): 1800 * 10 ** 6,
+        (fst.date(), None, None): 1800 * 10 ** 6,
+        (lst.date(), task_id, None): 3600 * 10 ** 6,
+        (lst.date(), None, None): 3600 * 10 ** 6,
+    }
+
+    assert rollup.check() == []
+
+    session.query(DailyTotalModel).delete()
+
+    assert len(rollup.check()) == 4
+    assert rollup.rebuild() == 4
+    assert rollup.check() == []
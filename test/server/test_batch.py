@@ -0,0 +1,166 @@
+import time
+from queue import Queue
+from threading import Event
+
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from test.db.test_reader import put_one_date, setup_one_slot_one_date
+
+from src.common.failure import TFailure
+from src.common.request import TRequest
+from src.common.request.batch import TBatchRequest
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.response.batch import TBatchResponse
+from src.common.response.fetch.slot_fetch_response import TRaySlotFetchResponse
+from src.common.response.fetch.timer_fetch_response import TTimerFetchResponse
+from src.db.model import Base
+from src.server import Server
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "tslot.db"
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    # Let a writer commit while the snapshot reads, instead of waiting for it
+    engine.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine)
+
+    return path
+
+
+@pytest.fixture
+def writer(path):
+    """A session on a separate connection, to change the data meanwhile"""
+
+    session = sessionmaker(bind=create_engine(f"sqlite:///{path}"))()
+
+    yield session
+
+    session.close()
+
+
+def test_batch_0(path, writer):
+    """Each request of the batch gets its own response, in order"""
+
+    slots = setup_one_slot_one_date(writer)
+
+    requests = [
+        TRaySlotFetchRequest(dt_offset=slots[0][1].add(days=1)),
+        TTimerFetchRequest(),
+        TRequest(),
+    ]
+
+    responses = Queue()
+
+    server = Server(None, None, path=path)
+    server.handle(TBatchRequest(requests), responses.put)
+
+    response = responses.get(timeout=5)
+
+    assert isinstance(response, TBatchResponse)
+
+    slot_response, timer_response, failure = response.responses
+
+    assert isinstance(slot_response, TRaySlotFetchResponse)
+    assert len(slot_response.items) == 1
+
+    assert isinstance(timer_response, TTimerFetchResponse)
+    assert timer_response.timer is None
+
+    assert isinstance(failure, TFailure)
+
+    assert [item.request_id for item in response.responses] == [
+        request.id for request in requests
+    ]
+
+    server.dispatcher.stop()
+
+
+def test_batch_1(path, writer):
+    """All the requests of the batch see the same state of the database"""
+
+    setup_one_slot_one_date(writer)
+
+    server = Server(None, None, path=path)
+
+    def fetch_timer(request, token):
+        # Start a timer from another connection in between the two fetches
+        put_one_date(writer, fst=pendulum.now("UTC"), lst=None)
+
+        return server.timer_controller.service.fetch_timer(request, token)
+
+    dt_offset = pendulum.now("UTC").add(days=1)
+
+    with server.repository.snapshot():
+        before = server.fetch_slots(TRaySlotFetchRequest(dt_offset=dt_offset))
+        timer = fetch_timer(TTimerFetchRequest(), None)
+
+    after = server.fetch_slots(TRaySlotFetchRequest(dt_offset=dt_offset))
+
+    assert timer.timer is None
+    assert len(before.items) == len(after.items) == 1
+
+    assert server.timer_controller.fetch(TTimerFetchRequest()).timer is not None
+
+    server.dispatcher.stop()
+
+
+def test_batch_2(path, writer):
+    """Slot requests of a batch supersede their group and are prefetched"""
+
+    setup_one_slot_one_date(writer)
+
+    server = Server(None, None, path=path)
+    responses = Queue()
+
+    started, release, tokens = Event(), Event(), []
+
+    def stale_fetch(request, token):
+        tokens.append(token)
+        started.set()
+        release.wait(timeout=5)
+
+        return TRaySlotFetchResponse([])
+
+    stale = TRequest(group="history")
+    server.dispatcher.submit(stale, stale_fetch, responses.put)
+
+    assert started.wait(timeout=5)
+
+    request = TRaySlotFetchRequest(
+        dt_offset=pendulum.now("UTC").add(days=1), slice_fst=0, slice_lst=1
+    )
+    request.group, request.supersede = "history", True
+
+    server.handle(TBatchRequest([request]), responses.put)
+
+    assert tokens[0].is_cancelled()
+
+    prefetched = server.prefetcher.shift(request, 1)
+
+    for _ in range(500):
+        if server.cache.contains(prefetched):
+            break
+
+        time.sleep(0.01)
+
+    assert server.cache.contains(prefetched)
+
+    release.set()
+
+    response = responses.get(timeout=5)
+
+    assert isinstance(response, TBatchResponse)
+    assert response.responses[0].request_id == request.id
+
+    server.dispatcher.stop()
+
+    assert responses.empty()  # the response of the stale request was dropped
@@ -0,0 +1,298 @@
+from queue import Queue
+from threading import Event
+
+from src.common.failure import TFailure
+from src.common.request import TRequest
+from src.common.response import TResponse
+from src.server.dispatcher import TDispatcher
+
+
+def respond_with(response, started=None, release=None):
+    """Create a request handler that waits to be released, then responds"""
+
+    def handler(request, token):
+        if started is not None:
+            started.set()
+        if release is not None:
+            release.wait(timeout=5)
+
+        return response
+
+    return handler
+
+
+def test_dispatcher_0():
+    """A response is sent back and carries the id of its request"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(respond=responses.put, workers=1)
+
+    request = TRequest()
+    dispatcher.submit(request, respond_with(TResponse()))
+
+    response = responses.get(timeout=5)
+
+    assert isinstance(response, TResponse)
+    assert response.request_id == request.id
+
+    dispatcher.stop()
+
+
+def test_dispatcher_1():
+    """A pending request is dropped before it starts"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(respond=responses.put, workers=1)
+
+    started, release = Event(), Event()
+
+    request0, request1, request2 = TRequest(), TRequest(), TRequest()
+
+    dispatcher.submit(request0, respond_with(TResponse(), started, release))
+    started.wait(timeout=5)
+
+    called = Event()
+
+    def handler(request, token):
+        called.set()
+
+        return TResponse()
+
+    dispatcher.submit(request1, handler)
+    dispatcher.submit(request2, respond_with(TResponse()))
+
+    dispatcher.cancel(ids=[request1.id])
+
+    release.set()
+
+    assert responses.get(timeout=5).request_id == request0.id
+    assert responses.get(timeout=5).request_id == request2.id
+    assert not called.is_set()
+
+    dispatcher.stop()
+
+
+def test_dispatcher_2():
+    """A running request is cancelled and its response is discarded"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(respond=responses.put, workers=1)
+
+    started, release = Event(), Event()
+    cancelled = Event()
+
+    def handler(request, token):
+        started.set()
+        release.wait(timeout=5)
+
+        if token.is_cancelled():
+            cancelled.set()
+
+        return TResponse()
+
+    request0, request1 = TRequest(), TRequest()
+
+    dispatcher.submit(request0, handler)
+    started.wait(timeout=5)
+
+    dispatcher.cancel(ids=[request0.id])
+    release.set()
+
+    dispatcher.submit(request1, respond_with(TResponse()))
+
+    assert responses.get(timeout=5).request_id == request1.id
+    assert cancelled.is_set()
+
+    dispatcher.stop()
+
+
+def test_dispatcher_3():
+    """A superseding request cancels older requests of the same group"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(respond=responses.put, workers=1)
+
+    started, release = Event(), Event()
+
+    blocker = TRequest()
+    dispatcher.submit(blocker, respond_with(TResponse(), started, release))
+    started.wait(timeout=5)
+
+    old = TRequest(group="scroll")
+    other = TRequest(group="timer")
+    new = TRequest(group="scroll", supersede=True)
+
+    for request in [old, other, new]:
+        dispatcher.submit(request, respond_with(TResponse()))
+
+    release.set()
+
+    ids = [responses.get(timeout=5).request_id for _ in range(3)]
+
+    assert ids == [blocker.id, other.id, new.id]
+    assert responses.empty()
+
+    dispatcher.stop()
+
+
+def test_dispatcher_4():
+    """Failures raised by handlers are sent back instead of responses"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(respond=responses.put, workers=1)
+
+    def handler(request, token):
+        raise TFailure("no luck")
+
+    request = TRequest()
+    dispatcher.submit(request, handler)
+
+    failure = responses.get(timeout=5)
+
+    assert isinstance(failure, TFailure)
+    assert failure.request_id == request.id
+
+    dispatcher.stop()
+
+
+def fill_dispatcher(dispatcher, capacity, prefetch=False):
+    """Block the only worker and fill all the pending space of the dispatcher"""
+
+    started, release = Event(), Event()
+
+    dispatcher.submit(TRequest(), respond_with(TResponse(), started, release))
+    started.wait(timeout=5)
+
+    requests = [TRequest(prefetch=prefetch) for _ in range(capacity)]
+
+    for request in requests:
+        dispatcher.submit(request, respond_with(TResponse()))
+
+    return requests, release
+
+
+def test_dispatcher_backpressure_0():
+    """The reject policy answers with a failure once full"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(
+        respond=responses.put, workers=1, capacity=2, policy="reject"
+    )
+
+    requests, release = fill_dispatcher(dispatcher, 2)
+
+    request = TRequest()
+    dispatcher.submit(request, respond_with(TResponse()))
+
+    failure = responses.get(timeout=5)
+
+    assert isinstance(failure, TFailure)
+    assert failure.request_id == request.id
+
+    release.set()
+    dispatcher.stop()
+
+
+def test_dispatcher_backpressure_1():
+    """The drop_oldest_prefetch policy makes space by dropping a prefetch"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(
+        respond=responses.put, workers=1, capacity=2, policy="drop_oldest_prefetch"
+    )
+
+    requests, release = fill_dispatcher(dispatcher, 2, prefetch=True)
+
+    request = TRequest()
+    dispatcher.submit(request, respond_with(TResponse()))
+
+    release.set()
+
+    ids = [responses.get(timeout=5).request_id for _ in range(3)]
+
+    # Prefetch requests run last, after everything else
+    assert requests[0].id not in ids
+    assert ids[1:] == [request.id, requests[1].id]
+
+    dispatcher.stop()
+
+
+def test_dispatcher_backpressure_2():
+    """The block policy holds requests back without blocking the submitter"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(
+        respond=responses.put, workers=1, capacity=1, policy="block"
+    )
+
+    requests, release = fill_dispatcher(dispatcher, 1)
+
+    request0, request1 = TRequest(), TRequest()
+
+    dispatcher.submit(request0, respond_with(TResponse()))
+    dispatcher.submit(request1, respond_with(TResponse()))
+
+    # Held back requests are limited too, so the second one is rejected
+    failure = responses.get(timeout=5)
+
+    assert isinstance(failure, TFailure)
+    assert failure.request_id == request1.id
+
+    release.set()
+
+    ids = [responses.get(timeout=5).request_id for _ in range(3)]
+
+    assert ids[1:] == [requests[0].id, request0.id]
+
+    dispatcher.stop()
+
+
+def test_dispatcher_backpressure_3():
+    """A full dispatcher still honours a cancel"""
+
+    responses = Queue()
+    dispatcher = TDispatcher(
+        respond=responses.put, workers=1, capacity=1, policy="block"
+    )
+
+    requests, release = fill_dispatcher(dispatcher, 1)
+
+    request = TRequest()
+    dispatcher.submit(request, respond_with(TResponse()))
+
+    dispatcher.cancel(ids=[requests[0].id, request.id])
+
+    release.set()
+
+    responses.get(timeout=5)  # the response to the request that was running
+
+    dispatcher.stop()
+
+    assert responses.empty()
+
+
+def test_dispatcher_5():
+    """A group is cancelled only for the client that owns the requests"""
+
+    responses0, responses1 = Queue(), Queue()
+    dispatcher = TDispatcher(respond=responses0.put, workers=1)
+
+    started, release = Event(), Event()
+
+    dispatcher.submit(TRequest(), respond_with(TResponse(), started, release))
+    started.wait(timeout=5)
+
+    request0, request1 = TRequest(group="scroll"), TRequest(group="scroll")
+
+    dispatcher.submit(request0, respond_with(TResponse()), responses0.put)
+    dispatcher.submit(request1, respond_with(TResponse()), responses1.put)
+
+    dispatcher.cancel(group="scroll", respond=responses0.put)
+
+    release.set()
+
+    assert responses1.get(timeout=5).request_id == request1.id
+
+    dispatcher.stop()
+
+    assert responses0.qsize() == 1  # only the response to the first request
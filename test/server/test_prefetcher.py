@@ -0,0 +1,135 @@
+import time
+from queue import Queue
+
+import pendulum
+
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.common.response import TResponse
+from src.server.cache import TResponseCache
+from src.server.dispatcher import TDispatcher
+from src.server import Server
+from src.server.prefetcher import TPrefetcher
+from test.server.test_batch import path
+
+
+def make_prefetcher(depth=4):
+    fetched = Queue()
+
+    def fetch(request, token):
+        fetched.put((request.slice_fst, request.slice_lst))
+
+        return TResponse()
+
+    cache = TResponseCache()
+    dispatcher = TDispatcher(respond=lambda response: None, workers=1)
+
+    return TPrefetcher(cache, dispatcher, fetch, depth), fetched
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert condition()
+
+
+def test_response_cache_0():
+    """Requests that ask for the same thing share the cached response"""
+
+    cache = TResponseCache(capacity=1)
+
+    dt_offset = pendulum.datetime(2021, 1, 1)
+
+    request0 = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=0, slice_lst=1)
+    request1 = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=0, slice_lst=1)
+    request2 = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=1, slice_lst=2)
+
+    cache.put(request0, TResponse())
+
+    response = cache.get(request1)
+    response.request_id = request1.id
+
+    assert cache.get(request0).request_id is None
+    assert cache.get(request2) is None
+
+    cache.put(request2, TResponse())
+
+    assert cache.get(request0) is None  # evicted
+
+
+def test_prefetcher_0():
+    """The pages after the requested one are fetched, more while they hit"""
+
+    prefetcher, fetched = make_prefetcher(depth=4)
+
+    dt_offset = pendulum.datetime(2021, 1, 1)
+
+    request = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=0, slice_lst=1)
+    prefetcher.observe(request, False, None)
+
+    assert fetched.get(timeout=5) == (1, 2)
+
+    wait_for(lambda: prefetcher.cache.contains(prefetcher.shift(request, 1)))
+
+    request = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=1, slice_lst=2)
+    prefetcher.observe(request, True, None)
+
+    # The prefetched page was used, so now two pages are fetched ahead
+    assert fetched.get(timeout=5) == (2, 3)
+    assert fetched.get(timeout=5) == (3, 4)
+
+    prefetcher.dispatcher.stop()
+
+    assert fetched.empty()
+
+
+def test_prefetcher_1():
+    """Nothing is fetched twice and a jump starts over with one page"""
+
+    prefetcher, fetched = make_prefetcher(depth=4)
+
+    dt_offset = pendulum.datetime(2021, 1, 1)
+
+    request = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=0, slice_lst=1)
+    prefetcher.observe(request, False, None)
+    prefetcher.observe(request, False, None)
+
+    request = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=8, slice_lst=9)
+    prefetcher.observe(request, True, None)
+
+    assert sorted([fetched.get(timeout=5), fetched.get(timeout=5)]) == [
+        (1, 2),
+        (9, 10),
+    ]
+
+    prefetcher.dispatcher.stop()
+
+    assert fetched.empty()
+
+
+def test_prefetcher_2(path):
+    """The server puts every page into its cache once, prefetched or not"""
+
+    server = Server(None, None, path=path)
+
+    puts, put = Queue(), server.cache.put
+
+    def count_put(request, response):
+        puts.put((request.slice_fst, request.slice_lst))
+
+        put(request, response)
+
+    server.cache.put = count_put
+
+    dt_offset = pendulum.datetime(2021, 1, 1)
+
+    request = TRaySlotFetchRequest(dt_offset=dt_offset, slice_fst=0, slice_lst=1)
+    server.handle(request, lambda response: None)
+
+    wait_for(lambda: server.cache.contains(server.prefetcher.shift(request, 1)))
+
+    server.dispatcher.stop()
+
+    assert sorted(puts.queue) == [(0, 1), (1, 2)]
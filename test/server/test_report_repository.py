@@ -0,0 +1,148 @@
+import datetime
+
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.request.fetch.report_fetch_request import TReportFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.db.model import Base
+from src.db.rollup import TDailyTotals
+from src.server.repository.report_repository import TReportRepository
+from src.server.repository.report_repository import offsets
+from src.server.repository.timer_repository import TTimerRepository
+
+
+TZ = pendulum.timezone("Europe/Berlin")
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "tslot.db"
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    return path
+
+
+def stash(path, fst: pendulum.DateTime, minutes: int, name: str, tags: list):
+    item = TEntryModel(
+        TSlotModel(fst, fst.add(minutes=minutes)),
+        TTaskModel(name),
+        [TTagModel(tag) for tag in tags],
+    )
+
+    TTimerRepository(path).stash_timer(TTimerStashRequest(item))
+
+
+def report(path, group_by: list, fst=None, lst=None) -> list:
+    request = TReportFetchRequest(
+        fst or pendulum.datetime(2021, 3, 1, tz=TZ),
+        lst or pendulum.datetime(2021, 4, 1, tz=TZ),
+        group_by=group_by,
+        tz=TZ,
+    )
+
+    response = TReportRepository(path).fetch_report(request)
+
+    return [
+        (
+            total.date and total.date.day,
+            total.task and total.task.name,
+            total.tag and total.tag.name,
+            total.elapsed.total_seconds() // 60,
+        )
+        for total in response.totals
+    ]
+
+
+@pytest.mark.parametrize("rollup", [False, True])
+def test_report_repository_0(path, rollup):
+    """Totals are summed in SQL per local day, task and tag"""
+
+    # 23:30 local on the 27th in winter time, 00:30 on the 29th in summer time
+    stash(path, pendulum.datetime(2021, 3, 27, 22, 30, tz="UTC"), 20, "read", ["home"])
+    stash(path, pendulum.datetime(2021, 3, 28, 22, 30, tz="UTC"), 40, "read", [])
+    stash(path, pendulum.datetime(2021, 3, 28, 8, tz="UTC"), 60, "code", ["work", "home"])
+    stash(path, pendulum.datetime(2021, 4, 1, 8, tz="UTC"), 60, "code", [])
+
+    repository = TReportRepository(path)
+    session = repository.create_session()
+
+    if rollup:
+        TDailyTotals(session).rebuild(TZ)
+        session.commit()
+
+    request = TReportFetchRequest(
+        pendulum.datetime(2021, 3, 1, tz=TZ), pendulum.datetime(2021, 4, 1, tz=TZ), tz=TZ
+    )
+
+    # The daily totals are in another time zone, unless rebuilt
+    assert repository.can_use_rollup(session, request) == rollup
+
+    session.close()
+
+    assert report(path, ["day"]) == [(27, None, None, 20), (28, None, None, 60), (29, None, None, 40)]
+
+    # Every stash above made a task of its own
+    assert report(path, ["task"]) == [
+        (None, "code", None, 60), (None, "read", None, 20), (None, "read", None, 40)
+    ]
+
+    assert report(path, ["tag", "day"]) == [
+        (29, None, None, 40),
+        (27, None, "home", 20),
+        (28, None, "home", 60),
+        (28, None, "work", 60),
+    ]
+
+    assert report(path, ["day"], fst=pendulum.datetime(2021, 3, 28, tz=TZ)) == [
+        (28, None, None, 60), (29, None, None, 40)
+    ]
+
+    # The 27th is a Saturday, the 29th a Monday
+    assert report(path, ["week"]) == [(22, None, None, 80), (29, None, None, 40)]
+    assert report(path, ["month", "tag"]) == [
+        (1, None, None, 40), (1, None, "home", 20), (1, None, "home", 60), (1, None, "work", 60)
+    ]
+
+
+def test_report_repository_1():
+    """The offsets of the time zone change at the second they change"""
+
+    found = offsets(TZ, pendulum.datetime(2021, 1, 1), pendulum.datetime(2022, 1, 1))
+
+    assert found == [
+        (datetime.datetime(2021, 3, 28, 1), 60),
+        (datetime.datetime(2021, 10, 31, 1), 120),
+        (None, 60),
+    ]
+
+    with pytest.raises(RuntimeError):
+        TReportFetchRequest(found[0][0], found[0][0], tz=TZ)
+    with pytest.raises(RuntimeError):
+        TReportFetchRequest(pendulum.now(), pendulum.now().add(days=1), ["week", "day"])
+
+
+def test_report_repository_2(path):
+    """Databases from before the daily totals get them from their slots"""
+
+    stash(path, pendulum.datetime(2021, 3, 27, 22, 30, tz="UTC"), 20, "read", ["home"])
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    with engine.begin() as connection:
+        connection.execute("DROP TABLE daily_totals")
+        connection.execute("DROP TABLE setting")
+
+    repository = TReportRepository(path)
+    repository.prepare()
+
+    session = repository.create_session()
+
+    assert TDailyTotals(session).check() == []
+    assert len(TDailyTotals(session).stored()) == 2
+
+    session.close()
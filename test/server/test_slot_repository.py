@@ -0,0 +1,67 @@
+import pytest
+
+from sqlalchemy.exc import OperationalError
+
+from test.db.test_reader import (setup_four_slots_two_dates,
+                                 setup_one_slot_one_date)
+
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.db.cancel import TCancelToken, is_interrupted
+from src.server.repository.slot_repository import TSlotRepository
+
+
+@pytest.mark.parametrize('direction, total', [
+    ('past_to_future', 0), ('future_to_past', 1)
+])
+def test_slot_repository_0(session, direction, total):
+
+    slots = setup_one_slot_one_date(session)
+
+    request = TRaySlotFetchRequest(
+        dt_offset=slots[0][0].add(days=1).start_of('day'), direction=direction
+    )
+
+    repository = TSlotRepository()
+    repository.session = session
+
+    response = repository.fetch_ray_slot(request)
+
+    assert len(response.items) == total
+    assert response.direction == direction
+
+
+def test_slot_repository_1(session):
+
+    slots = setup_four_slots_two_dates(session)
+
+    request = TRaySlotFetchRequest(
+        dt_offset=slots[-1][0].add(days=1), slice_fst=0, slice_lst=1
+    )
+
+    repository = TSlotRepository()
+    repository.session = session
+
+    response = repository.fetch_ray_slot(request)
+
+    assert len(response.items) == 2
+    assert response.slice_fst == 0
+    assert response.slice_lst == 1
+
+
+def test_slot_repository_2(session):
+    """A cancelled token interrupts the fetch"""
+
+    slots = setup_four_slots_two_dates(session)
+
+    request = TRaySlotFetchRequest(dt_offset=slots[-1][0].add(days=1))
+
+    repository = TSlotRepository()
+    repository.session = session
+
+    token = TCancelToken(period=1)
+    token.cancel()
+
+    with pytest.raises(OperationalError) as error:
+        repository.fetch_ray_slot(request, token)
+
+    assert is_interrupted(error.value)
@@ -0,0 +1,186 @@
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from threading import Event, Thread
+
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+
+from src.common.connection import connect
+from src.common.failure import TFailure
+from src.common.request import TRequest
+from src.common.request.cancel import TCancelRequest
+from src.common.request.fetch.metrics_fetch_request import TMetricsFetchRequest
+from src.common.request.fetch.slot_fetch_request import TRaySlotFetchRequest
+from src.common.response.fetch.metrics_fetch_response import TMetricsFetchResponse
+from src.common.response.fetch.slot_fetch_response import TSlotFetchResponse
+from src.db.model import Base
+from src.server.dispatcher import TDispatcher
+from src.server.socket_server import TSocketServer
+
+
+@pytest.fixture
+def address():
+    """A temporary socket path, short enough for the AF_UNIX limit"""
+
+    directory = Path(tempfile.mkdtemp(prefix="tslot-"))
+
+    yield directory / "tslot.sock"
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(address):
+    """A socket server with an empty database, running on a thread"""
+
+    path = address.parent / "tslot.db"
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    server = TSocketServer(address, path=path)
+
+    thread = Thread(target=server.start, daemon=True)
+    thread.start()
+
+    assert server.listening.wait(timeout=5)
+
+    yield server
+
+    server.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+
+
+def test_socket_server_0(server):
+    """Several clients share the server and get only their own responses"""
+
+    connection0 = connect(server.address)
+    connection1 = connect(server.address)
+
+    request0 = TRaySlotFetchRequest(dt_offset=pendulum.now("UTC"))
+    request1 = TMetricsFetchRequest()
+
+    connection0.put(request0)
+    connection1.put(request1)
+
+    response0 = connection0.get(timeout=5)
+    response1 = connection1.get(timeout=5)
+
+    assert isinstance(response0, TSlotFetchResponse)
+    assert response0.request_id == request0.id
+
+    assert isinstance(response1, TMetricsFetchResponse)
+    assert response1.request_id == request1.id
+
+    connection0.close()
+    connection1.close()
+
+
+def test_socket_server_1(server):
+    """An unknown request is answered with a failure"""
+
+    connection = connect(server.address)
+
+    request = TRequest()
+    connection.put(request)
+
+    failure = connection.get(timeout=5)
+
+    assert isinstance(failure, TFailure)
+    assert failure.request_id == request.id
+
+    connection.close()
+
+
+def test_socket_server_2(address):
+    """A stale socket is taken over, a live one is not"""
+
+    address.touch()
+
+    server = TSocketServer(address)
+    server.bind()
+
+    with pytest.raises(RuntimeError):
+        TSocketServer(address).bind()
+
+    server.stop()
+
+    assert not address.exists()
+
+
+def test_socket_server_3(address):
+    """Only the owner may connect and an idle server stops by itself"""
+
+    server = TSocketServer(address, idle_timeout=0.1)
+
+    thread = Thread(target=server.start, daemon=True)
+    thread.start()
+
+    assert server.listening.wait(timeout=5)
+    assert stat.S_IMODE(address.stat().st_mode) & 0o077 == 0
+
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not address.exists()
+
+
+def test_socket_server_4(address):
+    """Cancels and metrics are read even if the dispatcher is full"""
+
+    server = TSocketServer(address)
+
+    server.dispatcher.stop()
+    server.dispatcher = TDispatcher(
+        respond=server.handle_success, workers=1, capacity=1, policy="block"
+    )
+
+    started, release = Event(), Event()
+
+    def fetch(request, token):
+        started.set()
+        release.wait(timeout=5)
+
+    # Keep the worker busy, so that the fetches stay pending
+    server.dispatcher.submit(TRequest(), fetch, respond=lambda _: None)
+
+    started.wait(timeout=5)
+
+    server.slot_controller.fetch = fetch
+
+    thread = Thread(target=server.start, daemon=True)
+    thread.start()
+
+    assert server.listening.wait(timeout=5)
+
+    connection = connect(server.address)
+
+    requests = [
+        TRaySlotFetchRequest(dt_offset=pendulum.now("UTC")) for _ in range(3)
+    ]
+
+    for request in requests:
+        connection.put(request)
+
+    connection.put(TCancelRequest(ids=[request.id for request in requests]))
+    connection.put(TMetricsFetchRequest())
+
+    # The third fetch does not fit and is rejected, yet the cancel goes on
+    assert isinstance(connection.get(timeout=5), TFailure)
+    assert isinstance(connection.get(timeout=5), TMetricsFetchResponse)
+
+    assert all(
+        request.id not in server.dispatcher.jobs for request in requests
+    )
+
+    release.set()
+
+    connection.close()
+
+    server.stop()
+    thread.join(timeout=5)
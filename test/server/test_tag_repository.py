@@ -0,0 +1,37 @@
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.request.fetch.tag_fetch_request import TTagFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.db.model import Base
+from src.server.repository.tag_repository import TTagRepository
+from src.server.repository.timer_repository import TTimerRepository
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "tslot.db"
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    return path
+
+
+def test_tag_repository_0(path):
+    """All the tags are fetched at once, sorted by name"""
+
+    fst = pendulum.datetime(2021, 1, 31, 10, tz="UTC")
+
+    item = TEntryModel(
+        TSlotModel(fst), TTaskModel("task"), [TTagModel("work"), TTagModel("home")]
+    )
+
+    TTimerRepository(path).stash_timer(TTimerStashRequest(item))
+
+    response = TTagRepository(path).fetch_tags(TTagFetchRequest())
+
+    assert [tag.name for tag in response.tags] == ["home", "work"]
+    assert all(isinstance(tag, TTagModel) and tag.id for tag in response.tags)
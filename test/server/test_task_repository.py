@@ -0,0 +1,97 @@
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTaskModel
+from src.common.request.fetch.task_fetch_request import TTaskSearchFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.db.model import Base
+from src.server.repository.task_repository import TTaskRepository
+from src.server.repository.timer_repository import TTimerRepository
+
+
+DT_OFFSET = pendulum.datetime(2021, 1, 31, 10, tz="UTC")
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "tslot.db"
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    return path
+
+
+def stash(path, name: str, days: int, task_id: int = None) -> TEntryModel:
+    fst = DT_OFFSET.subtract(days=days)
+
+    item = TEntryModel(TSlotModel(fst, fst.add(hours=1)), TTaskModel(name, task_id))
+
+    return TTimerRepository(path).stash_timer(TTimerStashRequest(item)).timer
+
+
+def search(path, text: str, limit: int = 64) -> list:
+    """Return the (task name, day) of all the pages of results"""
+
+    found, after = [], None
+
+    while True:
+        response = TTaskRepository(path).search_tasks(
+            TTaskSearchFetchRequest(text, limit=limit, after=after)
+        )
+
+        found.extend(
+            (item.task.name, (DT_OFFSET - item.slot.fst).days)
+            for item in response.items
+        )
+
+        if response.after is None:
+            return found
+
+        after = response.after
+
+
+def test_task_repository_0(path):
+    """Slots of matching tasks come in pages, the better matches first"""
+
+    for days, name in enumerate(["Write report", "Read", "Write tests, write docs"]):
+        stash(path, name, days)
+
+    task_id = stash(path, "Write report", days=3).task.id
+
+    expected = [
+        ("Write tests, write docs", 2),
+        ("Write report", 0),
+        ("Write report", 3),
+    ]
+
+    assert search(path, "writ") == expected
+    assert search(path, "writ", limit=2) == expected
+    assert search(path, "Write REPORT") == expected[1:]
+    assert search(path, 'report" OR "read') == []
+    assert search(path, "  ") == []
+
+    # Renaming a task updates the index in the same transaction
+    stash(path, "Read report", days=4, task_id=task_id)
+
+    assert search(path, "writ") == expected[:2]
+    assert search(path, "read report") == [("Read report", 3), ("Read report", 4)]
+
+
+def test_task_repository_1(path):
+    """Databases from before the index get it with all their tasks"""
+
+    stash(path, "Write report", days=0)
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    with engine.begin() as connection:
+        connection.execute("DROP TABLE task_fts")
+
+        for trigger in ["insert", "delete", "update"]:
+            connection.execute(f"DROP TRIGGER task_fts_{trigger}")
+
+    TTaskRepository(path).prepare()
+
+    assert search(path, "report") == [("Write report", 0)]
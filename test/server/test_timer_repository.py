@@ -0,0 +1,54 @@
+import pendulum
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.common.dto.model import TEntryModel, TSlotModel, TTagModel, TTaskModel
+from src.common.request.fetch.timer_fetch_request import TTimerFetchRequest
+from src.common.request.stash.timer_stash_request import TTimerStashRequest
+from src.common.response.stash.timer_stash_response import TTimerStashResponse
+from src.db.model import Base, SlotModel
+from src.server.repository.timer_repository import TTimerRepository
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "tslot.db"
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    return path
+
+
+def test_timer_repository_0(path):
+    """A new timer gets its ids, stashing it again updates the same slot"""
+
+    repository = TTimerRepository(path)
+
+    fst = pendulum.datetime(2021, 1, 31, 10, tz="UTC")
+
+    item = TEntryModel(TSlotModel(fst), TTaskModel("task"), [TTagModel("tag")])
+
+    response = repository.stash_timer(TTimerStashRequest(item))
+
+    assert isinstance(response, TTimerStashResponse)
+    assert response.timer.slot.id is not None
+    assert response.timer.task.id is not None
+    assert [tag.name for tag in response.timer.tags] == ["tag"]
+
+    assert repository.fetch_timer(TTimerFetchRequest()).timer.slot.fst == fst
+
+    item.slot.id, item.task.id = response.timer.slot.id, response.timer.task.id
+    item.slot.lst = fst.add(hours=1)
+
+    response = repository.stash_timer(TTimerStashRequest(item))
+
+    assert response.timer.slot.lst == fst.add(hours=1)
+    assert repository.fetch_timer(TTimerFetchRequest()).timer is None
+
+    session = sessionmaker(bind=create_engine(f"sqlite:///{path}"))()
+
+    assert session.query(SlotModel).count() == 1
+
+    session.close()
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Total time in milliseconds that `tslot.py --help` may spend on imports. It
+# is measured around 80ms, the rest is headroom for slow machines
+IMPORT_BUDGET = 500
+
+
+def importtime(tmp_path: Path, *args: str) -> dict:
+    """Run python -X importtime and return the self time of each module (ms)"""
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT), QT_QPA_PLATFORM="offscreen")
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us) / 1000
+
+    return times
+
+
+def test_startup_0(tmp_path):
+    """Asking for help imports neither the client nor the server"""
+
+    times = importtime(tmp_path, str(ROOT / "tslot.py"), "--help")
+
+    assert not [name for name in times if name.startswith("sqlalchemy")]
+    assert not [name for name in times if name.startswith("PyQt5")]
+    assert not [name for name in times if name.startswith("src.server")]
+
+    assert sum(times.values()) < IMPORT_BUDGET
+
+    # Importing must not configure logging, nor open the log file
+    assert not (tmp_path / "tslot.log").exists()
+
+
+def test_startup_1(tmp_path):
+    """The client does not import the database layer"""
+
+    times = importtime(tmp_path, "-c", "import src.client")
+
+    assert not [name for name in times if name.startswith("sqlalchemy")]
+    assert not (tmp_path / "tslot.log").exists()
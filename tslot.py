@@ -2,16 +2,20 @@
 
 import errno
 import signal
+import subprocess
 import sys
 from argparse import ArgumentParser
 from multiprocessing import Process
-from multiprocessing import Queue
 from pathlib import Path
 
-from PyQt5.QtWidgets import QApplication
+from src.common.backpressure import DISPATCHER_POLICIES
+from src.common.channel import TChannel
+from src.common.connection import connect
+from src.common.logger import configure_logging
+from src.common.logger import start_async_logging
 
-from src.client import client
-from src.server import server
+# The client (Qt) and the server (SQLAlchemy) are imported only by the process
+# that runs them, so that neither pays for the other and --help stays instant
 
 
 def exit_on_sigint(number, stack_frame):
@@ -23,10 +27,56 @@ def exit_on_sigint(number, stack_frame):
     thread/process will produce their own traceback output which will all be
     dumped together to console.
     """
+    from PyQt5.QtWidgets import QApplication
+
     QApplication.quit()
     sys.exit(errno.EOWNERDEAD)  # 130
 
 
+def run_server(*args, **kwargs):
+    """Import and run the server, only in the process that serves"""
+
+    from src.server import server
+
+    return server(*args, **kwargs)
+
+
+def run_totals(check: bool = False) -> int:
+    """Rebuild (or only check) the daily totals of the database in cwd"""
+
+    from src.db.rollup import TDailyTotals
+    from src.server.repository import TRepository
+
+    repository = TRepository()
+    repository.prepare()
+
+    session = repository.create_session()
+
+    try:
+        rollup = TDailyTotals(session)
+
+        if not check:
+            print(f"Rebuilt {rollup.rebuild()} daily totals in {rollup.tz.name}")
+
+            session.commit()
+
+            return 0
+
+        differences = rollup.check()
+
+        for day, task_id, tag_id, stored, expected in differences:
+            print(
+                f"{day} task {task_id} tag {tag_id}:"
+                f" {stored} instead of {expected} microseconds"
+            )
+
+        print(f"Found {len(differences)} wrong daily totals in {rollup.tz.name}")
+
+        return 1 if differences else 0
+    finally:
+        session.close()
+
+
 class TDefaults:
     """Hold various default configuration parameters"""
 
@@ -76,14 +126,140 @@ if __name__ == "__main__":
         help="Silence all console output.",
     )
 
+    parser.add_argument(
+        "--async-logging",
+        action="store_true",
+        default=False,
+        help="Write logs on a background thread, never wait for the console.",
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=64,
+        help="Maximum number of messages waiting between client and server.",
+    )
+
+    parser.add_argument(
+        "--backpressure",
+        type=str,
+        choices=DISPATCHER_POLICIES,
+        default="drop_oldest_prefetch",
+        help="What the server does when it has too many pending requests.",
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="""
+            Path to a Unix domain socket of a shared server. Connect to it or,
+            if nobody listens there yet, start the shared server first.
+        """,
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        default=False,
+        help="Only run the shared server on --socket, without the GUI.",
+    )
+
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="""
+            Stop the shared server after this many seconds without clients.
+            A server started on demand by a client stops after 60 seconds.
+        """,
+    )
+
+    parser.add_argument(
+        "--rebuild-totals",
+        action="store_true",
+        default=False,
+        help="""
+            Compute the daily totals (for summaries) of the database from its
+            slots again, in the local time zone, then exit.
+        """,
+    )
+
+    parser.add_argument(
+        "--check-totals",
+        action="store_true",
+        default=False,
+        help="Compare the daily totals with the slots, then exit.",
+    )
+
     args = parser.parse_args()
 
-    client_to_server_messages = Queue()
-    server_to_client_messages = Queue()
+    configure_logging()
+
+    if args.async_logging:
+        start_async_logging()
+
+    if args.rebuild_totals or args.check_totals:
+        sys.exit(run_totals(check=args.check_totals))
+
+    if args.serve:
+        if args.socket is None:
+            parser.error("--serve requires --socket")
+
+        from src.server.socket_server import socket_server
+
+        sys.exit(
+            socket_server(
+                args.socket,
+                capacity=args.queue_size,
+                policy=args.backpressure,
+                idle_timeout=args.idle_timeout,
+            )
+        )
+
+    from src.client import client
+
+    if args.socket is not None:
+        try:
+            connection = connect(args.socket)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # Nobody listens yet, so start the shared server. It runs in its
+            # own session to outlive this client for the sake of other clients
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    __file__,
+                    "--serve",
+                    "--socket",
+                    args.socket,
+                    "--queue-size",
+                    str(args.queue_size),
+                    "--backpressure",
+                    args.backpressure,
+                    "--idle-timeout",
+                    str(args.idle_timeout or 60),
+                ],
+                start_new_session=True,
+            )
+
+            connection = connect(args.socket, timeout=5)
+
+        sys.exit(client(connection, connection))
+
+    # The client never waits for space (the GUI would freeze), it gets a
+    # failure instead. The server waits for the client to take its responses.
+    client_to_server_messages = TChannel(
+        "requests", maxsize=args.queue_size, policy="reject"
+    )
+    server_to_client_messages = TChannel(
+        "responses", maxsize=args.queue_size, policy="block"
+    )
 
     # Start the server process in a separate process
     server_process = Process(
-        target=server, args=(client_to_server_messages, server_to_client_messages)
+        target=run_server,
+        args=(client_to_server_messages, server_to_client_messages),
+        kwargs={"capacity": args.queue_size, "policy": args.backpressure},
     )
     server_process.start()
 